@@ -1,5 +1,27 @@
 __version__ = "0.1.0"
 
-from .harvesters.massive import MassiveHarvester, HarvestedContent, QuestionCandidate  # noqa: F401
-from .harvesters.enhanced import EnhancedHarvester  # noqa: F401
+# Harvesters pull in pandas/numpy/bs4; resolve them on first access (PEP 562)
+# so that light entry points such as `scraper validate` start quickly.
+_LAZY = {
+    "MassiveHarvester": ".harvesters.massive",
+    "HarvestedContent": ".harvesters.massive",
+    "QuestionCandidate": ".harvesters.massive",
+    "EnhancedHarvester": ".harvesters.enhanced",
+}
 
+__all__ = ["__version__", *_LAZY]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
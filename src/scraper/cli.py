@@ -7,54 +7,83 @@ Command line interface for the scraper package.
 Usage examples:
   scraper harvest massive --output-dir ./harvest_output --max-content 200 --questions-per-content 5 --workers 8
   scraper harvest enhanced  # interactive
+  scraper generate --output-dir ./harvest_output --min-quality 0.5  # offline, from stored content
   scraper export quizmentor --db ./harvest_output/harvest.db --out ./out
+  scraper db migrate --db ./harvest_output/harvest.db
+
+Handlers import what they need when they run: building the parser and the
+validate commands must not pull in pandas, numpy, bs4 or rich
+(tests/test_cli_startup.py keeps an eye on this).
 """
 
 import argparse
 import json
-from rich.console import Console
 from pathlib import Path
 
-from .harvesters.massive import MassiveHarvester
-from .harvesters.enhanced import EnhancedHarvester
-from .exporters.quizmentor import QuizMentorExporter
-from .importers.quizmentor import QuizMentorImporter
-from .importers.airesearch import AIResearchImporter
-from .validators import validate_quiz_dir, validate_harvest_db, validate_research_repo
-from .orchestrator import ShipLocalOrchestrator
-
 
 def cmd_harvest_massive(args) -> int:
-    harvester = MassiveHarvester(output_dir=args.output_dir)
-    if args.complete:
-        harvester.run_complete_harvest(
-            max_content=args.max_content,
+    from .harvesters.massive import MassiveHarvester
+
+    with MassiveHarvester(output_dir=args.output_dir, cache_dir=args.cache_dir, cache_max_mb=args.cache_max_mb, policy_path=args.policy, seed=args.seed, crawl_depth=args.crawl_depth, use_sitemaps=not args.no_sitemaps) as harvester:
+        if args.complete:
+            harvester.run_complete_harvest(
+                max_content=args.max_content,
+                questions_per_content=args.questions_per_content,
+                parallel_workers=args.workers,
+                per_host=args.per_host,
+                engine=args.engine,
+                max_in_flight=args.max_in_flight,
+                processes=args.processes,
+            )
+        else:
+            if args.engine == "async":
+                content = harvester.harvest_all_sources_async(max_in_flight=args.max_in_flight, limit_per_source=args.max_content // 20, per_host=args.per_host)
+            else:
+                content = harvester.harvest_all_sources(max_workers=args.workers, limit_per_source=args.max_content // 20, per_host=args.per_host)
+            harvester.generate_and_save(content, args.questions_per_content, processes=args.processes)
+            harvester.generate_csv_report()
+            harvester.generate_statistics_report()
+    return 0
+
+
+def cmd_generate(args) -> int:
+    from .harvesters.massive import MassiveHarvester
+
+    with MassiveHarvester(output_dir=args.output_dir, seed=args.seed) as harvester:
+        summary = harvester.regenerate_from_store(
             questions_per_content=args.questions_per_content,
-            parallel_workers=args.workers,
+            category=args.category,
+            min_quality=args.min_quality,
+            reprocess=args.reprocess,
+            batch_size=args.batch_size,
+            processes=args.processes,
         )
-    else:
-        content = harvester.harvest_all_sources(limit_per_source=args.max_content // 20)
-        questions = harvester.generate_questions_from_content(content, args.questions_per_content)
-        harvester.save_questions(questions)
-        harvester.generate_csv_report()
-        harvester.generate_statistics_report()
+        if args.csv:
+            summary["csv_file"] = str(harvester.generate_csv_report())
+    print(json.dumps(summary, indent=2))
     return 0
 
 
 def cmd_harvest_enhanced(args) -> int:
-    harvester = EnhancedHarvester(output_dir=args.output_dir)
-    harvester.run_interactive_harvest()
+    from .harvesters.enhanced import EnhancedHarvester
+
+    with EnhancedHarvester(output_dir=args.output_dir, cache_dir=args.cache_dir, cache_max_mb=args.cache_max_mb, policy_path=args.policy, seed=args.seed) as harvester:
+        harvester.run_interactive_harvest()
     return 0
 
 
 def cmd_export_quizmentor(args) -> int:
+    from .exporters.quizmentor import QuizMentorExporter
+
     exporter = QuizMentorExporter(harvest_db=args.db)
-    exporter.export(out=args.out)
+    exporter.export(out=args.out, incremental=args.incremental)
     return 0
 
 
 def cmd_import_quizmentor(args) -> int:
-    importer = QuizMentorImporter(source_dir=args.src, target_dir=args.dst, mode=getattr(args, "mode", "copy"), verify=not args.no_verify)
+    from .importers.quizmentor import QuizMentorImporter
+
+    importer = QuizMentorImporter(source_dir=args.src, target_dir=args.dst, mode=getattr(args, "mode", "copy"), verify=not args.no_verify, changed_only=args.changed_only)
     summary = importer.run()
     # Print a compact summary to stdout
     print(f"Imported {summary['copied']} quiz files → {summary['target_dir']} (issues: {len(summary['issues'])})")
@@ -62,6 +91,8 @@ def cmd_import_quizmentor(args) -> int:
 
 
 def cmd_import_airesearch(args) -> int:
+    from .importers.airesearch import AIResearchImporter
+
     importer = AIResearchImporter(
         db_path=args.db,
         repo_path=args.repo,
@@ -82,24 +113,48 @@ def cmd_import_airesearch(args) -> int:
 
 
 def cmd_validate_quiz(args) -> int:
+    from .validators import validate_quiz_dir
+
     res = validate_quiz_dir(args.src, strict=args.strict)
     print(json.dumps(res, indent=2))
     return 0 if res.get("ok", False) else 1
 
 
 def cmd_validate_harvest(args) -> int:
+    from .validators import validate_harvest_db
+
     res = validate_harvest_db(args.db)
     print(json.dumps(res, indent=2))
     return 0 if res.get("ok", False) else 1
 
 
 def cmd_validate_research(args) -> int:
+    from .validators import validate_research_repo
+
     res = validate_research_repo(args.repo)
     print(json.dumps(res, indent=2))
     return 0 if res.get("ok", False) else 1
 
 
+def cmd_db_migrate(args) -> int:
+    from .migrations import ENHANCED_MIGRATIONS, HARVEST_MIGRATIONS
+    from .storage import HarvestStore
+
+    if not Path(args.db).exists():
+        print(json.dumps({"ok": False, "db": args.db, "error": "db_not_found"}, indent=2))
+        return 1
+    migrations = ENHANCED_MIGRATIONS if args.enhanced else HARVEST_MIGRATIONS
+    with HarvestStore(args.db, migrations=migrations) as store:
+        res = {"ok": True, "db": args.db, "applied": store.applied_migrations, "version": migrations[-1][0]}
+    print(json.dumps(res, indent=2))
+    return 0
+
+
 def cmd_ship_local(args) -> int:
+    from rich.console import Console
+
+    from .orchestrator import ShipLocalOrchestrator
+
     console = Console()
     orch = ShipLocalOrchestrator(console=console)
     result = orch.run(
@@ -119,6 +174,9 @@ def cmd_ship_local(args) -> int:
         limit=args.limit,
         teach=args.teach,
         preview=args.preview,
+        cache_dir=args.cache_dir,
+        policy_path=args.policy,
+        seed=args.seed,
     )
     print(json.dumps({k: v for k, v in result.items() if k in ("db", "export", "report")}, indent=2))
     return 0
@@ -136,14 +194,41 @@ def build_parser() -> argparse.ArgumentParser:
     massive.add_argument("--output-dir", default="./harvest_output")
     massive.add_argument("--max-content", type=int, default=500)
     massive.add_argument("--questions-per-content", type=int, default=5)
-    massive.add_argument("--workers", type=int, default=10)
+    massive.add_argument("--workers", type=int, default=10, help="Concurrent fetch workers")
+    massive.add_argument("--per-host", type=int, default=1, help="Max concurrent fetches per host")
+    massive.add_argument("--engine", choices=["threads", "async"], default="threads", help="Fetch engine (async requires aiohttp)")
+    massive.add_argument("--max-in-flight", type=int, default=1000, help="Max concurrent requests for --engine async")
     massive.add_argument("--complete", action="store_true", help="Run end-to-end pipeline")
+    massive.add_argument("--cache-dir", default=None, help="On-disk HTTP cache directory (conditional revalidation)")
+    massive.add_argument("--cache-max-mb", type=int, default=512, help="Evict least-recently-used cache entries above this size")
+    massive.add_argument("--policy", default=None, help="policy.yaml with robots_tos.rate_limit (default: ./policy.yaml if present)")
+    massive.add_argument("--processes", type=int, default=1, help="Worker processes for question generation")
+    massive.add_argument("--seed", type=int, default=None, help="Run seed: identical input gives identical questions (any --processes) and fixed timestamps")
+    massive.add_argument("--crawl-depth", type=int, default=2, help="Follow in-scope links this many hops from each documentation landing page (0 = landing pages only)")
+    massive.add_argument("--no-sitemaps", action="store_true", help="Do not seed documentation crawls from robots.txt sitemaps")
     massive.set_defaults(func=cmd_harvest_massive)
 
     enhanced = harvest_sub.add_parser("enhanced", help="Run the enhanced harvester (interactive)")
     enhanced.add_argument("--output-dir", default="./harvest_output")
+    enhanced.add_argument("--cache-dir", default=None, help="On-disk HTTP cache directory (conditional revalidation)")
+    enhanced.add_argument("--cache-max-mb", type=int, default=512)
+    enhanced.add_argument("--policy", default=None, help="policy.yaml with robots_tos.rate_limit (default: ./policy.yaml if present)")
+    enhanced.add_argument("--seed", type=int, default=None, help="Seed every random choice (reproducible runs; fixed timestamps)")
     enhanced.set_defaults(func=cmd_harvest_enhanced)
 
+    # generate (offline)
+    gen = subparsers.add_parser("generate", help="Generate questions from stored harvested_content (no network)")
+    gen.add_argument("--output-dir", default="./harvest_output", help="Directory holding harvest.db")
+    gen.add_argument("--questions-per-content", type=int, default=5)
+    gen.add_argument("--category", default=None, help="Only content of this category")
+    gen.add_argument("--min-quality", type=float, default=0.0, help="Only content with quality_score >= this")
+    gen.add_argument("--reprocess", action="store_true", help="Include content already marked processed")
+    gen.add_argument("--batch-size", type=int, default=200, help="Rows read from the DB per batch")
+    gen.add_argument("--csv", action="store_true", help="Also write the CSV report")
+    gen.add_argument("--processes", type=int, default=1, help="Worker processes for question generation")
+    gen.add_argument("--seed", type=int, default=None, help="Run seed: identical input gives identical questions (any --processes) and fixed timestamps")
+    gen.set_defaults(func=cmd_generate)
+
     # export quizmentor
     export_parser = subparsers.add_parser("export", help="Export harvested data")
     export_sub = export_parser.add_subparsers(dest="export_command")
@@ -151,6 +236,7 @@ def build_parser() -> argparse.ArgumentParser:
     qm = export_sub.add_parser("quizmentor", help="Export to QuizMentor quiz JSON format")
     qm.add_argument("--db", required=True, help="Path to harvest.db")
     qm.add_argument("--out", default="./out", help="Output directory")
+    qm.add_argument("--incremental", action="store_true", help="Rewrite only categories with new, removed or edited questions (sha256 digest per category; rehashes all rows each run; see export_changeset.json)")
     qm.set_defaults(func=cmd_export_quizmentor)
 
     # importers
@@ -163,6 +249,7 @@ def build_parser() -> argparse.ArgumentParser:
     iqm.add_argument("--to", dest="dst", required=True, help="Target quizzes directory (e.g., QuizMentor.ai/quizzes)")
     iqm.add_argument("--mode", choices=["copy", "link"], default="copy")
     iqm.add_argument("--no-verify", action="store_true", help="Skip basic schema validation")
+    iqm.add_argument("--changed-only", action="store_true", help="Copy only files listed in export_changeset.json (incremental export)")
     iqm.set_defaults(func=cmd_import_quizmentor)
 
     # import AI-Research
@@ -194,6 +281,15 @@ def build_parser() -> argparse.ArgumentParser:
     vr.add_argument("--repo", required=True)
     vr.set_defaults(func=cmd_validate_research)
 
+    # db
+    db_parser = subparsers.add_parser("db", help="Maintain harvest databases")
+    db_sub = db_parser.add_subparsers(dest="db_command")
+
+    dbm = db_sub.add_parser("migrate", help="Apply pending schema migrations in place")
+    dbm.add_argument("--db", required=True)
+    dbm.add_argument("--enhanced", action="store_true", help="Database was written by the enhanced harvester")
+    dbm.set_defaults(func=cmd_db_migrate)
+
     # ship
     ship_parser = subparsers.add_parser("ship", help="One-shot local ship (harvest → export → validate → import → report)")
     ship_sub = ship_parser.add_subparsers(dest="ship_command")
@@ -215,6 +311,9 @@ def build_parser() -> argparse.ArgumentParser:
     local.add_argument("--teach", action="store_true")
     local.add_argument("--limit", type=int, default=None)
     local.add_argument("--preview", action="store_true")
+    local.add_argument("--cache-dir", default=None, help="On-disk HTTP cache directory for the harvest step")
+    local.add_argument("--policy", default=None, help="policy.yaml with robots_tos.rate_limit (default: ./policy.yaml if present)")
+    local.add_argument("--seed", type=int, default=None, help="Seed the harvest step for reproducible output")
     local.set_defaults(func=cmd_ship_local)
 
     return parser
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Concept extraction shared by the harvesters and the AI-Research importer
+- All concept patterns are compiled into one scanner and the text is scanned once
+- The scanner consumes one character from `lead` (a class covering every pattern's
+  first character, so re can skip ahead with its charset search) and then tries the
+  patterns in a zero-width assertion anchored at that character. Matches of
+  different patterns may therefore overlap (e.g. **Rolling Update** yields the
+  phrase and both CamelCase words), just as running re.findall once per pattern
+  did; within a pattern matches stay non-overlapping
+- Only the first alternative that matches at a position is reported, so no two
+  patterns may match at the same position: CamelCase and acronyms both start with
+  [A-Z] but need a lowercase vs an uppercase second character; every other
+  pattern has a first character of its own
+- Output order is pattern by pattern, then by position, deduplicated; stopwords,
+  short tokens and pure digits are dropped
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONCEPT_PATTERNS: Tuple[str, ...] = (
+    r"\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b",  # CamelCase / Capitalized terms
+    r"\b[A-Z]{2,}\b",  # acronyms
+    r"`([^`]+)`",  # inline code
+    r"\*\*([^*]+)\*\*",  # bold
+    r"##+ (.+)",  # markdown headings
+    r"class\s+(\w+)",  # code definitions
+    r"function\s+(\w+)",
+    r"def\s+(\w+)",
+)
+CONCEPT_LEAD = r"[A-Z`*#cfd]"
+
+STOPWORDS = frozenset({"the", "and", "or", "but", "for", "with", "this", "that", "from", "will"})
+
+DEFAULT_MAX_CONCEPTS = 20
+
+
+class ConceptExtractor:
+    """Single-pass multi-pattern concept scanner."""
+
+    def __init__(self, patterns: Sequence[str] = CONCEPT_PATTERNS, stopwords: Iterable[str] = STOPWORDS, lead: Optional[str] = CONCEPT_LEAD) -> None:
+        self.patterns = tuple(patterns)
+        self.stopwords = frozenset(s.lower() for s in stopwords)
+        parts: List[str] = []
+        # outer group index -> (pattern index, group holding the value)
+        self._groups: Dict[int, Tuple[int, int]] = {}
+        next_group = 1
+        for i, pattern in enumerate(self.patterns):
+            inner = re.compile(pattern).groups
+            self._groups[next_group] = (i, next_group + 1 if inner else next_group)
+            parts.append(f"({pattern})")
+            next_group += 1 + inner
+        alternatives = "(?=" + "|".join(parts) + ")"
+        # Without a lead class every position is tried (correct, just slower)
+        self._scanner = re.compile(f"{lead}(?<={alternatives}[\\s\\S])" if lead else alternatives)
+
+    def _raw(self, text: str) -> List[List[str]]:
+        found: List[List[str]] = [[] for _ in self.patterns]
+        ends = [0] * len(self.patterns)
+        groups = self._groups
+        for m in self._scanner.finditer(text):
+            outer = m.lastindex
+            if outer is None:
+                continue
+            i, value_group = groups[outer]
+            start = m.start()
+            # Same non-overlap rule as re.findall for this pattern alone
+            if start < ends[i]:
+                continue
+            ends[i] = max(m.end(outer), start + 1)
+            found[i].append(m.group(value_group) or "")
+        return found
+
+    def extract(self, text: str, max_concepts: Optional[int] = DEFAULT_MAX_CONCEPTS) -> List[str]:
+        seen = set()
+        out: List[str] = []
+        for matches in self._raw(text or ""):
+            for concept in matches:
+                concept = concept.strip()
+                if len(concept) <= 2 or concept in seen or concept.lower() in self.stopwords or concept.isdigit():
+                    continue
+                seen.add(concept)
+                out.append(concept)
+                if max_concepts is not None and len(out) >= max_concepts:
+                    return out
+        return out
+
+    def extract_batch(self, texts: Iterable[str], max_concepts: Optional[int] = DEFAULT_MAX_CONCEPTS) -> List[List[str]]:
+        return [self.extract(text, max_concepts) for text in texts]
+
+
+_DEFAULT = ConceptExtractor()
+
+
+def extract_concepts(text: str, max_concepts: Optional[int] = DEFAULT_MAX_CONCEPTS) -> List[str]:
+    return _DEFAULT.extract(text, max_concepts)
+
+
+def extract_concepts_batch(texts: Iterable[str], max_concepts: Optional[int] = DEFAULT_MAX_CONCEPTS) -> List[List[str]]:
+    return _DEFAULT.extract_batch(texts, max_concepts)
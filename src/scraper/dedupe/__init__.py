@@ -0,0 +1,5 @@
+from .simhash import SimHashIndex  # noqa: F401
+from .simhash import from_signed64, simhash64, simhash64_batch, to_signed64  # noqa: F401
+from .fuzzy import FuzzyIndex, ratio, ratio_matrix  # noqa: F401
+from .semantic import SemanticIndex  # noqa: F401
+from .store import DedupeStore  # noqa: F401
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Batched Levenshtein-ratio scoring
+- ratio()/ratio_matrix() return the same 0..100 integer scores as fuzzywuzzy's
+  fuzz.ratio, computed by rapidfuzz in C (cdist) instead of per-pair Python calls
+- FuzzyIndex keeps the stored questions of each (category, subcategory) in memory,
+  loaded once on first use and appended as questions are accepted; lookups score a
+  chunk at a time with a score cutoff and stop at the first chunk with a match
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+DEFAULT_CHUNK = 1024
+
+
+def _to_int_scores(scores: np.ndarray) -> np.ndarray:
+    # fuzzywuzzy rounds half-to-even via round(); np.rint does the same
+    return np.rint(scores).astype(np.int32)
+
+
+def ratio(a: str, b: str) -> int:
+    """fuzzywuzzy-compatible fuzz.ratio (0..100)."""
+    if a is None or b is None:
+        return 0
+    if a == b:
+        return 100
+    if not a or not b:
+        return 0
+    return int(round(fuzz.ratio(a, b)))
+
+
+def ratio_matrix(rows: Sequence[str], cols: Sequence[str], score_cutoff: float = 0) -> np.ndarray:
+    """Pairwise fuzz.ratio scores as an int matrix (len(rows) x len(cols))."""
+    if not rows or not cols:
+        return np.zeros((len(rows), len(cols)), dtype=np.int32)
+    scores = process.cdist(rows, cols, scorer=fuzz.ratio, score_cutoff=score_cutoff or None, dtype=np.float32)
+    return _to_int_scores(scores)
+
+
+class FuzzyIndex:
+    """In-memory question texts per (category, subcategory) with cutoff-aware lookup."""
+
+    def __init__(self, loader: Callable[[str, str], List[str]], chunk_size: int = DEFAULT_CHUNK) -> None:
+        self._loader = loader
+        self.chunk_size = max(1, int(chunk_size))
+        self._groups: Dict[Tuple[str, str], List[str]] = {}
+
+    def _group(self, category: str, subcategory: str) -> List[str]:
+        key = (category, subcategory)
+        group = self._groups.get(key)
+        if group is None:
+            group = list(self._loader(category, subcategory))
+            self._groups[key] = group
+        return group
+
+    def add(self, category: str, subcategory: str, text: str) -> None:
+        self._group(category, subcategory).append(text)
+
+    def first_match(self, category: str, subcategory: str, text: str, threshold: float = 0.85) -> Optional[Tuple[str, float]]:
+        """First stored text whose ratio/100 exceeds threshold, with its similarity."""
+        group = self._group(category, subcategory)
+        # Scores below threshold*100 can never round above it, so let rapidfuzz drop them early
+        cutoff = threshold * 100
+        for start in range(0, len(group), self.chunk_size):
+            chunk = group[start:start + self.chunk_size]
+            scores = _to_int_scores(process.cdist([text], chunk, scorer=fuzz.ratio, score_cutoff=cutoff, dtype=np.float32)[0])
+            hits = np.flatnonzero(scores > cutoff)
+            if len(hits):
+                i = int(hits[0])
+                return chunk[i], scores[i] / 100
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(g) for g in self._groups.values())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Page-level near-duplicate detection (MinHash + LSH)
+- A page is the set of its hashed word 5-grams (shingles)
+- MinHasher: 128 minimums of (a * x + b) mod 2**64 (odd a, so each is a permutation
+  of the 64-bit shingle space), computed with NumPy over chunks of shingles
+- MinHashLSH: the signature is cut into 16 bands of 8 rows; pages sharing any band
+  are candidates (recall ~61% at Jaccard 0.7, ~95% at 0.8, >99.9% at 0.9)
+- Candidates are confirmed with the exact Jaccard similarity of the shingle sets
+  (default >= 0.8), so LSH only decides what gets compared
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Dict, Hashable, List, Set
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_WORDS = 5
+DEFAULT_THRESHOLD = 0.8
+
+_WORD_RE = re.compile(r"\w+")
+_MULT = np.uint64(0x9E3779B97F4A7C15)
+_CHUNK = 4096
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> np.ndarray:
+    """Sorted unique 64-bit hashes of the page's word k-grams (one shingle for shorter pages)."""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    tokens = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    n = max(1, len(tokens) - k + 1)
+    hashes = np.zeros(n, dtype=np.uint64)
+    for i in range(min(k, len(tokens))):
+        # Polynomial rolling hash; uint64 arithmetic wraps
+        hashes = hashes * _MULT + tokens[i:i + n]
+    return np.unique(hashes)
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    if not len(a) and not len(b):
+        return 1.0
+    inter = len(np.intersect1d(a, b, assume_unique=True))
+    return inter / (len(a) + len(b) - inter)
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(0, 2**64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**64, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_hashes: np.ndarray) -> np.ndarray:
+        sig = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(shingle_hashes), _CHUNK):
+            x = shingle_hashes[start:start + _CHUNK]
+            values = self._a[:, None] * x[None, :] + self._b[:, None]
+            np.minimum(sig, values.min(axis=1), out=sig)
+        return sig
+
+
+class MinHashLSH:
+    """Banded LSH over MinHash signatures."""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._tables: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(bands)]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _keys(self, signature: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows)]
+
+    def add(self, key: Hashable, signature: np.ndarray) -> None:
+        for table, band in zip(self._tables, self._keys(signature)):
+            table.setdefault(band, []).append(key)
+        self._size += 1
+
+    def candidates(self, signature: np.ndarray) -> Set[Hashable]:
+        found: Set[Hashable] = set()
+        for table, band in zip(self._tables, self._keys(signature)):
+            found.update(table.get(band, ()))
+        return found
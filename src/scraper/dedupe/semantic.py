@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Incremental TF-IDF cosine index for semantic near-duplicate questions
+- Tokens follow TfidfVectorizer's defaults (lowercased, \\b\\w\\w+\\b) and are hashed
+  (crc32) into a fixed feature space, so there is no vocabulary to refit
+- Document frequencies are counted as questions are added; each row is weighted
+  with the smoothed idf known when it was added and L2-normalized. Whenever the
+  index has doubled since the last reweighting every row is reweighted with the
+  current idf, so stored weights never lag far behind (amortized O(1) per add)
+- Rows are stored column-wise: per feature, append-only arrays of (row id,
+  weight), i.e. a sparse matrix that grows in place. A query only reads the
+  postings of its own features; that is still linear in the index size (common
+  tokens appear in most rows), but skips rows sharing no token with the query
+- max_similarity() gathers the postings of a whole batch of queries and reduces
+  them in one numpy pass (a sparse batch-by-index product) instead of per text
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_FEATURES = 1 << 20
+
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+class SemanticIndex:
+    """Append-only TF-IDF index answering max cosine similarity queries."""
+
+    def __init__(self, n_features: int = DEFAULT_FEATURES) -> None:
+        self.n_features = int(n_features)
+        self._rows: Dict[int, array] = {}
+        self._weights: Dict[int, array] = {}
+        self._df: Counter = Counter()
+        self._docs: List[Counter] = []
+        self._size = 0
+        self._weighted_at = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _features(self, text: str) -> Counter:
+        return Counter(zlib.crc32(token.encode("utf-8")) % self.n_features for token in _TOKEN_RE.findall(text.lower()))
+
+    def _idf(self, feature: int) -> float:
+        # sklearn's smooth_idf: ln((1 + n) / (1 + df)) + 1
+        return math.log((1 + self._size) / (1 + self._df[feature])) + 1.0
+
+    def _vector(self, counts: Counter) -> List[Tuple[int, float]]:
+        weighted = [(f, tf * self._idf(f)) for f, tf in counts.items()]
+        norm = math.sqrt(sum(w * w for _, w in weighted))
+        return [(f, w / norm) for f, w in weighted] if norm else []
+
+    def _append(self, row: int, counts: Counter) -> None:
+        for feature, weight in self._vector(counts):
+            rows = self._rows.get(feature)
+            if rows is None:
+                rows = self._rows[feature] = array("q")
+                self._weights[feature] = array("d")
+            rows.append(row)
+            self._weights[feature].append(weight)
+
+    def _reweight(self) -> None:
+        self._rows, self._weights = {}, {}
+        for row, counts in enumerate(self._docs):
+            self._append(row, counts)
+        self._weighted_at = self._size
+
+    def add(self, text: str) -> int:
+        counts = self._features(text)
+        row = self._size
+        self._size += 1
+        self._df.update(counts.keys())
+        self._docs.append(counts)
+        if self._size >= 2 * self._weighted_at:
+            self._reweight()
+        else:
+            self._append(row, counts)
+        return row
+
+    def extend(self, texts: Iterable[str]) -> None:
+        for text in texts:
+            self.add(text)
+
+    def max_similarity(self, texts: Sequence[str]) -> np.ndarray:
+        """Highest cosine similarity of each text to any indexed text (0.0 when none overlaps)."""
+        out = np.zeros(len(texts), dtype=np.float64)
+        queries: List[np.ndarray] = []
+        rows: List[np.ndarray] = []
+        weights: List[np.ndarray] = []
+        for i, text in enumerate(texts):
+            for feature, weight in self._vector(self._features(text)):
+                postings = self._rows.get(feature)
+                if postings is None:
+                    continue
+                queries.append(np.full(len(postings), i, dtype=np.int64))
+                rows.append(np.frombuffer(postings, dtype=np.int64))
+                weights.append(np.frombuffer(self._weights[feature], dtype=np.float64) * weight)
+        if not rows:
+            return out
+        # One (query, row) key per posting: summing per key is the batch's sparse dot product
+        keys = np.concatenate(queries) * self._size + np.concatenate(rows)
+        pairs, inverse = np.unique(keys, return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(weights), minlength=len(pairs))
+        np.maximum.at(out, pairs // self._size, scores)
+        return out
+
+    def is_duplicate(self, text: str, threshold: float = 0.85) -> bool:
+        return bool(self.max_similarity([text])[0] >= threshold)
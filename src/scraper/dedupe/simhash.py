@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+SimHash near-duplicate index
+- Accepted 64-bit hashes live in a growing uint64 array
+- The 64 bits are split into `bands` wide bands (4 x 16 bits by default); each band
+  value maps to the ids that carry it
+- Pigeonhole: a hash within distance < threshold differs from its near-duplicate in
+  at most `radius` = ceil(threshold / bands) - 1 bits of some band, so probing every
+  band key within `radius` flips (1 + 16 keys per band at threshold 8) never misses
+  a near-duplicate
+- A bucket holds ~n / 65536 ids instead of the n / 256 of 8-bit bands, so a query
+  checks ~68 n / 65536 candidates (about 100 at 100k hashes); candidates are
+  deduplicated before the exact (vectorized) Hamming check
+- simhash64_batch fingerprints many texts at once: character trigrams are hashed
+  with a splitmix64 mix (no MD5), bits are unpacked and voted with NumPy
+"""
+
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+NO_MATCH = 64
+_BATCH_TEXTS = 4096
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer: cheap, well-distributed 64-bit mixing
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MIX1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MIX2
+    return x ^ (x >> np.uint64(31))
+
+
+def _trigram_hashes(text: str) -> np.ndarray:
+    cps = np.frombuffer(text.lower().encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(cps) < 3:
+        return np.zeros(0, dtype=np.uint64)
+    # Code points fit in 21 bits, so three of them pack losslessly into 63 bits
+    codes = (cps[:-2] << np.uint64(42)) | (cps[1:-1] << np.uint64(21)) | cps[2:]
+    return _mix64(codes)
+
+
+def _simhash_chunk(texts: Sequence[str]) -> np.ndarray:
+    per_text = [_trigram_hashes(t) for t in texts]
+    counts = np.array([len(h) for h in per_text], dtype=np.int64)
+    out = np.zeros(len(texts), dtype=np.uint64)
+    nonempty = counts > 0
+    if not nonempty.any():
+        return out
+    hashes = np.concatenate([h for h in per_text if len(h)])
+    bits = np.unpackbits(hashes.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    starts = np.concatenate([[0], np.cumsum(counts[nonempty])[:-1]])
+    ones = np.add.reduceat(bits.astype(np.int32), starts, axis=0)
+    # A bit is set when more trigrams vote 1 than 0
+    voted = (2 * ones) > counts[nonempty][:, None]
+    packed = np.packbits(voted, axis=1, bitorder="little").view("<u8").reshape(-1)
+    out[nonempty] = packed
+    return out
+
+
+def simhash64_batch(texts: Iterable[str]) -> np.ndarray:
+    """64-bit SimHash fingerprints for many texts (uint64 array, input order)."""
+    texts = list(texts)
+    if not texts:
+        return np.zeros(0, dtype=np.uint64)
+    chunks = [_simhash_chunk(texts[i:i + _BATCH_TEXTS]) for i in range(0, len(texts), _BATCH_TEXTS)]
+    return np.concatenate(chunks)
+
+
+def simhash64(text: str) -> int:
+    return int(simhash64_batch([text])[0])
+
+
+def to_signed64(h: int) -> int:
+    """uint64 -> int64, for storing SimHashes in SQLite INTEGER columns."""
+    return h - (1 << 64) if h >= (1 << 63) else h
+
+
+def from_signed64(h: int) -> int:
+    return h + (1 << 64) if h < 0 else h
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return np.array([int(v).bit_count() for v in values.tolist()], dtype=np.uint8)  # pragma: no cover
+
+
+class SimHashIndex:
+    """Multi-probe band-partitioned (LSH) index over 64-bit SimHashes."""
+
+    def __init__(self, threshold: int = 8, bands: int = 4) -> None:
+        self.threshold = int(threshold)
+        self.bands = max(1, min(64, int(bands)))
+        self.radius = max(0, -(-self.threshold // self.bands) - 1)
+        widths = [64 // self.bands + (1 if i < 64 % self.bands else 0) for i in range(self.bands)]
+        self._slices: List[Tuple[int, int]] = []
+        self._probes: List[List[int]] = []
+        shift = 0
+        for width in widths:
+            self._slices.append((shift, (1 << width) - 1))
+            # XOR masks of up to `radius` bits inside the band (0 first: the exact key)
+            self._probes.append([
+                sum(1 << bit for bit in bits) for r in range(self.radius + 1) for bits in combinations(range(width), r)
+            ])
+            shift += width
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._hashes = np.zeros(1024, dtype=np.uint64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _keys(self, h: int) -> List[int]:
+        return [(h >> shift) & mask for shift, mask in self._slices]
+
+    def add(self, h: int) -> int:
+        if self._size == len(self._hashes):
+            self._hashes = np.concatenate([self._hashes, np.zeros(len(self._hashes), dtype=np.uint64)])
+        idx = self._size
+        self._hashes[idx] = h
+        self._size += 1
+        for table, key in zip(self._tables, self._keys(h)):
+            table.setdefault(key, []).append(idx)
+        return idx
+
+    def extend(self, hashes) -> None:
+        for h in hashes:
+            self.add(int(h))
+
+    def candidates(self, h: int) -> np.ndarray:
+        """Distinct ids sharing a probed band key with h (sorted)."""
+        found: Set[int] = set()
+        for table, key, probes in zip(self._tables, self._keys(h), self._probes):
+            for flip in probes:
+                bucket = table.get(key ^ flip)
+                if bucket:
+                    found.update(bucket)
+        return np.sort(np.fromiter(found, dtype=np.int64, count=len(found)))
+
+    def query(self, h: int) -> Tuple[int, int]:
+        """Return (distance, id) of the closest candidate; (64, -1) when no band matches."""
+        ids = self.candidates(h)
+        if not len(ids):
+            return NO_MATCH, -1
+        distances = _popcount(np.bitwise_xor(self._hashes[ids], np.uint64(h)))
+        best = int(np.argmin(distances))
+        return int(distances[best]), int(ids[best])
+
+    def nearest(self, h: int) -> int:
+        return self.query(h)[0]
+
+    def is_near_duplicate(self, h: int) -> bool:
+        return self.nearest(h) < self.threshold
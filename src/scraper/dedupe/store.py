@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Cross-run dedupe state kept in the harvest databases
+- The questions tables already hold what dedupe needs: the exact fingerprint, the
+  question text and (generated_questions.simhash, migration v5) the 64-bit SimHash
+  stored as a signed INTEGER
+- DedupeStore loads each structure lazily, with one query on first use: the
+  fingerprint set, a SimHashIndex and a SemanticIndex (sparse TF-IDF vectors
+  rebuilt from the stored text). Later additions go to memory, and the
+  harvesters' own save_questions persists them
+- So a run checks against every earlier run at the same per-question cost as
+  within-run dedupe
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional, Set
+
+from .semantic import SemanticIndex
+from .simhash import SimHashIndex, from_signed64
+
+
+class DedupeStore:
+    """Lazily loaded fingerprints, SimHashes and TF-IDF vectors of one questions table."""
+
+    def __init__(
+        self,
+        store: Any,
+        table: str,
+        fingerprint_column: str,
+        text_column: str = "question",
+        simhash_column: Optional[str] = None,
+        simhash_threshold: int = 8,
+    ) -> None:
+        self.store = store
+        self.table = table
+        self.fingerprint_column = fingerprint_column
+        self.text_column = text_column
+        self.simhash_column = simhash_column
+        self.simhash_threshold = simhash_threshold
+        self._fingerprints: Optional[Set[str]] = None
+        self._simhash_index: Optional[SimHashIndex] = None
+        self._semantic_index: Optional[SemanticIndex] = None
+
+    @property
+    def fingerprints(self) -> Set[str]:
+        if self._fingerprints is None:
+            rows = self.store.query(f"SELECT {self.fingerprint_column} FROM {self.table} WHERE {self.fingerprint_column} IS NOT NULL")
+            self._fingerprints = {r[0] for r in rows}
+        return self._fingerprints
+
+    @property
+    def simhash_index(self) -> SimHashIndex:
+        if self._simhash_index is None:
+            index = SimHashIndex(threshold=self.simhash_threshold)
+            if self.simhash_column:
+                rows = self.store.query(f"SELECT {self.simhash_column} FROM {self.table} WHERE {self.simhash_column} IS NOT NULL ORDER BY id")
+                index.extend(from_signed64(r[0]) for r in rows)
+            self._simhash_index = index
+        return self._simhash_index
+
+    @property
+    def semantic_index(self) -> SemanticIndex:
+        if self._semantic_index is None:
+            index = SemanticIndex()
+            rows = self.store.query(f"SELECT {self.text_column} FROM {self.table} WHERE {self.text_column} IS NOT NULL ORDER BY id")
+            index.extend(r[0] for r in rows)
+            self._semantic_index = index
+        return self._semantic_index
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Distractor candidates and scoring
+- Term candidates ("A {term}-based solution") are taken from distinct CamelCase
+  terms in document order and capped, so the scan stops early on big pages
+- Candidates are deduplicated before scoring, and every similarity is computed in
+  one batched ratio matrix (fuzzywuzzy-compatible integer scores) rather than one
+  Python fuzz.ratio call per pair
+- The scores keep the harvesters' formulas (same thresholds, same order of float
+  operations), so results match the per-pair loops they replace
+- DistractorPool: answer-like sentences mined from harvested_content, stored in the
+  distractor_pool table per (category, subcategory) with their length, the term
+  that makes them answer-like and a SimHash. Refreshes only mine content added
+  since the last one (distractor_pool_state watermark). In memory every group is
+  sorted by length, so picking distractors of a similar length to the answer is a
+  bisect plus a small random sample
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from bisect import bisect_left
+from pathlib import Path
+from random import Random
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .dedupe.fuzzy import ratio_matrix
+from .dedupe.simhash import from_signed64, simhash64, simhash64_batch, to_signed64
+
+MAX_TERM_CANDIDATES = 50
+PHRASES_PER_CONTENT = 10
+MIN_PHRASE_LEN, MAX_PHRASE_LEN = 30, 150
+POOL_SAMPLE = 16
+NEAR_DUPLICATE_BITS = 8
+GENERIC_TERMS = ("something", "anything", "nothing", "everything", "stuff")
+
+_TERM_RE = re.compile(r"\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b")
+_CODE_RE = re.compile(r"[{}<>=;$#\\]|-->|\b\w+\(\)")
+
+
+def term_candidates(context: str, exclude: str, limit: int = MAX_TERM_CANDIDATES) -> List[str]:
+    """Distractors built from distinct technical terms in context that do not occur in exclude."""
+    excluded = exclude.lower()
+    seen = set()
+    out: List[str] = []
+    for m in _TERM_RE.finditer(context):
+        term = m.group()
+        if term in seen:
+            continue
+        seen.add(term)
+        if term.lower() not in excluded:
+            out.append(f"A {term}-based solution")
+            if len(out) >= limit:
+                break
+    return out
+
+
+def distinct_from(correct: str, candidates: Iterable[str], max_similarity: int = 70) -> List[str]:
+    """Unique candidates (first-seen order) scoring below max_similarity against correct."""
+    unique = [c for c in dict.fromkeys(candidates) if c != correct]
+    if not unique:
+        return []
+    scores = ratio_matrix([correct], unique)[0]
+    return [c for c, score in zip(unique, scores) if score < max_similarity]
+
+
+def distractor_quality(correct: str, distractors: List[str]) -> float:
+    """0..1 quality of a distractor set (length balance, closeness to the answer and to each other)."""
+    quality_score = 1.0
+    lengths = [len(d) for d in distractors]
+    if min(lengths, default=1) > 0 and max(lengths) / max(1, min(lengths)) > 3:
+        quality_score -= 0.2
+    if distractors:
+        scores = ratio_matrix([correct] + distractors, [correct] + distractors)
+        for similarity in scores[0, 1:]:
+            if similarity > 80:
+                quality_score -= 0.3
+            elif similarity < 20:
+                quality_score -= 0.1
+        pairs = scores[1:, 1:][np.triu_indices(len(distractors), 1)]
+        for _ in range(int((pairs > 85).sum())):
+            quality_score -= 0.2
+    for distractor in distractors:
+        if any(term in distractor.lower() for term in GENERIC_TERMS):
+            quality_score -= 0.2
+    return max(0.0, min(1.0, quality_score))
+
+
+def mean_pairwise_similarity(options: List[str]) -> float:
+    """Average fuzz.ratio / 100 over all option pairs."""
+    if len(options) < 2:
+        return 0.0
+    scores = ratio_matrix(options, options)[np.triu_indices(len(options), 1)]
+    similarities = [int(s) / 100 for s in scores]
+    return sum(similarities) / len(similarities)
+
+
+def mine_phrases(text: str, limit: int = PHRASES_PER_CONTENT) -> List[Tuple[str, str]]:
+    """(phrase, term) pairs: distinct declarative sentences of answer length that mention a technical term."""
+    out: List[Tuple[str, str]] = []
+    seen = set()
+    for sentence in text.split("."):
+        phrase = " ".join(sentence.split())
+        if not MIN_PHRASE_LEN <= len(phrase) <= MAX_PHRASE_LEN or phrase in seen:
+            continue
+        # Skip questions, code and other fragments: answers read as sentences
+        if not phrase[0].isupper() or "?" in phrase or _CODE_RE.search(phrase):
+            continue
+        m = _TERM_RE.search(phrase)
+        if m is None:
+            continue
+        seen.add(phrase)
+        out.append((phrase, m.group()))
+        if len(out) >= limit:
+            break
+    return out
+
+
+_Entry = Tuple[int, str, str, int]  # (length, phrase, term, simhash)
+
+
+class DistractorPool:
+    """Corpus-mined distractor phrases per (category, subcategory), sorted by length."""
+
+    def __init__(self) -> None:
+        self._groups: Dict[Tuple[str, Optional[str]], List[_Entry]] = {}
+        self.loaded = False
+        self.version = 0
+
+    def __len__(self) -> int:
+        return sum(len(entries) for (_, sub), entries in self._groups.items() if sub is not None)
+
+    def add(self, category: str, subcategory: str, phrase: str, term: str, simhash: int) -> None:
+        self.extend([(category, subcategory, phrase, term, simhash)])
+
+    def extend(self, rows: Iterable[Tuple[str, str, str, str, int]]) -> None:
+        """Add (category, subcategory, phrase, term, simhash) rows; each group is re-sorted once."""
+        touched = set()
+        for category, subcategory, phrase, term, simhash in rows:
+            entry = (len(phrase), phrase, term, simhash)
+            # Each phrase is filed under its subcategory and under the whole category
+            for key in ((category, subcategory or ""), (category, None)):
+                self._groups.setdefault(key, []).append(entry)
+                touched.add(key)
+        for key in touched:
+            self._groups[key].sort()
+        if touched:
+            self.version += 1
+
+    def _load(self, rows: Iterable[Tuple[Any, ...]]) -> None:
+        self.extend((category, subcategory, phrase, term, from_signed64(simhash)) for category, subcategory, phrase, term, simhash in rows)
+        self.loaded = True
+
+    @classmethod
+    def from_db(cls, db_path: Union[str, Path]) -> "DistractorPool":
+        """Read-only pool of an existing harvest database (empty when there is none yet)."""
+        pool = cls()
+        path = Path(db_path)
+        if path.exists():
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                pool._load(conn.execute("SELECT category, subcategory, phrase, term, simhash FROM distractor_pool"))
+            except sqlite3.Error:
+                pass
+            finally:
+                conn.close()
+        return pool
+
+    def refresh(self, store: Any, batch_size: int = 200) -> int:
+        """Mine content stored since the last refresh into the table and the pool; returns phrases added."""
+        if not self.loaded:
+            self._load(store.query("SELECT category, subcategory, phrase, term, simhash FROM distractor_pool"))
+        row = store.query_one("SELECT MAX(last_content_id) FROM distractor_pool_state")
+        last_id = int(row[0] or 0) if row else 0
+        added = 0
+        while True:
+            batch = store.query(
+                "SELECT id, content, category, subcategory FROM harvested_content WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            )
+            if not batch:
+                break
+            mined = [
+                (category or "", subcategory or "", phrase, term, content_id)
+                for content_id, content, category, subcategory in batch
+                for phrase, term in mine_phrases(content or "")
+            ]
+            hashes = simhash64_batch([m[2] for m in mined])
+            rows = [(cat, sub, phrase, len(phrase), term, to_signed64(int(h)), cid) for (cat, sub, phrase, term, cid), h in zip(mined, hashes)]
+            last_id = batch[-1][0]
+            new: List[Tuple[str, str, str, str, int]] = []
+            with store.transaction() as conn:
+                for cat, sub, phrase, length, term, simhash, cid in rows:
+                    inserted = conn.execute(
+                        "INSERT OR IGNORE INTO distractor_pool (category, subcategory, phrase, length, term, simhash, content_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (cat, sub, phrase, length, term, simhash, cid),
+                    ).rowcount
+                    if inserted:
+                        new.append((cat, sub, phrase, term, from_signed64(simhash)))
+                conn.execute("DELETE FROM distractor_pool_state")
+                conn.execute("INSERT INTO distractor_pool_state (last_content_id) VALUES (?)", (last_id,))
+            self.extend(new)
+            added += len(new)
+        return added
+
+    def pick(self, category: str, subcategory: Optional[str], concept: str, correct: str, k: int, rng: Random) -> List[str]:
+        """Up to k pooled phrases of similar length to correct that neither mention concept nor resemble correct."""
+        entries = self._groups.get((category, subcategory or "")) if subcategory is not None else None
+        if not entries or len(entries) < k:
+            entries = self._groups.get((category, None))
+        if not entries:
+            return []
+        target = len(correct)
+        lo = bisect_left(entries, (-(-target // 2),))
+        hi = bisect_left(entries, (target * 3 // 2 + 1,))
+        if hi - lo < k:
+            return []
+        avoid = concept.lower()
+        correct_hash = simhash64(correct)
+        candidates: List[str] = []
+        for i in rng.sample(range(lo, hi), min(POOL_SAMPLE, hi - lo)):
+            _, phrase, _, h = entries[i]
+            if avoid in phrase.lower() or (h ^ correct_hash).bit_count() < NEAR_DUPLICATE_BITS:
+                continue
+            candidates.append(phrase)
+        return distinct_from(correct, candidates)[:k]
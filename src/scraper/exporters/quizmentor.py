@@ -1,28 +1,73 @@
 #!/usr/bin/env python3
-from __future__ import annotations
-
 """
 QuizMentor exporter: converts harvested questions stored in SQLite into
 QuizMentor quiz JSON files and an index.
+
+Questions are streamed from one cursor ordered by category, so each quiz file is
+written incrementally (one question in memory at a time) and its
+difficulty_distribution is counted on the way through.
+
+Incremental mode keeps a per-category watermark (max question id, question count
+and a sha256 over the exported columns of its rows, in id order) and the sha256 of
+each written file in .export_state.json. Only categories whose watermark moved
+(new, deleted or edited questions) are re-queried and rewritten, and
+export_changeset.json lists the files that were added, updated or removed so
+importers can copy just those. Questions without a category are never exported.
 """
 
+from __future__ import annotations
+
+import hashlib
 import json
+import os
 import sqlite3
+from collections import Counter
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List
-
-import pandas as pd
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 from .base import BaseExporter
 
+MIN_CONFIDENCE = 0.75
+STATE_FILE = ".export_state.json"
+CHANGESET_FILE = "export_changeset.json"
+INDEX_FILE = "harvest_index.json"
+
+
+def _indented(obj: Any, level: int) -> str:
+    """json.dumps(obj, indent=2) as it appears nested `level` deep in an indent=2 document."""
+    return json.dumps(obj, indent=2).replace("\n", "\n" + "  " * level)
+
+
+class _HashingWriter:
+    """Text sink that hashes everything written to it."""
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+        self.sha256 = hashlib.sha256()
+
+    def write(self, text: str) -> None:
+        self._f.write(text)
+        self.sha256.update(text.encode("utf-8"))
+
+
+def _quiz_filename(category: str) -> str:
+    return f"quiz_{category}_harvested.json"
+
 
 class QuizMentorExporter(BaseExporter):
     def __init__(self, harvest_db: str):
         self.db_path = Path(harvest_db)
 
-    def load_questions(self) -> pd.DataFrame:
-        conn = sqlite3.connect(self.db_path)
-        query = """
+    def iter_questions(self, conn: sqlite3.Connection, category: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Exportable questions ordered by category, then difficulty (optionally a single category)."""
+        where, params = "category IS NOT NULL AND confidence >= ?", [MIN_CONFIDENCE]
+        if category is not None:
+            where, params = "category = ? AND confidence >= ?", [category, MIN_CONFIDENCE]
+        cursor = conn.execute(
+            f"""
             SELECT
                 id,
                 question,
@@ -31,32 +76,27 @@ class QuizMentorExporter(BaseExporter):
                 explanation,
                 category,
                 subcategory,
-                difficulty,
-                confidence
+                difficulty
             FROM generated_questions
-            WHERE confidence >= 0.75
-            ORDER BY category, difficulty
-        """
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        df["options"] = df["options"].apply(json.loads)
-        return df
-
-    def create_quiz_format(self, questions_df: pd.DataFrame, category: str) -> Dict:
-        cat_questions = questions_df[questions_df["category"] == category]
-        questions_list = []
-        for _, row in cat_questions.iterrows():
-            question_obj = {
-                "id": f"harvest_{row['id']}",
-                "question": row["question"],
-                "options": row["options"],
-                "correct_answer": int(row["correct_answer"]),
-                "explanation": row["explanation"],
-                "difficulty": int(row["difficulty"]),
-                "tags": [category, row["subcategory"]] if row["subcategory"] else [category],
+            WHERE {where}
+            ORDER BY category, difficulty, id
+            """,
+            params,
+        )
+        for qid, question, options, correct_answer, explanation, category, subcategory, difficulty in cursor:
+            yield {
+                "category": category,
+                "id": f"harvest_{qid}",
+                "question": question,
+                "options": json.loads(options),
+                "correct_answer": int(correct_answer),
+                "explanation": explanation,
+                "difficulty": int(difficulty),
+                "tags": [category, subcategory] if subcategory else [category],
             }
-            questions_list.append(question_obj)
-        quiz = {
+
+    def quiz_header(self, category: str) -> Dict[str, Any]:
+        return {
             "quiz_id": f"harvest_{category}",
             "title": f"{category.title()} Quiz (Harvested)",
             "description": f"Auto-generated quiz from harvested {category} content",
@@ -64,43 +104,162 @@ class QuizMentorExporter(BaseExporter):
             "difficulty": "mixed",
             "time_limit": 30,
             "passing_score": 70,
-            "questions": questions_list,
-            "metadata": {
-                "source": "automated_harvest",
-                "question_count": len(questions_list),
-                "difficulty_distribution": cat_questions["difficulty"].value_counts().to_dict(),
-            },
         }
-        return quiz
 
-    def export(self, out: str) -> List[Dict]:
+    def write_quiz(self, f: TextIO, category: str, questions: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Write one quiz document (same layout as json.dump(quiz, indent=2)); returns its metadata."""
+        f.write("{\n")
+        for key, value in self.quiz_header(category).items():
+            f.write(f"  {json.dumps(key)}: {_indented(value, 1)},\n")
+        f.write('  "questions": [')
+        difficulties: Counter = Counter()
+        count = 0
+        for q in questions:
+            obj = {k: v for k, v in q.items() if k != "category"}
+            f.write(",\n    " if count else "\n    ")
+            f.write(_indented(obj, 2))
+            difficulties[obj["difficulty"]] += 1
+            count += 1
+        f.write("\n  ],\n" if count else "],\n")
+        metadata = {
+            "source": "automated_harvest",
+            "question_count": count,
+            # Most common first; ties keep first-seen (ascending difficulty) order
+            "difficulty_distribution": dict(sorted(difficulties.items(), key=lambda kv: -kv[1])),
+        }
+        f.write(f'  "metadata": {_indented(metadata, 1)}\n}}')
+        return metadata
+
+    def watermarks(self, conn: sqlite3.Connection) -> Dict[str, Tuple[int, int, str]]:
+        """(max id, question count, digest of the exported columns) of every exportable category."""
+        rows = conn.execute(
+            """
+            SELECT category, id, question, options, correct_answer, explanation, subcategory, difficulty
+            FROM generated_questions
+            WHERE category IS NOT NULL AND confidence >= ?
+            ORDER BY category, id
+            """,
+            (MIN_CONFIDENCE,),
+        )
+        marks: Dict[str, Tuple[int, int, str]] = {}
+        for category, group in groupby(rows, key=itemgetter(0)):
+            digest = hashlib.sha256()
+            max_id = count = 0
+            for row in group:
+                # JSON keeps the field boundaries unambiguous (no separator can collide with the text)
+                digest.update(json.dumps(row[1:]).encode("utf-8") + b"\n")
+                max_id, count = row[1], count + 1
+            marks[category] = (max_id, count, digest.hexdigest())
+        return marks
+
+    def _write_atomic(self, path: Path, category: str, questions: Iterable[Dict[str, Any]], previous_sha: Optional[str] = None) -> Tuple[Dict[str, Any], str, bool]:
+        """Write via a temp file; returns (metadata, sha256, changed). Identical content leaves the file untouched."""
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp, "w") as f:
+                writer = _HashingWriter(f)
+                metadata = self.write_quiz(writer, category, questions)
+            digest = writer.sha256.hexdigest()
+            changed = digest != previous_sha or not path.exists()
+            if changed:
+                os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return metadata, digest, changed
+
+    def _load_state(self, out_dir: Path) -> Dict[str, Any]:
+        try:
+            state = json.loads((out_dir / STATE_FILE).read_text())
+        except (OSError, ValueError):
+            return {}
+        if state.get("min_confidence") != MIN_CONFIDENCE:
+            return {}
+        return state.get("categories", {})
+
+    def _save_state(self, out_dir: Path, categories: Dict[str, Any]) -> None:
+        state = {"db": str(self.db_path), "min_confidence": MIN_CONFIDENCE, "categories": categories}
+        tmp = out_dir / (STATE_FILE + ".tmp")
+        tmp.write_text(json.dumps(state, indent=2))
+        os.replace(tmp, out_dir / STATE_FILE)
+
+    def export(self, out: str, incremental: bool = False) -> List[Dict]:
+        """Write quiz files and the index; with incremental=True only categories whose watermark moved are rewritten."""
         out_dir = Path(out)
         out_dir.mkdir(parents=True, exist_ok=True)
-        df = self.load_questions()
-        categories = df["category"].unique()
-        quiz_summary: List[Dict] = []
-        for category in categories:
-            quiz = self.create_quiz_format(df, category)
-            filename = f"quiz_{category}_harvested.json"
-            filepath = out_dir / filename
-            with open(filepath, "w") as f:
-                json.dump(quiz, f, indent=2)
-            quiz_info = {
-                "category": category,
-                "questions": len(quiz["questions"]),
+        previous = self._load_state(out_dir)
+        categories: Dict[str, Any] = {}
+        changes: Dict[str, List[str]] = {"added": [], "updated": [], "removed": []}
+        unchanged = 0
+
+        def record(category: str, watermark: Tuple[int, int, str], questions: Iterable[Dict[str, Any]]) -> None:
+            filepath = out_dir / _quiz_filename(category)
+            old = previous.get(category) or {}
+            metadata, digest, changed = self._write_atomic(filepath, category, questions, old.get("sha256"))
+            categories[category] = {
+                "max_id": watermark[0],
+                "count": watermark[1],
+                "digest": watermark[2],
+                "sha256": digest,
                 "file": str(filepath),
-                "difficulties": quiz["metadata"]["difficulty_distribution"],
+                "questions": metadata["question_count"],
+                "difficulties": metadata["difficulty_distribution"],
             }
-            quiz_summary.append(quiz_info)
-        index = {
-            "total_quizzes": len(quiz_summary),
-            "total_questions": sum(q["questions"] for q in quiz_summary),
-            "categories": [q["category"] for q in quiz_summary],
-            "quizzes": quiz_summary,
-            "integration_ready": True,
+            if changed:
+                changes["updated" if old else "added"].append(str(filepath))
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            # Read watermarks before streaming: rows landing in between only make the next run redo a category
+            marks = self.watermarks(conn)
+            if incremental:
+                for category, watermark in marks.items():
+                    old = previous.get(category)
+                    if old and (old["max_id"], old["count"], old.get("digest")) == tuple(watermark) and Path(old["file"]).exists():
+                        categories[category] = old
+                        unchanged += 1
+                        continue
+                    record(category, watermark, self.iter_questions(conn, category))
+            else:
+                for category, questions in groupby(self.iter_questions(conn), key=lambda q: q["category"]):
+                    record(category, marks.get(category, (0, 0, "")), questions)
+        finally:
+            conn.close()
+
+        for category, old in previous.items():
+            if category not in categories:
+                Path(old["file"]).unlink(missing_ok=True)
+                changes["removed"].append(old["file"])
+
+        quiz_summary: List[Dict] = [
+            {
+                "category": category,
+                "questions": info["questions"],
+                "file": info["file"],
+                "difficulties": info["difficulties"],
+            }
+            for category, info in categories.items()
+        ]
+        index_path = out_dir / INDEX_FILE
+        write_index = not incremental or any(changes.values()) or not index_path.exists()
+        if write_index:
+            index = {
+                "total_quizzes": len(quiz_summary),
+                "total_questions": sum(q["questions"] for q in quiz_summary),
+                "categories": [q["category"] for q in quiz_summary],
+                "quizzes": quiz_summary,
+                "integration_ready": True,
+            }
+            with open(index_path, "w") as f:
+                json.dump(index, f, indent=2)
+        self._save_state(out_dir, categories)
+        changeset = {
+            "generated_at": datetime.now().isoformat(),
+            "incremental": incremental,
+            **changes,
+            "unchanged": unchanged,
+            "index": str(index_path) if write_index else None,
         }
-        index_path = out_dir / "harvest_index.json"
-        with open(index_path, "w") as f:
-            json.dump(index, f, indent=2)
+        with open(out_dir / CHANGESET_FILE, "w") as f:
+            json.dump(changeset, f, indent=2)
         return quiz_summary
-
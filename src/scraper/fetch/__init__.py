@@ -0,0 +1,6 @@
+from .engine import FetchEngine  # noqa: F401
+from .aio import AsyncFetchEngine, FetchResult  # noqa: F401
+from .cache import ResponseCache, CachingAdapter, install_cache  # noqa: F401
+from .ratelimit import HostRateLimiter, TokenBucket  # noqa: F401
+from .frontier import CrawlFrontier, SeenUrls  # noqa: F401
+from .sitemap import SitemapState, changed_urls  # noqa: F401
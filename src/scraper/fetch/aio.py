@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Asyncio fetch engine
+- One event loop drives all requests (aiohttp); no OS thread per request
+- max_in_flight bounds concurrent requests, per_host bounds each origin
+- CPU work (HTML parsing, concept extraction) is handed to a process pool via
+  offload() so network waits never block on parsing
+- Response cache lookups and writes (sqlite plus body files) run in a worker
+  thread, so cache I/O does not stall the other requests on the loop
+- aiohttp is an optional dependency: pip install 'Scraper[async]'
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlencode
+
+from .cache import ResponseCache, cacheable
+from .engine import host_of
+from .ratelimit import HostRateLimiter
+
+T = TypeVar("T")
+
+
+def _require_aiohttp():
+    try:
+        import aiohttp  # type: ignore
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise RuntimeError("The async engine requires aiohttp; install with: pip install 'Scraper[async]'") from e
+    return aiohttp
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoding: str = "utf-8"
+    from_cache: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class AsyncFetchEngine:
+    """Event-loop fetcher with bounded concurrency and a CPU executor."""
+
+    def __init__(
+        self,
+        max_in_flight: int = 1000,
+        per_host: int = 1,
+        timeout: float = 10.0,
+        headers: Optional[Dict[str, str]] = None,
+        cpu_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+    ) -> None:
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.per_host = max(1, int(per_host))
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.cpu_workers = cpu_workers
+        self._executor = executor
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self._session = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+
+    def run(self, main: Callable[["AsyncFetchEngine"], Awaitable[T]]) -> T:
+        """Open the HTTP session and executor, run main(engine), then tear down."""
+        return asyncio.run(self._run(main))
+
+    async def _run(self, main: Callable[["AsyncFetchEngine"], Awaitable[T]]) -> T:
+        aiohttp = _require_aiohttp()
+        owns_executor = self._executor is None
+        executor = self._executor or ProcessPoolExecutor(max_workers=self.cpu_workers)
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        try:
+            async with aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=timeout) as session:
+                self._session = session
+                self._executor = executor
+                self._in_flight = asyncio.Semaphore(self.max_in_flight)
+                return await main(self)
+        finally:
+            self._session = None
+            self._in_flight = None
+            if owns_executor:
+                executor.shutdown(wait=True)
+                self._executor = None
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> FetchResult:
+        if self._session is None or self._in_flight is None:
+            raise RuntimeError("AsyncFetchEngine.get() called outside of run()")
+        query = {k: str(v) for k, v in (params or {}).items()}
+        full_url = f"{url}{'&' if '?' in url else '?'}{urlencode(query)}" if query else url
+        entry = await asyncio.to_thread(self.cache.get, full_url) if self.cache else None
+        conditional: Dict[str, str] = {}
+        if entry and entry.etag:
+            conditional["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            conditional["If-Modified-Since"] = entry.last_modified
+        if self.rate_limiter is not None:
+            # Wait for the host's token before taking an in-flight slot
+            await self.rate_limiter.acquire_async(host_of(url))
+        async with self._in_flight:
+            async with self._session.get(full_url, headers=conditional or None) as resp:
+                if resp.status == 304 and entry:
+                    return FetchResult(url=entry.url, status_code=entry.status, content=entry.body, headers=entry.headers, from_cache=True)
+                body = await resp.read()
+                result = FetchResult(
+                    url=str(resp.url),
+                    status_code=resp.status,
+                    content=body,
+                    headers={k: v for k, v in resp.headers.items()},
+                    encoding=resp.charset or "utf-8",
+                )
+        if self.cache and result.status_code == 200 and cacheable(result.headers):
+            await asyncio.to_thread(self.cache.put, full_url, result.status_code, result.headers, result.content)
+        return result
+
+    async def offload(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a CPU-bound, picklable function on the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
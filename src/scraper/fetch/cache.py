@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP response cache
+- Bodies live under <cache_dir>/bodies, metadata in <cache_dir>/index.db
+- Keyed by normalized URL; stores status, headers and validators (ETag / Last-Modified)
+- CachingAdapter sends conditional requests; a 304 is answered from disk and the
+  response is flagged with response.from_cache = True so callers can skip re-parsing
+- Least-recently-used entries are evicted once the cache exceeds max_bytes
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .urls import normalize_url
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    url: str
+    status: int
+    headers: Dict[str, str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+
+
+class ResponseCache:
+    """On-disk response store with size-based LRU eviction."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.bodies_dir = self.cache_dir / "bodies"
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_dir / "index.db", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                status INTEGER,
+                headers TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER,
+                stored_at REAL,
+                accessed_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+        self._conn.commit()
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _body_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.bodies_dir / digest[:2] / digest
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, etag, last_modified FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            try:
+                body = self._body_path(key).read_bytes()
+            except OSError:
+                self._delete(key)
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return CacheEntry(key=key, url=row[0], status=row[1], headers=json.loads(row[2]), etag=row[3], last_modified=row[4], body=body)
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        key = normalize_url(url)
+        path = self._body_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        tmp.replace(path)
+        now = time.time()
+        validators = CaseInsensitiveDict(headers)
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO entries (key, url, status, headers, etag, last_modified, size, stored_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, url, status, json.dumps(dict(headers)), validators.get("ETag"), validators.get("Last-Modified"), len(body), now, now),
+            )
+            self._total += len(body) - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _delete(self, key: str) -> None:
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row:
+            self._total -= row[0] or 0
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._body_path(key).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        # Drop least-recently-used entries until we are 10% under budget
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        projected = self._total
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC").fetchall():
+            if projected <= target:
+                break
+            projected -= size or 0
+            victims.append(key)
+        for key in victims:
+            self._delete(key)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def cacheable(headers: Dict[str, str]) -> bool:
+    headers = CaseInsensitiveDict(headers)
+    if "no-store" in headers.get("Cache-Control", "").lower():
+        return False
+    return bool(headers.get("ETag") or headers.get("Last-Modified"))
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that revalidates GETs against a ResponseCache."""
+
+    def __init__(self, cache: ResponseCache, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        if request.method != "GET" or stream:
+            response = super().send(request, stream=stream, **kwargs)
+            response.from_cache = False
+            return response
+        entry = self.cache.get(request.url)
+        if entry:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+        response = super().send(request, stream=stream, **kwargs)
+        if response.status_code == 304 and entry:
+            response.status_code = entry.status
+            response.headers = CaseInsensitiveDict(entry.headers)
+            response._content = entry.body
+            response.from_cache = True
+            return response
+        response.from_cache = False
+        if response.status_code == 200:
+            headers = dict(response.headers)
+            if cacheable(headers):
+                self.cache.put(request.url, response.status_code, headers, response.content)
+        return response
+
+
+def install_cache(session: requests.Session, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, pool_maxsize: int = 10) -> ResponseCache:
+    """Mount a CachingAdapter for http(s) on the session and return the cache."""
+    cache = ResponseCache(cache_dir, max_bytes=max_bytes)
+    adapter = CachingAdapter(cache, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return cache
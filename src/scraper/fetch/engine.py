@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Concurrent fetch engine
+- Runs fetch jobs on a bounded thread pool (max_workers)
+- Caps in-flight jobs per host (per_host) so each origin keeps a polite load
+- Schedules hosts round-robin so one busy host never starves the others
+- Returns results in submission order regardless of completion order
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+Job = Tuple[str, Callable[[], Any]]
+
+
+def host_of(url: str) -> str:
+    try:
+        return urlparse(url).netloc.lower()
+    except Exception:
+        return ""
+
+
+class FetchEngine:
+    """Bounded pool with a per-host concurrency limit and ordered results."""
+
+    def __init__(self, max_workers: int = 10, per_host: int = 1) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.per_host = max(1, int(per_host))
+
+    def run(self, jobs: Iterable[Job], on_done: Optional[Callable[[int, Any], None]] = None) -> List[Any]:
+        """Run (host, thunk) jobs and return their results in job order.
+
+        on_done(index, result) is called from the calling thread as each job
+        finishes, which makes it safe to drive progress bars from it.
+        """
+        jobs = list(jobs)
+        results: List[Any] = [None] * len(jobs)
+        pending: "OrderedDict[str, Deque[int]]" = OrderedDict()
+        for idx, (host, _) in enumerate(jobs):
+            pending.setdefault(host, deque()).append(idx)
+        active: Dict[str, int] = {host: 0 for host in pending}
+        in_flight: Dict[Future, Tuple[int, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or in_flight:
+                for host in list(pending):
+                    queue = pending[host]
+                    while queue and active[host] < self.per_host and len(in_flight) < self.max_workers:
+                        idx = queue.popleft()
+                        in_flight[pool.submit(jobs[idx][1])] = (idx, host)
+                        active[host] += 1
+                    if not queue:
+                        del pending[host]
+                    else:
+                        # rotate so the next fill starts with a different host
+                        pending.move_to_end(host)
+                if not in_flight:
+                    break
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    idx, host = in_flight.pop(fut)
+                    active[host] -= 1
+                    results[idx] = fut.result()
+                    if on_done is not None:
+                        on_done(idx, results[idx])
+        return results
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Crawl frontier for documentation sites
+- CrawlFrontier: a heap ordered by (depth, path depth, discovery order), so a
+  site's shallow index pages are fetched before its deep leaves
+- Links are followed only within the seeds' scope (same host, under the seed's
+  directory), up to max_depth hops from a seed, skipping binary assets
+- Every URL is keyed by canonicalize_url, so /ec2/, /ec2/index.html and
+  /ec2?utm_source=x are one page and are queued once
+- SeenUrls: the canonical URLs already fetched, kept in a scalable Bloom filter
+  (~2.4 bytes per URL at a 1e-4 false-positive rate instead of a set of strings),
+  saved to the harvest database so later runs do not fetch them again; landing
+  pages and pages a sitemap reports as changed are pushed with refetch=True
+  (see sitemap.py)
+- A popped URL counts as seen only once the caller reports it done (a 2xx, or a
+  permanent 4xx that is not worth fetching again); transient failures (5xx, 408,
+  425, 429, network errors) are reported with failed() and stay in pending() for
+  the next run, up to max_attempts tries
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from .urls import canonicalize_url
+
+DEFAULT_MAX_DEPTH = 2
+SEEN_CAPACITY = 100_000
+SEEN_ERROR_RATE = 1e-4
+MAX_ATTEMPTS = 3
+RETRY_STATUSES = frozenset({408, 425, 429})
+_SKIP_EXTENSIONS = frozenset({
+    "png", "jpg", "jpeg", "gif", "svg", "ico", "webp", "pdf", "zip", "gz", "tgz", "tar",
+    "mp4", "mp3", "woff", "woff2", "ttf", "css", "js", "json", "xml", "txt",
+})
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (enhanced double hashing of one BLAKE2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytes] = None, count: int = 0) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little")
+        b = int.from_bytes(digest[8:], "little")
+        positions = []
+        for i in range(self.num_hashes):
+            # The growing step keeps probes distinct even when b shares factors with num_bits
+            positions.append(a % self.num_bits)
+            a += b
+            b += i
+        return positions
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: str) -> None:
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class SeenUrls:
+    """Scalable Bloom filter: a full layer is frozen and a new one twice its size
+    (and half its error rate) takes further URLs, so the overall false-positive
+    rate stays below 2 * error_rate however many URLs are added."""
+
+    def __init__(self, capacity: int = SEEN_CAPACITY, error_rate: float = SEEN_ERROR_RATE) -> None:
+        self.layers: List[BloomFilter] = [BloomFilter(capacity, error_rate)]
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    def __contains__(self, url: str) -> bool:
+        return any(url in layer for layer in self.layers)
+
+    def add(self, url: str) -> bool:
+        """Record a canonical URL; False if it (probably) was already there."""
+        with self._lock:
+            if url in self:
+                return False
+            last = self.layers[-1]
+            if last.full:
+                last = BloomFilter(last.capacity * 2, last.error_rate / 2)
+                self.layers.append(last)
+            last.add(url)
+            self.dirty = True
+            return True
+
+    @classmethod
+    def from_store(cls, store: Any) -> "SeenUrls":
+        rows = store.query("SELECT capacity, error_rate, item_count, bits FROM crawl_seen ORDER BY layer")
+        seen = cls()
+        if rows:
+            seen.layers = [BloomFilter(capacity, error_rate, bits, count) for capacity, error_rate, count, bits in rows]
+        return seen
+
+    def save(self, store: Any) -> None:
+        with self._lock, store.transaction() as conn:
+            conn.execute("DELETE FROM crawl_seen")
+            conn.executemany(
+                "INSERT INTO crawl_seen (layer, capacity, error_rate, item_count, bits) VALUES (?, ?, ?, ?, ?)",
+                [(i, layer.capacity, layer.error_rate, layer.count, bytes(layer.bits)) for i, layer in enumerate(self.layers)],
+            )
+            self.dirty = False
+
+
+def _scope(seed: str) -> Tuple[str, str]:
+    # Directory of the seed: /ec2/ -> /ec2, /compute/docs -> /compute
+    path = urlsplit(seed).path
+    directory = path if path.endswith("/") else path.rsplit("/", 1)[0] + "/"
+    parts = urlsplit(canonicalize_url(directory, seed))
+    return parts.netloc, parts.path.rstrip("/")
+
+
+class CrawlFrontier:
+    """Priority queue of one site's pages to fetch."""
+
+    def __init__(
+        self,
+        seeds: Iterable[str],
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        seen: Optional[SeenUrls] = None,
+        max_attempts: int = MAX_ATTEMPTS,
+    ) -> None:
+        self.seeds = list(seeds)
+        self.max_depth = max_depth
+        self.max_attempts = max_attempts
+        self.seen = seen if seen is not None else SeenUrls()
+        self._scopes = {_scope(seed) for seed in self.seeds}
+        self._heap: List[Tuple[int, int, int, str, str, bool, int]] = []
+        self._queued: set = set()
+        self._in_flight: Dict[str, Tuple[int, int, int, str, str, bool, int]] = {}
+        self._failed: List[Tuple[int, int, int, str, str, bool, int]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def in_scope(self, canonical: str) -> bool:
+        parts = urlsplit(canonical)
+        if parts.scheme not in ("http", "https"):
+            return False
+        name = parts.path.rsplit("/", 1)[-1]
+        if "." in name and name.rsplit(".", 1)[-1].lower() in _SKIP_EXTENSIONS:
+            return False
+        return any(
+            parts.netloc == host and (not prefix or parts.path == prefix or parts.path.startswith(prefix + "/"))
+            for host, prefix in self._scopes
+        )
+
+    def push(self, url: str, depth: int = 0, base: str = "", refetch: bool = False, attempts: int = 0) -> bool:
+        """Queue a link unless it is too deep, out of scope, queued or (unless refetch) already fetched."""
+        if depth > self.max_depth:
+            return False
+        canonical = canonicalize_url(url, base)
+        if canonical in self._queued or not self.in_scope(canonical) or (not refetch and canonical in self.seen):
+            return False
+        self._queued.add(canonical)
+        # Fetch the link as written (minus fragment) so servers do not redirect to add a slash back
+        target = urldefrag(urljoin(base, url))[0] if base else url
+        heapq.heappush(self._heap, (depth, canonical.count("/"), self._seq, target, canonical, refetch, attempts))
+        self._seq += 1
+        return True
+
+    def extend(self, urls: Iterable[str], depth: int, base: str = "") -> int:
+        return sum(self.push(url, depth, base) for url in urls)
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """Next (url, depth) to fetch; report the outcome with done(url)."""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            depth, _, _, url, canonical, refetch, _ = entry
+            if refetch or canonical not in self.seen:
+                self._in_flight[url] = entry
+                return url, depth
+        return None
+
+    def done(self, url: str) -> None:
+        """Mark a popped url fetched (2xx), so no later run fetches it unless refetched."""
+        entry = self._in_flight.pop(url, None)
+        if entry is not None:
+            self.seen.add(entry[4])
+
+    def failed(self, url: str) -> bool:
+        """A popped url failed transiently: keep it for the next run (False once it is out of
+        attempts, or was not in flight)."""
+        entry = self._in_flight.pop(url, None)
+        if entry is None:
+            return False
+        attempts = entry[6] + 1
+        if attempts >= self.max_attempts:
+            return False
+        self._failed.append(entry[:6] + (attempts,))
+        return True
+
+    def pending(self) -> List[Tuple[str, int, bool, int]]:
+        """Queued and failed (url, depth, refetch, attempts) in fetch order (persisted between runs)."""
+        entries = sorted([*self._heap, *self._failed, *self._in_flight.values()])
+        return [(url, depth, refetch, attempts) for depth, _, _, url, _, refetch, attempts in entries]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Per-host token-bucket rate limiting
+- One bucket per host: refills at requests_per_minute, holds at most `burst` tokens
+- reserve() takes a token and returns how long the caller must wait, so the same
+  limiter paces worker threads (acquire) and the event loop (acquire_async)
+- Limits come from robots_tos.rate_limit in policy.yaml (see docs/POLICY_TEMPLATE.yaml)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_BURST = 10
+DEFAULT_POLICY_FILE = "policy.yaml"
+
+
+class TokenBucket:
+    def __init__(self, rate_per_sec: float, burst: int) -> None:
+        self.rate = max(rate_per_sec, 1e-9)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token; return seconds to wait before it may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class HostRateLimiter:
+    """Shared scheduler handing out per-host request slots."""
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE, burst: int = DEFAULT_BURST) -> None:
+        self.requests_per_minute = float(requests_per_minute)
+        self.burst = int(burst)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_minute / 60.0, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def reserve(self, host: str) -> float:
+        return self._bucket(host.lower()).reserve()
+
+    def acquire(self, host: str) -> float:
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, host: str) -> float:
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    @classmethod
+    def from_policy(cls, policy_path: Optional[str] = None) -> "HostRateLimiter":
+        """Build from robots_tos.rate_limit; falls back to ./policy.yaml, then template defaults."""
+        rate_limit = load_rate_limit_policy(policy_path)
+        return cls(
+            requests_per_minute=rate_limit.get("requests_per_minute", DEFAULT_REQUESTS_PER_MINUTE),
+            burst=rate_limit.get("burst", DEFAULT_BURST),
+        )
+
+
+def load_rate_limit_policy(policy_path: Optional[str] = None) -> Dict[str, Any]:
+    path = Path(policy_path) if policy_path else Path(DEFAULT_POLICY_FILE)
+    if not path.exists():
+        if policy_path:
+            raise FileNotFoundError(f"policy file not found: {path}")
+        return {}
+    import yaml
+
+    with open(path, "r") as f:
+        policy = yaml.safe_load(f) or {}
+    return (policy.get("robots_tos") or {}).get("rate_limit") or {}
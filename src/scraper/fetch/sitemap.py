@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Sitemap discovery and change detection
+- Sitemaps come from robots.txt `Sitemap:` lines (else /sitemap.xml); indexes are
+  followed breadth-first, up to max_sitemaps files per walk
+- iter_sitemap streams the XML with iterparse and clears each <url> once read, so
+  a 50k-URL (or gzipped) sitemap never becomes a tree in memory
+- SitemapState keeps, per crawled site, the last <lastmod> seen for each page and
+  child sitemap (sitemap_lastmod table): an unchanged child sitemap is not even
+  fetched, and a page is reported only when it is new or its lastmod moved
+- A child sitemap's lastmod is recorded once it was read; a page's only once the
+  crawler fetched it (fetched()), so a page lost to an error or crash is
+  reported again by the next walk
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import xml.etree.ElementTree as ET
+from collections import deque
+from datetime import datetime, timezone
+from typing import IO, Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+from .urls import canonicalize_url
+
+DEFAULT_MAX_SITEMAPS = 50
+_BATCH = 1000
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[str]:
+    """W3C datetime (date, or date-time with Z / offset) as a sortable UTC ISO string."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        # fromisoformat only accepts a trailing "Z" from Python 3.11
+        when = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def sitemaps_from_robots(robots_txt: str, base: str) -> List[str]:
+    urls = []
+    for line in robots_txt.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "sitemap" and value.strip():
+            urls.append(urljoin(base, value.strip()))
+    return urls
+
+
+def open_sitemap(raw: IO[bytes]) -> IO[bytes]:
+    """Transparently gunzip .xml.gz bodies (sniffed, since servers label them inconsistently)."""
+    stream = raw if isinstance(raw, io.BufferedReader) else io.BufferedReader(raw)
+    return gzip.GzipFile(fileobj=stream) if stream.peek(2)[:2] == _GZIP_MAGIC else stream
+
+
+def iter_sitemap(raw: IO[bytes]) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Yield ("url" | "sitemap", loc, lastmod) from a urlset or sitemap index."""
+    loc: Optional[str] = None
+    lastmod: Optional[str] = None
+    for _, elem in ET.iterparse(open_sitemap(raw), events=("end",)):
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if tag == "loc":
+            loc = (elem.text or "").strip()
+        elif tag == "lastmod":
+            lastmod = parse_lastmod(elem.text)
+        elif tag in ("url", "sitemap"):
+            if loc:
+                yield tag, loc, lastmod
+            loc = lastmod = None
+            elem.clear()
+
+
+class SitemapState:
+    """Last lastmod recorded per URL (pages and child sitemaps) of one site."""
+
+    def __init__(self, store: Any, site: str) -> None:
+        self.store = store
+        self.site = site
+        # canonical URL -> (url, lastmod) of pages reported but not fetched yet
+        self._reported: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    def changed(self, entries: Sequence[Tuple[str, Optional[str]]]) -> List[Tuple[str, bool]]:
+        """(url, updated) for entries that are new (updated=False) or whose lastmod moved
+        past the recorded one (updated=True); nothing is recorded."""
+        if not entries:
+            return []
+        known: Dict[str, Optional[str]] = {}
+        latest = dict(entries)
+        urls = list(latest)
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            rows = self.store.query(
+                f"SELECT url, lastmod FROM sitemap_lastmod WHERE site = ? AND url IN ({','.join('?' * len(chunk))})",
+                [self.site, *chunk],
+            )
+            known.update(rows)
+        return [
+            (url, url in known) for url, lastmod in latest.items()
+            if url not in known or (lastmod is not None and (known[url] is None or lastmod > known[url]))
+        ]
+
+    def report(self, entries: Sequence[Tuple[str, Optional[str]]]) -> List[Tuple[str, bool]]:
+        """changed() for pages; their lastmods are held until fetched() is called."""
+        latest = dict(entries)
+        fresh = self.changed(entries)
+        for url, _ in fresh:
+            self._reported[canonicalize_url(url)] = (url, latest[url])
+        return fresh
+
+    def fetched(self, url: str) -> None:
+        """Record the lastmod of a reported page once it was fetched (any spelling of its URL)."""
+        entry = self._reported.pop(canonicalize_url(url), None)
+        if entry is not None:
+            self.record([entry])
+
+    def record(self, entries: Iterable[Tuple[str, Optional[str]]]) -> None:
+        self.store.executemany(
+            "INSERT OR REPLACE INTO sitemap_lastmod (site, url, lastmod) VALUES (?, ?, ?)",
+            ((self.site, url, lastmod) for url, lastmod in entries),
+        )
+
+
+def changed_urls(
+    open_url: Callable[[str], ContextManager[IO[bytes]]],
+    sitemaps: Iterable[str],
+    state: SitemapState,
+    accept: Callable[[str], bool] = lambda url: True,
+    max_sitemaps: int = DEFAULT_MAX_SITEMAPS,
+) -> Iterator[Tuple[str, bool]]:
+    """Walk sitemaps (and their indexes) and yield (url, updated) for accepted pages
+    that are new or changed since the last walk.
+
+    A child sitemap is recorded only after it was read to the end, so an interrupted
+    walk revisits it; unreadable sitemaps are skipped. Pages are recorded by
+    state.fetched() once the crawler fetched them.
+    """
+    queue = deque((url, None) for url in sitemaps)
+    visited = set()
+    while queue and len(visited) < max_sitemaps:
+        sitemap, lastmod = queue.popleft()
+        if sitemap in visited:
+            continue
+        visited.add(sitemap)
+        children: List[Tuple[str, Optional[str]]] = []
+        batch: List[Tuple[str, Optional[str]]] = []
+        try:
+            with open_url(sitemap) as raw:
+                for kind, loc, loc_lastmod in iter_sitemap(raw):
+                    if kind == "sitemap":
+                        children.append((loc, loc_lastmod))
+                    elif accept(loc):
+                        batch.append((loc, loc_lastmod))
+                        if len(batch) >= _BATCH:
+                            yield from state.report(batch)
+                            batch = []
+        except (OSError, EOFError, ET.ParseError, ValueError):
+            continue
+        yield from state.report(batch)
+        if lastmod is not None:
+            state.record([(sitemap, lastmod)])
+        # Children without a lastmod are always read; dated ones only when they moved
+        dated = {url for url, _ in state.changed([c for c in children if c[1] is not None])}
+        queue.extend((url, mod) for url, mod in children if mod is None or url in dated)
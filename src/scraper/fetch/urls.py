@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+URL helpers shared by the fetch layer.
+- normalize_url: cache key (same resource, same bytes)
+- canonicalize_url: crawl identity (same page), additionally dropping tracking
+  parameters, dot segments, index.html and the trailing slash
+"""
+
+from __future__ import annotations
+
+import posixpath
+import re
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_SLASHES_RE = re.compile(r"/{2,}")
+_INDEX_PAGES = ("index.html", "index.htm")
+TRACKING_PARAMS = frozenset({"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "_ga", "_gl"})
+
+
+def normalize_url(url: str) -> str:
+    """Stable form of a URL for cache keys: lowercase scheme/host, no default
+    port, no fragment, query parameters sorted."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        host = f"{parts.username}@{host}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def canonicalize_url(url: str, base: str = "") -> str:
+    """Crawl identity of a (possibly relative) link: normalize_url plus resolved
+    ./ and ../, collapsed slashes, no index.html or trailing slash, and no
+    utm_* or click-tracking query parameters."""
+    parts = urlsplit(normalize_url(urljoin(base, url.strip()) if base else url))
+    path = posixpath.normpath(_SLASHES_RE.sub("/", parts.path)) if parts.path not in ("", "/") else "/"
+    head, _, last = path.rpartition("/")
+    if last.lower() in _INDEX_PAGES:
+        path = head
+    path = path.rstrip("/") or "/"
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ])
+    return urlunsplit((parts.scheme, parts.netloc, path, query, ""))
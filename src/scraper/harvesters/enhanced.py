@@ -6,14 +6,11 @@ Enhanced Harvester module extracted from QuizMentor.ai scripts/python/enhanced_h
 from __future__ import annotations
 
 import json
-import sqlite3
 import hashlib
 import time
 import re
-import random
 import requests
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 from collections import defaultdict, Counter
 from pathlib import Path
@@ -22,9 +19,6 @@ from urllib.parse import urlparse
 # Data processing
 import pandas as pd
 import numpy as np  # noqa: F401
-from fuzzywuzzy import fuzz
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 # Web scraping
 from bs4 import BeautifulSoup
@@ -36,6 +30,18 @@ from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.prompt import Confirm
 
+from ..concepts import extract_concepts
+from ..dedupe.semantic import SemanticIndex
+from ..dedupe.store import DedupeStore
+from ..distractors import DistractorPool, distinct_from, distractor_quality, term_candidates
+from ..fetch.cache import ResponseCache, install_cache
+from ..fetch.engine import host_of
+from ..fetch.ratelimit import HostRateLimiter
+from ..migrations import ENHANCED_MIGRATIONS
+from ..seeding import make_rng, timestamp
+from ..storage import HarvestStore
+from ..text_index import document_index
+
 console = Console()
 
 
@@ -61,65 +67,59 @@ class EnhancedQuestion:
 class EnhancedHarvester:
     """Enhanced harvester with better source management and quality control"""
 
-    def __init__(self, output_dir: str = "./harvest_output", teach: bool = False):
+    def __init__(
+        self,
+        output_dir: str = "./harvest_output",
+        teach: bool = False,
+        cache_dir: Optional[str] = None,
+        cache_max_mb: int = 512,
+        policy_path: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        # All random choices come from this RNG; seeded runs also use a fixed clock
+        self.seed = seed
+        self.rng = make_rng(seed)
 
         self.used_sources = set()
         self.source_rotation = defaultdict(int)
         self.answer_distribution = Counter()
         self.semantic_cache: Dict[str, float] = {}
         self.teach = teach
-        self.vectorizer = TfidfVectorizer(max_features=1000)
-        self.question_vectors = None
         self.existing_questions: List[str] = []
 
         self.db_path = self.output_dir / "enhanced_harvest.db"
-        self._init_enhanced_database()
+        self.store = HarvestStore(self.db_path, migrations=ENHANCED_MIGRATIONS)
+        # Fingerprints and TF-IDF vectors of every stored question, loaded on first use and
+        # updated as questions are accepted (no refit)
+        self.dedupe = DedupeStore(self.store, "enhanced_questions", "semantic_fingerprint")
+        # Distractor phrases mined by the massive harvester from its stored content, if any
+        self.distractor_pool = DistractorPool.from_db(self.output_dir / "harvest.db")
 
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Educational Quiz Harvester) AppleWebKit/537.36",
         })
+        self.cache: Optional[ResponseCache] = None
+        if cache_dir:
+            self.cache = install_cache(self.session, cache_dir, max_bytes=cache_max_mb * 1024 * 1024)
+        self.rate_limiter = HostRateLimiter.from_policy(policy_path)
 
-    def _init_enhanced_database(self) -> None:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS enhanced_questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                question TEXT NOT NULL,
-                options TEXT NOT NULL,
-                correct_answer INTEGER NOT NULL,
-                explanation TEXT,
-                category TEXT,
-                subcategory TEXT,
-                difficulty INTEGER,
-                confidence REAL,
-                source_url TEXT,
-                source_type TEXT,
-                distractor_quality REAL,
-                answer_distribution TEXT,
-                semantic_fingerprint TEXT UNIQUE,
-                concepts TEXT,
-                created_at TIMESTAMP,
-                UNIQUE(semantic_fingerprint)
-            )
-            """
-        )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS source_usage (
-                source_url TEXT PRIMARY KEY,
-                last_used TIMESTAMP,
-                times_used INTEGER DEFAULT 0,
-                questions_generated INTEGER DEFAULT 0
-            )
-            """
-        )
-        conn.commit()
-        conn.close()
+    def close(self) -> None:
+        self.store.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self) -> "EnhancedHarvester":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        self.rate_limiter.acquire(host_of(url))
+        return self.session.get(url, **kwargs)
 
     def get_expanded_sources(self) -> Dict[str, List]:
         sources = {
@@ -223,27 +223,17 @@ class EnhancedHarvester:
         }
         return sources
 
+    @property
+    def semantic_index(self) -> SemanticIndex:
+        return self.dedupe.semantic_index
+
     def check_semantic_uniqueness(self, question: str, threshold: float = 0.85) -> bool:
-        if not self.existing_questions:
-            return True
-        if self.question_vectors is None and self.existing_questions:
-            self.question_vectors = self.vectorizer.fit_transform(self.existing_questions)
-        try:
-            new_vector = self.vectorizer.transform([question])
-            similarities = cosine_similarity(new_vector, self.question_vectors)
-            max_similarity = similarities.max()
-            if self.teach:
-                console.print(f"[blue][teach §B. Heuristics][/blue] TF‑IDF cosine max={max_similarity:.2f} < {threshold:.2f} → {'unique' if max_similarity < threshold else 'not unique'}")
-            return max_similarity < threshold
-        except Exception:
-            for existing in self.existing_questions[-100:]:
-                if fuzz.ratio(question, existing) > 85:
-                    if self.teach:
-                        console.print("[red]Fallback Levenshtein > 85 → not unique[/red]")
-                    return False
-            if self.teach:
-                console.print("[green]Fallback uniqueness passed[/green]")
+        if not len(self.semantic_index):
             return True
+        max_similarity = float(self.semantic_index.max_similarity([question])[0])
+        if self.teach:
+            console.print(f"[blue][teach §B. Heuristics][/blue] TF‑IDF cosine max={max_similarity:.2f} < {threshold:.2f} → {'unique' if max_similarity < threshold else 'not unique'}")
+        return max_similarity < threshold
 
     def generate_quality_distractors(self, correct_answer: str, concept: str, category: str, context: str) -> List[str]:
         distractors: List[str] = []
@@ -277,6 +267,7 @@ class EnhancedHarvester:
             for key in misconceptions[category]:
                 if key in concept.lower():
                     distractors.extend(misconceptions[category][key])
+        distractors.extend(self.distractor_pool.pick(category, None, concept, correct_answer, 3, self.rng))
         for pattern in patterns:
             try:
                 variant = pattern(correct_answer)
@@ -284,15 +275,8 @@ class EnhancedHarvester:
                     distractors.append(variant)
             except Exception:
                 pass
-        technical_terms = re.findall(r"\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b", context)
-        for term in technical_terms:
-            if term.lower() not in correct_answer.lower():
-                distractors.append(f"A {term}-based solution")
-        unique_distractors: List[str] = []
-        for d in distractors:
-            if d != correct_answer and d not in unique_distractors:
-                if fuzz.ratio(d, correct_answer) < 70:
-                    unique_distractors.append(d)
+        distractors.extend(term_candidates(context, correct_answer))
+        unique_distractors = distinct_from(correct_answer, distractors)
         generic_distractors = [
             "A legacy implementation that is deprecated",
             "An experimental feature not yet stable",
@@ -301,8 +285,8 @@ class EnhancedHarvester:
             "An enterprise-only feature",
             "A community-contributed module",
         ]
-        random.shuffle(unique_distractors)
-        random.shuffle(generic_distractors)
+        self.rng.shuffle(unique_distractors)
+        self.rng.shuffle(generic_distractors)
         final_distractors = unique_distractors[:3]
         if len(final_distractors) < 3:
             final_distractors.extend(generic_distractors[: 3 - len(final_distractors)])
@@ -315,28 +299,10 @@ class EnhancedHarvester:
         if max(position_counts) - min(position_counts) > 20:
             return position_counts.index(min(position_counts))
         weights = [1.0 / (count + 1) for count in position_counts]
-        return random.choices(positions, weights=weights)[0]
+        return self.rng.choices(positions, weights=weights)[0]
 
     def assess_distractor_quality(self, correct: str, distractors: List[str]) -> float:
-        quality_score = 1.0
-        lengths = [len(d) for d in distractors]
-        if min(lengths, default=1) > 0 and max(lengths) / max(1, min(lengths)) > 3:
-            quality_score -= 0.2
-        for distractor in distractors:
-            similarity = fuzz.ratio(correct, distractor)
-            if similarity > 80:
-                quality_score -= 0.3
-            elif similarity < 20:
-                quality_score -= 0.1
-        for i, d1 in enumerate(distractors):
-            for d2 in distractors[i + 1 :]:
-                if fuzz.ratio(d1, d2) > 85:
-                    quality_score -= 0.2
-        generic_terms = ["something", "anything", "nothing", "everything", "stuff"]
-        for distractor in distractors:
-            if any(term in distractor.lower() for term in generic_terms):
-                quality_score -= 0.2
-        return max(0.0, min(1.0, quality_score))
+        return distractor_quality(correct, distractors)
 
     def harvest_with_rotation(self, max_content: int = 100) -> List[Dict]:
         sources = self.get_expanded_sources()
@@ -384,7 +350,7 @@ class EnhancedHarvester:
 
     def harvest_documentation_enhanced(self, url: str, category: str) -> List[Dict]:
         try:
-            response = self.session.get(url, timeout=10)
+            response = self._get(url, timeout=10)
             soup = BeautifulSoup(response.content, "html.parser")
             content_sections: List[Dict] = []
             for selector in ["pre", "code", ".warning", ".note", ".important", "h2", "h3"]:
@@ -414,7 +380,7 @@ class EnhancedHarvester:
                 "filter": "!9Z(-wwYGT",
                 "pagesize": 10,
             }
-            response = requests.get(api_url, params=params)
+            response = self._get(api_url, params=params)
             data = response.json()
             content_sections: List[Dict] = []
             for item in data.get("items", []):
@@ -442,7 +408,7 @@ class EnhancedHarvester:
                     f"https://raw.githubusercontent.com/{owner}/{repo}/master/README.md",
                 ]
                 for readme_url in readme_urls:
-                    response = requests.get(readme_url)
+                    response = self._get(readme_url)
                     if response.status_code == 200:
                         content = response.text
                         code_blocks = re.findall(r"```[\s\S]*?```", content)
@@ -462,7 +428,7 @@ class EnhancedHarvester:
         concepts = self.extract_concepts(text)
         if not concepts:
             return None
-        concept = random.choice(concepts)
+        concept = self.rng.choice(concepts)
         question_templates = [
             f"What is the primary purpose of {concept}?",
             f"Which statement best describes {concept}?",
@@ -473,7 +439,7 @@ class EnhancedHarvester:
             f"When should you use {concept}?",
             f"What is the main advantage of {concept}?",
         ]
-        question_text = random.choice(question_templates)
+        question_text = self.rng.choice(question_templates)
         if not self.check_semantic_uniqueness(question_text):
             return None
         correct_answer = self.extract_answer_from_context(concept, text)
@@ -482,7 +448,7 @@ class EnhancedHarvester:
         distractors = self.generate_quality_distractors(correct_answer, concept, content.get("category", ""), text)
         options = [correct_answer] + distractors
         target_position = self.balance_answer_distribution(0)
-        random.shuffle(distractors)
+        self.rng.shuffle(distractors)
         final_options = distractors[:target_position] + [correct_answer] + distractors[target_position:]
         final_options = final_options[:4]
         while len(final_options) < 4:
@@ -498,7 +464,11 @@ class EnhancedHarvester:
         if self.teach:
             console.print(f"[green]Quality[/green] q={distractor_quality:.2f} [green]Conf[/green]={confidence:.2f} [green]Diff[/green]={difficulty}")
         semantic_fingerprint = hashlib.sha256(f"{question_text}{sorted(final_options)}".encode()).hexdigest()
+        if semantic_fingerprint in self.dedupe.fingerprints:
+            return None
+        self.dedupe.fingerprints.add(semantic_fingerprint)
         self.existing_questions.append(question_text)
+        self.semantic_index.add(question_text)
         return EnhancedQuestion(
             question=question_text,
             options=final_options,
@@ -514,38 +484,18 @@ class EnhancedHarvester:
             answer_distribution=f"ABCD"[correct_index],
             semantic_fingerprint=semantic_fingerprint,
             concepts=concepts[:5],
-            created_at=datetime.now().isoformat(),
+            created_at=timestamp(self.seed),
         )
 
     def extract_concepts(self, text: str) -> List[str]:
-        concepts: List[str] = []
-        patterns = [
-            r"\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b",
-            r"\b[A-Z]{2,}\b",
-            r"`([^`]+)`",
-            r"\*\*([^*]+)\*\*",
-            r"class\s+(\w+)",
-            r"function\s+(\w+)",
-            r"def\s+(\w+)",
-        ]
-        for pattern in patterns:
-            concepts.extend(re.findall(pattern, text))
-        cleaned: List[str] = []
-        stopwords = {"the", "and", "or", "but", "for", "with", "this", "that", "from", "will"}
-        for concept in concepts:
-            concept = concept.strip()
-            if len(concept) > 2 and concept.lower() not in stopwords and not concept.isdigit():
-                cleaned.append(concept)
-        return list(set(cleaned))[:20]
+        return extract_concepts(text)
 
     def extract_answer_from_context(self, concept: str, context: str) -> Optional[str]:
-        sentences = context.split(".")
         relevant: List[str] = []
-        for sentence in sentences:
-            if concept.lower() in sentence.lower():
-                cleaned = sentence.strip()
-                if 20 < len(cleaned) < 200:
-                    relevant.append(cleaned)
+        for sentence in document_index(context).sentences_with(concept, ignore_case=True):
+            cleaned = sentence.strip()
+            if 20 < len(cleaned) < 200:
+                relevant.append(cleaned)
         if relevant:
             return max(relevant, key=lambda x: len(x.split()))
         return f"A {concept} implementation in this context"
@@ -558,7 +508,7 @@ class EnhancedHarvester:
             "integrates well with other components in the system.",
             "offers a reliable and maintainable approach.",
         ]
-        return random.choice(explanations)
+        return self.rng.choice(explanations)
 
     def assess_difficulty(self, concept: str, context: str, distractor_quality: float) -> int:
         if len(concept) < 5:
@@ -594,7 +544,7 @@ class EnhancedHarvester:
                 questions: List[EnhancedQuestion] = []
                 console.print(f"\n[bold cyan]Generating questions from {len(content)} content pieces...[/bold cyan]")
                 for content_piece in content:
-                    for _ in range(random.randint(2, 3)):
+                    for _ in range(self.rng.randint(2, 3)):
                         question = self.generate_enhanced_question(content_piece)
                         if question:
                             questions.append(question)
@@ -615,41 +565,36 @@ class EnhancedHarvester:
             self.generate_report(total_questions)
 
     def save_questions(self, questions: List[EnhancedQuestion]) -> None:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        for q in questions:
-            try:
-                cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO enhanced_questions
-                    (question, options, correct_answer, explanation, category,
-                     subcategory, difficulty, confidence, source_url, source_type,
-                     distractor_quality, answer_distribution, semantic_fingerprint,
-                     concepts, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        q.question,
-                        json.dumps(q.options),
-                        q.correct_answer,
-                        q.explanation,
-                        q.category,
-                        q.subcategory,
-                        q.difficulty,
-                        q.confidence,
-                        q.source_url,
-                        q.source_type,
-                        q.distractor_quality,
-                        q.answer_distribution,
-                        q.semantic_fingerprint,
-                        json.dumps(q.concepts),
-                        q.created_at,
-                    ),
+        self.store.executemany(
+            """
+            INSERT OR IGNORE INTO enhanced_questions
+            (question, options, correct_answer, explanation, category,
+             subcategory, difficulty, confidence, source_url, source_type,
+             distractor_quality, answer_distribution, semantic_fingerprint,
+             concepts, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (
+                    q.question,
+                    json.dumps(q.options),
+                    q.correct_answer,
+                    q.explanation,
+                    q.category,
+                    q.subcategory,
+                    q.difficulty,
+                    q.confidence,
+                    q.source_url,
+                    q.source_type,
+                    q.distractor_quality,
+                    q.answer_distribution,
+                    q.semantic_fingerprint,
+                    json.dumps(q.concepts),
+                    q.created_at,
                 )
-            except sqlite3.IntegrityError:
-                pass
-        conn.commit()
-        conn.close()
+                for q in questions
+            ),
+        )
 
     def show_statistics(self, questions: List[EnhancedQuestion], total: int) -> None:
         table = Table(title="Harvest Statistics", show_header=True)
@@ -12,10 +12,14 @@ import hashlib
 import time
 import re
 import random
+import asyncio
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import Counter, defaultdict
 from pathlib import Path
 
 # Web scraping
@@ -24,9 +28,27 @@ from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import feedparser  # noqa: F401 (kept for future RSS sources)
 
+from ..fetch.engine import FetchEngine, host_of
+from ..fetch.aio import AsyncFetchEngine
+from ..fetch.cache import ResponseCache, install_cache
+from ..fetch.frontier import DEFAULT_MAX_DEPTH, RETRY_STATUSES, CrawlFrontier, SeenUrls
+from ..fetch.sitemap import SitemapState, changed_urls, sitemaps_from_robots
+from ..fetch.urls import canonicalize_url
+from ..fetch.ratelimit import HostRateLimiter
+from ..dedupe.simhash import simhash64, simhash64_batch, to_signed64
+from ..dedupe.store import DedupeStore
+from ..dedupe.fuzzy import FuzzyIndex
+from ..dedupe.minhash import DEFAULT_THRESHOLD, MinHasher, MinHashLSH, jaccard, shingles
+from ..distractors import DistractorPool, mean_pairwise_similarity
+from ..concepts import extract_concepts
+from ..migrations import HARVEST_MIGRATIONS
+from ..seeding import make_rng, timestamp
+from ..storage import HarvestStore
+from ..text_index import document_index
+
 # Data processing
+import numpy as np
 import pandas as pd
-from fuzzywuzzy import fuzz
 
 # Progress tracking
 from rich.console import Console
@@ -35,6 +57,8 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
 console = Console()
 
+STACKEXCHANGE_API = "https://api.stackexchange.com/2.3/questions"
+
 
 @dataclass
 class HarvestedContent:
@@ -49,6 +73,24 @@ class HarvestedContent:
     quality_score: float
 
 
+CONTENT_COLUMNS = "source_url, source_type, title, content, category, subcategory, tags, scraped_at, quality_score"
+
+
+def content_from_row(row: Tuple[Any, ...]) -> HarvestedContent:
+    """HarvestedContent from a harvested_content row selected as CONTENT_COLUMNS."""
+    return HarvestedContent(
+        source_url=row[0],
+        source_type=row[1],
+        title=row[2],
+        content=row[3],
+        category=row[4],
+        subcategory=row[5],
+        tags=json.loads(row[6]) if row[6] else [],
+        scraped_at=row[7],
+        quality_score=row[8],
+    )
+
+
 @dataclass
 class QuestionCandidate:
     question: str
@@ -63,98 +105,380 @@ class QuestionCandidate:
     fingerprint: str  # For uniqueness checking
 
 
+# -----------------
+# Page parsing (pure functions so they can run in a process pool)
+# -----------------
+_NOISE_TAGS = ["script", "style", "nav", "header", "footer", "aside", "form", "noscript"]
+_GENERIC_PATH_PARTS = {"docs", "doc", "documentation", "latest", "current", "stable", "en", "en-us", "3", "index.htm", "index.html"}
+_TAG_STOPWORDS = {
+    "the", "and", "for", "with", "this", "that", "from", "will", "your", "you", "are", "can",
+    "use", "using", "used", "not", "have", "has", "more", "into", "when", "which", "also", "about",
+    "what", "how", "each", "their", "there", "they", "these", "than", "then", "other", "all", "any",
+}
+
+
+def extract_documentation_content(soup: BeautifulSoup) -> str:
+    for tag in soup(_NOISE_TAGS):
+        tag.decompose()
+    root = soup.find("main") or soup.find("article") or soup.find(attrs={"role": "main"}) or soup.body or soup
+    lines = [ln.strip() for ln in root.get_text(separator="\n").splitlines()]
+    return "\n".join(ln for ln in lines if ln)
+
+
+def extract_subcategory(url: str) -> str:
+    parsed = urlparse(url)
+    parts = [p for p in parsed.path.split("/") if p and p.lower() not in _GENERIC_PATH_PARTS]
+    if not parts:
+        return parsed.netloc.lower()
+    return parts[-1].rsplit(".", 1)[0].lower()
+
+
+def extract_tags(content: str, max_tags: int = 10) -> List[str]:
+    words = re.findall(r"\b[a-zA-Z][a-zA-Z0-9+#-]{2,}\b", content.lower())
+    counts = Counter(w for w in words if w not in _TAG_STOPWORDS)
+    return [w for w, _ in counts.most_common(max_tags)]
+
+
+def assess_content_quality(content: str, concepts: Optional[List[str]] = None) -> float:
+    score = min(len(content) / 5000, 1.0) * 0.4
+    lines = content.splitlines()
+    if len(lines) >= 10:
+        score += 0.2
+    if "`" in content or re.search(r"^\s{4,}\S", content, re.MULTILINE):
+        score += 0.2
+    if concepts is None:
+        concepts = extract_key_concepts(content)
+    if len(concepts) >= 10:
+        score += 0.2
+    return round(min(score, 1.0), 3)
+
+
+def extract_key_concepts(text: str, max_concepts: int = 20) -> List[str]:
+    return extract_concepts(text, max_concepts)
+
+
+def extract_links(soup: BeautifulSoup) -> List[str]:
+    return [a["href"] for a in soup.find_all("a", href=True)]
+
+
+def parse_links(html: bytes) -> List[str]:
+    return extract_links(BeautifulSoup(html, "html.parser"))
+
+
+def parse_documentation_page(html: bytes, url: str, name: str) -> Tuple[Optional[HarvestedContent], List[str]]:
+    """Parse one documentation page into content plus its key concepts."""
+    item, concepts, _ = parse_crawled_page(html, url, name)
+    return item, concepts
+
+
+def parse_crawled_page(html: bytes, url: str, name: str) -> Tuple[Optional[HarvestedContent], List[str], List[str]]:
+    """Content, key concepts and raw links of a page; links are read before nav is
+    stripped, and short index pages still return theirs."""
+    soup = BeautifulSoup(html, "html.parser")
+    links = extract_links(soup)
+    title = soup.find("title")
+    title_text = title.text if title else name
+    content = extract_documentation_content(soup)
+    if not content or len(content) <= 500:
+        return None, [], links
+    concepts = extract_key_concepts(content)
+    item = HarvestedContent(
+        source_url=url,
+        source_type="documentation",
+        title=title_text,
+        content=content,
+        category=name.lower(),
+        subcategory=extract_subcategory(url),
+        tags=extract_tags(content),
+        scraped_at=datetime.now().isoformat(),
+        quality_score=assess_content_quality(content, concepts),
+    )
+    return item, concepts, links
+
+
+def parse_stackoverflow_items(items: List[Dict[str, Any]], tag: str) -> List[HarvestedContent]:
+    harvested: List[HarvestedContent] = []
+    for item in items:
+        content = BeautifulSoup(item.get("body", ""), "html.parser").get_text()
+        harvested.append(HarvestedContent(
+            source_url=item["link"],
+            source_type="stackoverflow",
+            title=item["title"],
+            content=content,
+            category="programming",
+            subcategory=tag,
+            tags=item.get("tags", []),
+            scraped_at=datetime.now().isoformat(),
+            quality_score=min(item.get("score", 0) / 100, 1.0),
+        ))
+    return harvested
+
+
+def parse_github_readme(text: str, repo_url: str, owner: str, repo: str) -> Tuple[HarvestedContent, List[str]]:
+    item = HarvestedContent(
+        source_url=repo_url,
+        source_type="github",
+        title=f"{owner}/{repo}",
+        content=text,
+        category="repository",
+        subcategory=repo,
+        tags=extract_tags(text),
+        scraped_at=datetime.now().isoformat(),
+        quality_score=0.8,
+    )
+    return item, extract_key_concepts(text)
+
+
+def _github_readme_urls(repo_url: str) -> Optional[Tuple[str, str, List[str]]]:
+    parts = repo_url.replace("https://github.com/", "").split("/")
+    if len(parts) < 2:
+        return None
+    owner, repo = parts[0], parts[1]
+    return owner, repo, [
+        f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md",
+        f"https://raw.githubusercontent.com/{owner}/{repo}/master/README.md",
+        f"https://raw.githubusercontent.com/{owner}/{repo}/main/readme.md",
+    ]
+
+
+def content_rng(seed: int, source_url: str) -> random.Random:
+    """RNG for one content item, derived from the run seed and its URL (stable across processes)."""
+    return random.Random(f"{seed}:{source_url}")
+
+
+class QuestionGenerator:
+    """Templated questions from content. CPU-only: holds the RNG and the distractor
+    pool but no DB, HTTP or dedupe state, so the harvester and the generation worker
+    processes run the same object."""
+
+    def __init__(self, distractor_pool: DistractorPool, rng: random.Random) -> None:
+        self.distractor_pool = distractor_pool
+        self.rng = rng
+
+    def generate_candidates(
+        self,
+        content: HarvestedContent,
+        questions_per_content: int,
+        seed: Optional[int] = None,
+        concepts: Optional[List[str]] = None,
+    ) -> Tuple[List[str], List[QuestionCandidate], List[int]]:
+        """CPU-only part of generation: concepts, templated candidates and their SimHashes (no shared state)."""
+        rng = content_rng(seed, content.source_url) if seed is not None else self.rng
+        if concepts is None:
+            concepts = extract_key_concepts(content.content)
+        candidates = [
+            q for q in (
+                self.generate_question_for_concept(concept, content.content, content.category, content.subcategory, rng)
+                for concept in concepts[:questions_per_content]
+            ) if q
+        ]
+        # Fingerprint the whole batch at once; dedupe stays in candidate order
+        return concepts, candidates, simhash64_batch([q.question for q in candidates]).tolist()
+
+    def generate_question_for_concept(self, concept: str, context: str, category: str, subcategory: str, rng: Optional[random.Random] = None) -> Optional[QuestionCandidate]:
+        rng = rng or self.rng
+        templates = {
+            "definition": [f"What is {concept}?", f"Which of the following best describes {concept}?", f"In {category}, what does {concept} refer to?"],
+            "purpose": [f"What is the primary purpose of {concept}?", f"Why would you use {concept} in {subcategory}?", f"What problem does {concept} solve?"],
+            "comparison": [f"How does {concept} differ from alternatives?", f"What is the main advantage of {concept}?", f"When should you use {concept}?"],
+            "implementation": [f"How is {concept} typically implemented?", f"What is required to use {concept}?", f"Which approach is best for {concept}?"],
+        }
+        q_type = rng.choice(list(templates.keys()))
+        question_text = rng.choice(templates[q_type])
+        correct_answer = self.extract_answer_from_context(concept, context, q_type)
+        if not correct_answer:
+            return None
+        distractors = self.generate_smart_distractors(concept, correct_answer, category, q_type, subcategory, rng)
+        if len(distractors) < 3:
+            return None
+        options = [correct_answer] + distractors[:3]
+        rng.shuffle(options)
+        correct_index = options.index(correct_answer)
+        explanation = self.generate_explanation(concept, correct_answer, context)
+        fingerprint = hashlib.md5(f"{question_text}{sorted(options)}".encode()).hexdigest()
+        return QuestionCandidate(
+            question=question_text,
+            options=options,
+            correct_answer=correct_index,
+            explanation=explanation,
+            source=subcategory,
+            category=category,
+            subcategory=subcategory,
+            difficulty=self.assess_difficulty(question_text, options),
+            confidence=0.8,
+            fingerprint=fingerprint,
+        )
+
+    def extract_answer_from_context(self, concept: str, context: str, q_type: str) -> Optional[str]:
+        doc = document_index(context)
+        relevant = doc.sentence_ids(concept)
+        if not relevant:
+            return None
+        best = doc.sentences[max(relevant, key=doc.word_count)][:150]
+        if q_type == "definition":
+            if not best.startswith(("A ", "An ", "The ")):
+                best = f"A {best.lower()}"
+        return best.strip()
+
+    def generate_smart_distractors(
+        self,
+        concept: str,
+        correct: str,
+        category: str,
+        q_type: str,
+        subcategory: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+    ) -> List[str]:
+        # Corpus-mined phrases first; the built-in lists fill whatever the pool cannot
+        pooled = self.distractor_pool.pick(category, subcategory, concept, correct, 3, rng or self.rng)
+        if q_type == "definition":
+            pooled = [d if d.startswith(("A ", "An ", "The ")) else f"A {d.lower()}" for d in pooled]
+        category_distractors = {
+            "aws": ["An EC2 instance type", "A Lambda function trigger", "An S3 storage class", "A VPC component"],
+            "kubernetes": ["A Pod controller", "A Service type", "A Volume plugin", "A Network policy"],
+            "docker": ["A container runtime", "An image layer", "A compose directive", "A registry feature"],
+            "python": ["A built-in function", "A standard library module", "A data structure", "A decorator pattern"],
+            "database": ["A query optimization", "An index type", "A transaction level", "A replication method"],
+        }
+        base_distractors = category_distractors.get(category, [
+            f"A different approach to {concept}", f"An alternative to {concept}", f"A component of {concept}", f"A prerequisite for {concept}",
+        ])
+        distractors: List[str] = []
+        target_len = len(correct)
+        for d in base_distractors:
+            if len(d) < target_len * 0.5:
+                d += " with additional configuration"
+            elif len(d) > target_len * 1.5:
+                d = d[: int(target_len * 1.2)] + "..."
+            distractors.append(d)
+        return (pooled + distractors)[:4]
+
+    def generate_explanation(self, concept: str, answer: str, context: str) -> str:
+        explanation = f"{concept} is correctly described as: {answer[:100]}"
+        doc = document_index(context)
+        probe = answer[:20]
+        for i in doc.sentence_ids(concept):
+            if probe in doc.sentences[i]:
+                return doc.sentences[i].strip()[:200]
+        return explanation
+
+    def assess_difficulty(self, question: str, options: List[str]) -> int:
+        complexity_score = 0
+        if len(question.split()) > 15:
+            complexity_score += 1
+        if any(word in question.lower() for word in ["explain", "compare", "analyze", "evaluate"]):
+            complexity_score += 1
+        avg_option_length = sum(len(opt) for opt in options) / len(options)
+        if avg_option_length > 50:
+            complexity_score += 1
+        if self.calculate_option_similarity(options) > 0.6:
+            complexity_score += 1
+        return min(complexity_score + 1, 5)
+
+    def calculate_option_similarity(self, options: List[str]) -> float:
+        return mean_pairwise_similarity(options)
+
+
+# Per-process generator used by the parallel generation pool
+_generation_worker: Optional[QuestionGenerator] = None
+
+
+def _init_generation_worker(distractor_pool: DistractorPool) -> None:
+    global _generation_worker
+    _generation_worker = QuestionGenerator(distractor_pool, make_rng(None))
+
+
+def _generate_candidates_job(job: Tuple[Any, ...]) -> Tuple[List[str], List[QuestionCandidate], List[int]]:
+    return _generation_worker.generate_candidates(*job)
+
+
 class MassiveHarvester:
     """Massive content harvester for quiz and learning content generation"""
 
-    def __init__(self, output_dir: str = "./harvest_output", teach: bool = False):
+    def __init__(
+        self,
+        output_dir: str = "./harvest_output",
+        teach: bool = False,
+        cache_dir: Optional[str] = None,
+        cache_max_mb: int = 512,
+        policy_path: Optional[str] = None,
+        seed: Optional[int] = None,
+        crawl_depth: int = DEFAULT_MAX_DEPTH,
+        crawl_max_pages: int = 100,
+        use_sitemaps: bool = True,
+    ):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        # Seeded runs are reproducible: per-content RNGs derive from the seed and timestamps are fixed
+        self.seed = seed
+        self.rng = make_rng(seed)
 
         # Database for tracking
         self.db_path = self.output_dir / "harvest.db"
-        self._init_database()
+        self.store = HarvestStore(self.db_path, migrations=HARVEST_MIGRATIONS)
 
         # Caches and stats
-        self.url_cache = set()
+        # Documentation crawl: link depth and page budget per site; fetched URLs persist (see seen_urls)
+        self.crawl_depth = crawl_depth
+        self.crawl_max_pages = crawl_max_pages
+        self._seen_urls: Optional[SeenUrls] = None
+        self._crawl_lock = threading.Lock()
+        # Sitemaps seed each crawl with pages that are new or whose lastmod moved
+        self.use_sitemaps = use_sitemaps
+        self._sitemap_roots: Dict[str, List[str]] = {}
+        # Per site being crawled: page lastmods are recorded once the page was fetched
+        self._sitemap_states: Dict[str, SitemapState] = {}
         self.content_cache: Dict[str, str] = {}
-        self.question_fingerprints = set()
+        # Concepts computed at parse time (possibly off-thread), keyed by source_url
+        self._concept_cache: Dict[str, List[str]] = {}
         self.stats = defaultdict(int)
+        self._stats_lock = threading.Lock()
         self.teach = teach
-        # SimHash dedupe (in-memory, per-run)
-        self._simhashes: List[int] = []
+        # Fingerprint and SimHash dedupe against every stored question (loaded on first use)
         self._simhash_threshold: int = 8
+        self.dedupe = DedupeStore(self.store, "generated_questions", "fingerprint", simhash_column="simhash", simhash_threshold=self._simhash_threshold)
         self._simhash_skipped: List[Dict[str, Any]] = []
+        # Levenshtein dedupe: stored questions per (category, subcategory), loaded once
+        self._fuzzy_index = FuzzyIndex(self._load_category_questions)
         self._leven_rejected: int = 0
+        # Page-level MinHash near-duplicates (signatures of stored pages, loaded on first use)
+        self._minhasher = MinHasher()
+        self._page_lsh: Optional[MinHashLSH] = None
+        self._duplicate_pages: int = 0
+        # Distractor phrases mined from stored content (see refresh_distractor_pool)
+        self.distractor_pool = DistractorPool()
+        self.generator = QuestionGenerator(self.distractor_pool, self.rng)
+        # Worker pool for parallel generation (created on first use, see generate_questions_from_content)
+        self._gen_executor: Optional[ProcessPoolExecutor] = None
+        self._gen_processes = 0
+        self._gen_pool_version = -1
 
         # HTTP session
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Scraper/0.1) Educational Content Collector",
         })
+        # Optional on-disk HTTP cache (conditional revalidation via ETag/Last-Modified)
+        self.cache: Optional[ResponseCache] = None
+        if cache_dir:
+            self.cache = install_cache(self.session, cache_dir, max_bytes=cache_max_mb * 1024 * 1024)
+        # Per-host token buckets from policy.yaml robots_tos.rate_limit
+        self.rate_limiter = HostRateLimiter.from_policy(policy_path)
 
-    # -----------------
-    # Database schema
-    # -----------------
-    def _init_database(self) -> None:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def close(self) -> None:
+        if self._gen_executor is not None:
+            self._gen_executor.shutdown(wait=True)
+            self._gen_executor = None
+        self.save_crawl_state()
+        self.store.close()
+        if self.cache is not None:
+            self.cache.close()
 
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS harvested_content (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_url TEXT UNIQUE,
-                source_type TEXT,
-                title TEXT,
-                content TEXT,
-                category TEXT,
-                subcategory TEXT,
-                tags TEXT,
-                scraped_at TIMESTAMP,
-                quality_score REAL,
-                processed BOOLEAN DEFAULT FALSE
-            )
-            """
-        )
+    def __enter__(self) -> "MassiveHarvester":
+        return self
 
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS generated_questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                fingerprint TEXT UNIQUE,
-                question TEXT,
-                options TEXT,
-                correct_answer INTEGER,
-                explanation TEXT,
-                category TEXT,
-                subcategory TEXT,
-                difficulty INTEGER,
-                confidence REAL,
-                source TEXT,
-                created_at TIMESTAMP,
-                validated BOOLEAN DEFAULT FALSE,
-                deployed BOOLEAN DEFAULT FALSE
-            )
-            """
-        )
-
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS harvest_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TIMESTAMP,
-                urls_scraped INTEGER,
-                content_harvested INTEGER,
-                questions_generated INTEGER,
-                unique_questions INTEGER,
-                categories_covered INTEGER,
-                quality_avg REAL
-            )
-            """
-        )
-
-        conn.commit()
-        conn.close()
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
     # -----------------
     # Source discovery
@@ -272,290 +596,649 @@ class MassiveHarvester:
     # -----------------
     # Harvesters
     # -----------------
-    def harvest_all_sources(self, max_workers: int = 10, limit_per_source: Optional[int] = None) -> List[HarvestedContent]:
+    def harvest_all_sources(self, max_workers: int = 10, limit_per_source: Optional[int] = None, per_host: int = 1) -> List[HarvestedContent]:
         console.print("[bold green]Starting Massive Harvest Operation[/bold green]")
         sources = self.get_massive_source_list()
         all_content: List[HarvestedContent] = []
+        engine = FetchEngine(max_workers=max_workers, per_host=per_host)
 
         with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), console=console) as progress:
-            doc_task = progress.add_task("[cyan]Harvesting Documentation...", total=len(sources["documentation"]))
-            for doc_source in sources["documentation"]:
-                content = self.harvest_documentation_site(doc_source, limit_per_source)
-                all_content.extend(content)
-                progress.advance(doc_task)
-                self.stats["documentation_sources"] += 1
+            doc_sources = sources["documentation"]
+            so_tags = sources["stackoverflow_tags"][:20]
+            gh_repos = sources["github_awesome_lists"]
+            doc_task = progress.add_task("[cyan]Harvesting Documentation...", total=len(doc_sources))
+            so_task = progress.add_task("[yellow]Harvesting Stack Overflow...", total=len(so_tags))
+            gh_task = progress.add_task("[magenta]Harvesting GitHub...", total=len(gh_repos))
 
-            so_task = progress.add_task("[yellow]Harvesting Stack Overflow...", total=len(sources["stackoverflow_tags"]))
-            for tag in sources["stackoverflow_tags"][:20]:
-                content = self.harvest_stackoverflow(tag, limit=limit_per_source or 50)
-                all_content.extend(content)
-                progress.advance(so_task)
-                self.stats["stackoverflow_tags"] += 1
+            jobs = []
+            for doc_source in doc_sources:
+                jobs.append((host_of(doc_source["urls"][0]), lambda d=doc_source: ("documentation", self.harvest_documentation_site(d, limit_per_source))))
+            for tag in so_tags:
+                jobs.append(("api.stackexchange.com", lambda t=tag: ("stackoverflow", self.harvest_stackoverflow(t, limit=limit_per_source or 50))))
+            for repo_url in gh_repos:
+                jobs.append(("raw.githubusercontent.com", lambda r=repo_url: ("github", self.harvest_github_repo(r))))
+
+            tasks = {"documentation": doc_task, "stackoverflow": so_task, "github": gh_task}
+            stat_keys = {"documentation": "documentation_sources", "stackoverflow": "stackoverflow_tags", "github": "github_repos"}
 
-            gh_task = progress.add_task("[magenta]Harvesting GitHub...", total=len(sources["github_awesome_lists"]))
-            for repo_url in sources["github_awesome_lists"]:
-                content = self.harvest_github_repo(repo_url)
-                if content:
+            def _done(_idx: int, result: Any) -> None:
+                kind, _ = result
+                progress.advance(tasks[kind])
+                self._bump_stat(stat_keys[kind])
+
+            # Results come back in job order (docs, then SO, then GitHub) like the serial loop
+            for _kind, content in engine.run(jobs, on_done=_done):
+                if isinstance(content, list):
+                    all_content.extend(content)
+                elif content:
                     all_content.append(content)
-                progress.advance(gh_task)
-                self.stats["github_repos"] += 1
 
         self.save_harvested_content(all_content)
+        self.save_crawl_state()
         console.print(f"[bold green]✓ Harvested {len(all_content)} pieces of content[/bold green]")
         return all_content
 
+    def _bump_stat(self, key: str, n: int = 1) -> None:
+        # Harvest jobs run on worker threads; keep counters consistent
+        with self._stats_lock:
+            self.stats[key] += n
+
     def harvest_documentation_site(self, doc_source: Dict, limit: Optional[int] = None) -> List[HarvestedContent]:
+        """Crawl one site from its landing URLs and changed sitemap pages: up to `limit`
+        (else crawl_max_pages) pages, following in-scope links up to the site's
+        max_depth (else crawl_depth)."""
         harvested: List[HarvestedContent] = []
         name = doc_source["name"]
+        frontier = self._site_frontier(doc_source)
 
-        for url in doc_source["urls"][:limit] if limit else doc_source["urls"]:
+        for url, depth in self._crawl(frontier, limit):
             try:
                 console.print(f"  Scraping {name}: {url}")
-                response = self.session.get(url, timeout=10)
-                soup = BeautifulSoup(response.content, "html.parser")
-                content = self.extract_documentation_content(soup)
-                if content and len(content) > 500:
-                    harvested_item = HarvestedContent(
-                        source_url=url,
-                        source_type="documentation",
-                        title=soup.find("title").text if soup.find("title") else name,
-                        content=content,
-                        category=name.lower(),
-                        subcategory=self.extract_subcategory(url),
-                        tags=self.extract_tags(content),
-                        scraped_at=datetime.now().isoformat(),
-                        quality_score=self.assess_content_quality(content),
-                    )
+                response = self._get(url, timeout=10)
+                if not self._crawl_fetched(name, frontier, url, response.status_code):
+                    continue
+                # 304 revalidation: reuse the stored row instead of re-parsing (links are still read)
+                harvested_item = self._stored_content(url) if getattr(response, "from_cache", False) else None
+                if harvested_item is None:
+                    harvested_item, concepts, links = parse_crawled_page(response.content, url, name)
+                    if harvested_item:
+                        self._concept_cache[url] = concepts
+                else:
+                    links = parse_links(response.content)
+                    self._bump_stat("pages_revalidated")
+                self._follow_links(frontier, links, depth, getattr(response, "url", None) or url)
+                if harvested_item:
                     harvested.append(harvested_item)
-                    self.stats["pages_scraped"] += 1
-                time.sleep(0.5)
+                    self._bump_stat("pages_scraped")
             except Exception as e:  # pragma: no cover
                 console.print(f"[red]Error harvesting {url}: {e}[/red]")
+                self._crawl_failed(frontier, url)
                 continue
+        self._save_frontier(name, frontier)
         return harvested
 
+    @property
+    def seen_urls(self) -> SeenUrls:
+        """Canonical URLs fetched by any run (Bloom filter, loaded on first use)."""
+        with self._crawl_lock:
+            if self._seen_urls is None:
+                self._seen_urls = SeenUrls.from_store(self.store)
+            return self._seen_urls
+
+    def save_crawl_state(self) -> None:
+        if self._seen_urls is not None and self._seen_urls.dirty:
+            self._seen_urls.save(self.store)
+
+    def _site_frontier(self, doc_source: Dict) -> CrawlFrontier:
+        # Landing URLs (always, so the cache revalidates them and new links are found),
+        # changed sitemap pages, then links left over from the previous run; other
+        # fetched pages are skipped unless their sitemap lastmod moved
+        name = doc_source["name"]
+        frontier = CrawlFrontier(doc_source["urls"], doc_source.get("max_depth", self.crawl_depth), self.seen_urls)
+        for url in doc_source["urls"]:
+            frontier.push(url, 0, refetch=True)
+        if self.use_sitemaps:
+            state = self._sitemap_states[name] = SitemapState(self.store, name)
+            roots = doc_source.get("sitemaps") or [url for origin in self._origins(doc_source["urls"]) for url in self._robots_sitemaps(origin)]
+            for url, updated in changed_urls(self._open_stream, roots, state, accept=lambda u: frontier.in_scope(canonicalize_url(u))):
+                self._bump_stat("sitemap_updated" if updated else "sitemap_new")
+                if not frontier.push(url, 0, refetch=updated) and not updated and canonicalize_url(url) in frontier.seen:
+                    # Fetched before its sitemap entry was tracked (link crawl, --no-sitemaps, older
+                    # database): take the reported lastmod as the baseline so a later move refetches it
+                    state.fetched(url)
+        rows = self.store.query("SELECT url, depth, refetch, attempts FROM crawl_frontier WHERE site = ? ORDER BY rowid", (name,))
+        for url, depth, refetch, attempts in rows:
+            frontier.push(url, depth, refetch=bool(refetch), attempts=attempts)
+        return frontier
+
+    def _origins(self, urls: List[str]) -> List[str]:
+        return list(dict.fromkeys(f"{p.scheme}://{p.netloc}" for p in map(urlparse, urls)))
+
+    def _robots_sitemaps(self, origin: str) -> List[str]:
+        """Sitemap URLs from the origin's robots.txt (else /sitemap.xml), looked up once per run."""
+        with self._crawl_lock:
+            if origin in self._sitemap_roots:
+                return self._sitemap_roots[origin]
+        try:
+            response = self._get(f"{origin}/robots.txt", timeout=10)
+            found = sitemaps_from_robots(response.text, origin) if response.status_code == 200 else []
+        except requests.RequestException:
+            found = []
+        with self._crawl_lock:
+            return self._sitemap_roots.setdefault(origin, found or [f"{origin}/sitemap.xml"])
+
+    @contextmanager
+    def _open_stream(self, url: str) -> Iterator[Any]:
+        # stream=True bypasses the response cache, so large sitemaps are parsed as they download
+        with self._get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # Let io.BufferedReader (see open_sitemap) see EOF instead of a closed file
+            response.raw.auto_close = False
+            yield response.raw
+
+    def _crawl(self, frontier: CrawlFrontier, limit: Optional[int]) -> Iterator[Tuple[str, int]]:
+        for _ in range(limit or self.crawl_max_pages):
+            item = frontier.pop()
+            if item is None:
+                return
+            yield item
+
+    def _crawl_fetched(self, site: str, frontier: CrawlFrontier, url: str, status_code: int) -> bool:
+        """Mark a 2xx page fetched (and record its sitemap lastmod). Other responses are
+        not parsed: 5xx/408/425/429 stay queued for a retry, other 4xx are dropped for good."""
+        if status_code >= 500 or status_code in RETRY_STATUSES:
+            console.print(f"[yellow]  Skipping {url}: HTTP {status_code}[/yellow]")
+            self._crawl_failed(frontier, url)
+            return False
+        if not 200 <= status_code < 300:
+            console.print(f"[yellow]  Dropping {url}: HTTP {status_code}[/yellow]")
+            self._bump_stat("pages_dropped")
+            frontier.done(url)
+            return False
+        frontier.done(url)
+        state = self._sitemap_states.get(site)
+        if state is not None:
+            state.fetched(url)
+        return True
+
+    def _crawl_failed(self, frontier: CrawlFrontier, url: str) -> None:
+        # Requeued for the next run unless it is out of attempts (or was already done)
+        frontier.failed(url)
+        self._bump_stat("pages_failed")
+
+    def _follow_links(self, frontier: CrawlFrontier, links: List[str], depth: int, base: str) -> None:
+        if depth < frontier.max_depth:
+            self._bump_stat("links_queued", frontier.extend(links, depth + 1, base))
+
+    def _save_frontier(self, site: str, frontier: CrawlFrontier) -> None:
+        self._sitemap_states.pop(site, None)
+        with self.store.transaction() as conn:
+            conn.execute("DELETE FROM crawl_frontier WHERE site = ?", (site,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO crawl_frontier (site, url, depth, refetch, attempts) VALUES (?, ?, ?, ?, ?)",
+                [(site, url, depth, int(refetch), attempts) for url, depth, refetch, attempts in frontier.pending()],
+            )
+
     def harvest_stackoverflow(self, tag: str, limit: int = 50) -> List[HarvestedContent]:
         harvested: List[HarvestedContent] = []
         try:
-            api_url = "https://api.stackexchange.com/2.3/questions"
-            params = {"order": "desc", "sort": "votes", "tagged": tag, "site": "stackoverflow", "filter": "withbody", "pagesize": min(limit, 100)}
-            response = requests.get(api_url, params=params)
-            data = response.json()
-            for item in data.get("items", []):
-                content = BeautifulSoup(item.get("body", ""), "html.parser").get_text()
-                harvested_item = HarvestedContent(
-                    source_url=item["link"],
-                    source_type="stackoverflow",
-                    title=item["title"],
-                    content=content,
-                    category="programming",
-                    subcategory=tag,
-                    tags=item.get("tags", []),
-                    scraped_at=datetime.now().isoformat(),
-                    quality_score=min(item.get("score", 0) / 100, 1.0),
-                )
-                harvested.append(harvested_item)
+            response = self._get(STACKEXCHANGE_API, params=self._stackoverflow_params(tag, limit))
+            harvested = parse_stackoverflow_items(response.json().get("items", []), tag)
         except Exception as e:  # pragma: no cover
             console.print(f"[red]Error harvesting Stack Overflow {tag}: {e}[/red]")
         return harvested
 
+    def _get(self, url: str, **kwargs: Any) -> requests.Response:
+        # Every request waits for its host's token bucket
+        self.rate_limiter.acquire(host_of(url))
+        return self.session.get(url, **kwargs)
+
+    def _stackoverflow_params(self, tag: str, limit: int) -> Dict[str, Any]:
+        return {"order": "desc", "sort": "votes", "tagged": tag, "site": "stackoverflow", "filter": "withbody", "pagesize": min(limit, 100)}
+
     def harvest_github_repo(self, repo_url: str) -> Optional[HarvestedContent]:
         try:
-            parts = repo_url.replace("https://github.com/", "").split("/")
-            if len(parts) >= 2:
-                owner, repo = parts[0], parts[1]
-                readme_urls = [
-                    f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md",
-                    f"https://raw.githubusercontent.com/{owner}/{repo}/master/README.md",
-                    f"https://raw.githubusercontent.com/{owner}/{repo}/main/readme.md",
-                ]
+            target = _github_readme_urls(repo_url)
+            if target:
+                owner, repo, readme_urls = target
                 for readme_url in readme_urls:
-                    response = requests.get(readme_url)
+                    response = self._get(readme_url)
                     if response.status_code == 200:
-                        return HarvestedContent(
-                            source_url=repo_url,
-                            source_type="github",
-                            title=f"{owner}/{repo}",
-                            content=response.text,
-                            category="repository",
-                            subcategory=repo,
-                            tags=self.extract_tags(response.text),
-                            scraped_at=datetime.now().isoformat(),
-                            quality_score=0.8,
-                        )
+                        stored = self._stored_content(repo_url) if getattr(response, "from_cache", False) else None
+                        if stored:
+                            return stored
+                        item, concepts = parse_github_readme(response.text, repo_url, owner, repo)
+                        self._concept_cache[repo_url] = concepts
+                        return item
         except Exception as e:  # pragma: no cover
             console.print(f"[red]Error harvesting GitHub {repo_url}: {e}[/red]")
         return None
 
+    # -----------------
+    # Async harvest (event loop for I/O, process pool for parsing)
+    # -----------------
+    def harvest_all_sources_async(self, max_in_flight: int = 1000, limit_per_source: Optional[int] = None, per_host: int = 1, cpu_workers: Optional[int] = None) -> List[HarvestedContent]:
+        console.print("[bold green]Starting Massive Harvest Operation (async)[/bold green]")
+        sources = self.get_massive_source_list()
+        doc_sources = sources["documentation"]
+        so_tags = sources["stackoverflow_tags"][:20]
+        gh_repos = sources["github_awesome_lists"]
+        engine = AsyncFetchEngine(
+            max_in_flight=max_in_flight,
+            per_host=per_host,
+            headers=dict(self.session.headers),
+            cpu_workers=cpu_workers,
+            cache=self.cache,
+            rate_limiter=self.rate_limiter,
+        )
+
+        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), console=console) as progress:
+            doc_task = progress.add_task("[cyan]Harvesting Documentation...", total=len(doc_sources))
+            so_task = progress.add_task("[yellow]Harvesting Stack Overflow...", total=len(so_tags))
+            gh_task = progress.add_task("[magenta]Harvesting GitHub...", total=len(gh_repos))
+
+            async def _tracked(coro, task, stat_key):
+                result = await coro
+                progress.advance(task)
+                self._bump_stat(stat_key)
+                return result
+
+            async def _main(eng: AsyncFetchEngine) -> List[Any]:
+                coros = [_tracked(self._harvest_documentation_site_async(eng, d, limit_per_source), doc_task, "documentation_sources") for d in doc_sources]
+                coros += [_tracked(self._harvest_stackoverflow_async(eng, t, limit_per_source or 50), so_task, "stackoverflow_tags") for t in so_tags]
+                coros += [_tracked(self._harvest_github_repo_async(eng, r), gh_task, "github_repos") for r in gh_repos]
+                return await asyncio.gather(*coros)
+
+            results = engine.run(_main)
+
+        all_content: List[HarvestedContent] = []
+        for content in results:
+            if isinstance(content, list):
+                all_content.extend(content)
+            elif content:
+                all_content.append(content)
+        self.save_harvested_content(all_content)
+        self.save_crawl_state()
+        console.print(f"[bold green]✓ Harvested {len(all_content)} pieces of content[/bold green]")
+        return all_content
+
+    async def _harvest_documentation_site_async(self, engine: AsyncFetchEngine, doc_source: Dict, limit: Optional[int] = None) -> List[HarvestedContent]:
+        harvested: List[HarvestedContent] = []
+        name = doc_source["name"]
+        # Robots/sitemap reads are blocking (streamed through requests); keep them off the loop
+        frontier = await asyncio.to_thread(self._site_frontier, doc_source)
+        for url, depth in self._crawl(frontier, limit):
+            try:
+                console.print(f"  Scraping {name}: {url}")
+                response = await engine.get(url)
+                if not self._crawl_fetched(name, frontier, url, response.status_code):
+                    continue
+                harvested_item = self._stored_content(url) if response.from_cache else None
+                if harvested_item is None:
+                    harvested_item, concepts, links = await engine.offload(parse_crawled_page, response.content, url, name)
+                    if harvested_item:
+                        self._concept_cache[url] = concepts
+                else:
+                    links = await engine.offload(parse_links, response.content)
+                    self._bump_stat("pages_revalidated")
+                self._follow_links(frontier, links, depth, response.url or url)
+                if harvested_item:
+                    harvested.append(harvested_item)
+                    self._bump_stat("pages_scraped")
+            except Exception as e:  # pragma: no cover
+                console.print(f"[red]Error harvesting {url}: {e}[/red]")
+                self._crawl_failed(frontier, url)
+        self._save_frontier(name, frontier)
+        return harvested
+
+    async def _harvest_stackoverflow_async(self, engine: AsyncFetchEngine, tag: str, limit: int = 50) -> List[HarvestedContent]:
+        try:
+            response = await engine.get(STACKEXCHANGE_API, params=self._stackoverflow_params(tag, limit))
+            return await engine.offload(parse_stackoverflow_items, response.json().get("items", []), tag)
+        except Exception as e:  # pragma: no cover
+            console.print(f"[red]Error harvesting Stack Overflow {tag}: {e}[/red]")
+            return []
+
+    async def _harvest_github_repo_async(self, engine: AsyncFetchEngine, repo_url: str) -> Optional[HarvestedContent]:
+        try:
+            target = _github_readme_urls(repo_url)
+            if target:
+                owner, repo, readme_urls = target
+                for readme_url in readme_urls:
+                    response = await engine.get(readme_url)
+                    if response.status_code == 200:
+                        stored = self._stored_content(repo_url) if response.from_cache else None
+                        if stored:
+                            return stored
+                        item, concepts = await engine.offload(parse_github_readme, response.text, repo_url, owner, repo)
+                        self._concept_cache[repo_url] = concepts
+                        return item
+        except Exception as e:  # pragma: no cover
+            console.print(f"[red]Error harvesting GitHub {repo_url}: {e}[/red]")
+        return None
+
+    def _stored_content(self, source_url: str) -> Optional[HarvestedContent]:
+        """Previously harvested row for a URL (used when the cache answered with a 304)."""
+        row = self.store.query_one(
+            f"SELECT {CONTENT_COLUMNS} FROM harvested_content WHERE source_url = ?",
+            (source_url,),
+        )
+        return content_from_row(row) if row else None
+
+    def iter_stored_content(
+        self,
+        category: Optional[str] = None,
+        min_quality: float = 0.0,
+        include_processed: bool = False,
+        batch_size: int = 200,
+    ) -> Iterator[List[HarvestedContent]]:
+        """Stream harvested_content in id order, batch_size rows at a time (keyset pagination)."""
+        where = ["id > ?", "quality_score >= ?", "id NOT IN (SELECT content_id FROM content_duplicates)"]
+        params: List[Any] = [min_quality]
+        if category:
+            where.append("category = ?")
+            params.append(category)
+        if not include_processed:
+            where.append("processed = 0")
+        sql = f"SELECT id, {CONTENT_COLUMNS} FROM harvested_content WHERE {' AND '.join(where)} ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            rows = self.store.query(sql, (last_id, *params, batch_size))
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [content_from_row(row[1:]) for row in rows]
+
+    def mark_processed(self, content_list: Iterable[HarvestedContent]) -> int:
+        return self.store.executemany(
+            "UPDATE harvested_content SET processed = 1 WHERE source_url = ?",
+            ((content.source_url,) for content in content_list),
+        )
+
+    def generate_and_save(
+        self,
+        content_list: List[HarvestedContent],
+        questions_per_content: int = 5,
+        processes: int = 1,
+        seed: Optional[int] = None,
+        dedupe_pages: bool = True,
+    ) -> List[QuestionCandidate]:
+        """Drop near-duplicate pages, generate, persist the accepted questions and flag the content as processed.
+
+        dedupe_pages=False skips the page check for content that is already known to be
+        free of duplicates (regenerate_from_store dedupes once and streams only kept pages).
+        """
+        if dedupe_pages:
+            content_list = self.drop_duplicate_pages(content_list)
+        questions = self.generate_questions_from_content(content_list, questions_per_content, processes=processes, seed=seed)
+        self.save_questions(questions)
+        self.mark_processed(content_list)
+        return questions
+
+    def regenerate_from_store(
+        self,
+        questions_per_content: int = 5,
+        category: Optional[str] = None,
+        min_quality: float = 0.0,
+        reprocess: bool = False,
+        batch_size: int = 200,
+        processes: int = 1,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Offline generation over stored harvested_content; no network access."""
+        start_time = time.time()
+        contents = questions = 0
+        self.dedupe_stored_pages()
+        for batch in self.iter_stored_content(category, min_quality, include_processed=reprocess, batch_size=batch_size):
+            contents += len(batch)
+            questions += len(self.generate_and_save(batch, questions_per_content, processes=processes, seed=seed, dedupe_pages=False))
+        return {
+            "content_processed": contents,
+            "questions_generated": questions,
+            "dedupe_skipped": len(self._simhash_skipped),
+            "leven_rejected": self._leven_rejected,
+            "duplicate_pages": self._duplicate_pages,
+            "database": str(self.db_path),
+            "elapsed_time": time.time() - start_time,
+        }
+
+    # -----------------
+    # Page-level near-duplicates (MinHash/LSH)
+    # -----------------
+    def _page_index(self) -> MinHashLSH:
+        if self._page_lsh is None:
+            self._page_lsh = MinHashLSH()
+            for content_id, signature in self.store.query("SELECT content_id, signature FROM content_minhash ORDER BY content_id"):
+                self._page_lsh.add(content_id, np.frombuffer(signature, dtype=np.uint64))
+        return self._page_lsh
+
+    def dedupe_stored_pages(self, threshold: float = DEFAULT_THRESHOLD, batch_size: int = 500) -> int:
+        """Sign stored pages not seen before and record near-duplicates; returns duplicates found.
+
+        Within a batch the highest-quality page of a group is kept. A page matching one
+        signed earlier (possibly in an earlier run, so already used) is always the duplicate.
+        """
+        index = self._page_index()
+        found = 0
+        last_id = 0
+        while True:
+            rows = self.store.query(
+                """
+                SELECT id, content, quality_score FROM harvested_content
+                WHERE id > ?
+                  AND id NOT IN (SELECT content_id FROM content_minhash)
+                  AND id NOT IN (SELECT content_id FROM content_duplicates)
+                ORDER BY id LIMIT ?
+                """,
+                (last_id, batch_size),
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            page_shingles: Dict[int, np.ndarray] = {}
+            signed: List[Tuple[int, bytes]] = []
+            duplicates: List[Tuple[int, int, float, str]] = []
+            for content_id, text, _quality in sorted(rows, key=lambda r: (-(r[2] or 0.0), r[0])):
+                page = shingles(text or "")
+                signature = self._minhasher.signature(page)
+                best: Optional[Tuple[int, float]] = None
+                for other in sorted(index.candidates(signature)):
+                    if other not in page_shingles:
+                        row = self.store.query_one("SELECT content FROM harvested_content WHERE id = ?", (other,))
+                        page_shingles[other] = shingles(row[0] or "") if row else np.zeros(0, dtype=np.uint64)
+                    similarity = jaccard(page, page_shingles[other])
+                    if similarity >= threshold and (best is None or similarity > best[1]):
+                        best = (other, similarity)
+                if best is not None:
+                    duplicates.append((content_id, best[0], round(best[1], 4), timestamp(self.seed)))
+                    if self.teach:
+                        console.print(f"[red][teach §F. MinHash][/red] page {content_id} ≈ page {best[0]} (Jaccard {best[1]:.2f}) → skip")
+                    continue
+                index.add(content_id, signature)
+                page_shingles[content_id] = page
+                signed.append((content_id, signature.tobytes()))
+            with self.store.transaction() as conn:
+                conn.executemany("INSERT OR REPLACE INTO content_minhash (content_id, signature) VALUES (?, ?)", signed)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO content_duplicates (content_id, canonical_id, similarity, detected_at) VALUES (?, ?, ?, ?)",
+                    duplicates,
+                )
+            found += len(duplicates)
+        self._duplicate_pages += found
+        return found
+
+    def drop_duplicate_pages(self, content_list: List[HarvestedContent]) -> List[HarvestedContent]:
+        """content_list without the pages recorded as near-duplicates (runs dedupe_stored_pages first)."""
+        self.dedupe_stored_pages()
+        urls = [content.source_url for content in content_list]
+        duplicate_urls: set = set()
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            duplicate_urls.update(
+                row[0]
+                for row in self.store.query(
+                    "SELECT h.source_url FROM harvested_content h JOIN content_duplicates d ON d.content_id = h.id "
+                    f"WHERE h.source_url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        return [content for content in content_list if content.source_url not in duplicate_urls]
+
+    # Parsing helpers (delegate to the module-level functions used by the process pool)
+    def extract_documentation_content(self, soup: BeautifulSoup) -> str:
+        return extract_documentation_content(soup)
+
+    def extract_subcategory(self, url: str) -> str:
+        return extract_subcategory(url)
+
+    def extract_tags(self, content: str) -> List[str]:
+        return extract_tags(content)
+
+    def assess_content_quality(self, content: str) -> float:
+        return assess_content_quality(content)
+
     # -----------------
     # Question generation
     # -----------------
-    def generate_questions_from_content(self, content_list: List[HarvestedContent], questions_per_content: int = 5) -> List[QuestionCandidate]:
+    def generate_questions_from_content(
+        self,
+        content_list: List[HarvestedContent],
+        questions_per_content: int = 5,
+        processes: int = 1,
+        seed: Optional[int] = None,
+    ) -> List[QuestionCandidate]:
+        """Generate candidates per content (optionally across worker processes), then dedupe them in content order.
+
+        With a seed (default: the harvester's), every content item gets its own RNG derived
+        from (seed, source_url), so the result does not depend on the number of processes.
+        """
         all_questions: List[QuestionCandidate] = []
         console.print("[bold cyan]Generating Questions from Content...[/bold cyan]")
-        for content in content_list:
-            concepts = self.extract_key_concepts(content.content)
+        if seed is None:
+            seed = self.seed
+        if processes > 1 and seed is None:
+            seed = self.rng.randrange(2**32)
+        self.refresh_distractor_pool()
+        jobs = [(content, questions_per_content, seed, self._concept_cache.pop(content.source_url, None)) for content in content_list]
+        if processes > 1 and len(jobs) > 1:
+            executor = self._generation_executor(processes)
+            chunksize = max(1, len(jobs) // (processes * 4))
+            results = executor.map(_generate_candidates_job, jobs, chunksize=chunksize)
+        else:
+            results = (self._generate_candidates(*job) for job in jobs)
+        # Merge phase: dedupe runs here, serially and in content order
+        for concepts, candidates, simhashes in results:
             if self.teach and concepts:
                 console.print(f"[yellow]Concepts extracted (top){' '}: {concepts[:min(5,len(concepts))]}[/yellow]")
-            for concept in concepts[:questions_per_content]:
-                question = self.generate_question_for_concept(concept, content.content, content.category, content.subcategory)
-                if not question:
-                    continue
-                # Levenshtein-based uniqueness
-                if not self.is_unique_question(question):
-                    if self.teach:
-                        console.print(f"[red][teach §E. Validate][/red] Rejected (Levenshtein similarity > 0.85): {question.question}")
-                    self._leven_rejected += 1
-                    continue
-                # SimHash near-duplicate check
-                simh = self._simhash64(question.question)
-                nearest = min((self._hamming(simh, h) for h in self._simhashes), default=64)
-                if nearest < self._simhash_threshold:
-                    if self.teach:
-                        console.print(f"[red][teach §F. SimHash][/red] Using SimHash dedupe distance={nearest} < {self._simhash_threshold} → skip")
-                    self._simhash_skipped.append({"question": question.question[:120], "distance": nearest})
-                    continue
-                self._simhashes.append(simh)
-                if self.teach:
-                    console.print(f"[green]Accepted[/green] diff={question.difficulty} src={question.source} fp={question.fingerprint[:8]}…")
-                all_questions.append(question)
-                self.stats["questions_generated"] += 1
+            all_questions.extend(self._accept_candidates(candidates, simhashes))
         return all_questions
 
+    def _generation_executor(self, processes: int) -> ProcessPoolExecutor:
+        # Workers get a snapshot of the distractor pool, so a grown pool means fresh workers
+        pool_version = self.distractor_pool.version
+        if self._gen_executor is None or self._gen_processes != processes or self._gen_pool_version != pool_version:
+            if self._gen_executor is not None:
+                self._gen_executor.shutdown(wait=True)
+            self._gen_executor = ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_generation_worker, initargs=(self.distractor_pool,)
+            )
+            self._gen_processes = processes
+            self._gen_pool_version = pool_version
+        return self._gen_executor
+
+    def refresh_distractor_pool(self) -> int:
+        """Mine distractor phrases from content stored since the last refresh; returns phrases added."""
+        added = self.distractor_pool.refresh(self.store)
+        if self.teach and added:
+            console.print(f"[yellow][teach] Distractor pool: +{added} phrases ({len(self.distractor_pool)} total)[/yellow]")
+        return added
+
+    def _generate_candidates(
+        self,
+        content: HarvestedContent,
+        questions_per_content: int,
+        seed: Optional[int] = None,
+        concepts: Optional[List[str]] = None,
+    ) -> Tuple[List[str], List[QuestionCandidate], List[int]]:
+        return self.generator.generate_candidates(content, questions_per_content, seed, concepts)
+
+    def _accept_candidates(self, candidates: List[QuestionCandidate], simhashes: List[int]) -> List[QuestionCandidate]:
+        accepted: List[QuestionCandidate] = []
+        for question, simh in zip(candidates, simhashes):
+            # Levenshtein-based uniqueness
+            if not self.is_unique_question(question):
+                if self.teach:
+                    console.print(f"[red][teach §E. Validate][/red] Rejected (Levenshtein similarity > 0.85): {question.question}")
+                self._leven_rejected += 1
+                continue
+            # SimHash near-duplicate check
+            nearest = self.dedupe.simhash_index.nearest(simh)
+            if nearest < self._simhash_threshold:
+                if self.teach:
+                    console.print(f"[red][teach §F. SimHash][/red] Using SimHash dedupe distance={nearest} < {self._simhash_threshold} → skip")
+                self._simhash_skipped.append({"question": question.question[:120], "distance": nearest})
+                continue
+            self.dedupe.simhash_index.add(simh)
+            self._fuzzy_index.add(question.category, question.subcategory, question.question)
+            if self.teach:
+                console.print(f"[green]Accepted[/green] diff={question.difficulty} src={question.source} fp={question.fingerprint[:8]}…")
+            accepted.append(question)
+            self._bump_stat("questions_generated")
+        return accepted
+
     def extract_key_concepts(self, text: str, max_concepts: int = 20) -> List[str]:
-        concepts: List[str] = []
-        patterns = [r"\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b", r"\b[A-Z]{2,}\b", r"`([^`]+)`", r"\*\*([^*]+)\*\*", r"##+ (.+)"]
-        for pattern in patterns:
-            concepts.extend(re.findall(pattern, text))
-        seen = set()
-        filtered = []
-        for concept in concepts:
-            concept = concept.strip()
-            if len(concept) > 2 and concept not in seen and concept.lower() not in {"the", "and", "or", "but", "for"}:
-                filtered.append(concept)
-                seen.add(concept)
-        return filtered[:max_concepts]
-
-    def generate_question_for_concept(self, concept: str, context: str, category: str, subcategory: str) -> Optional[QuestionCandidate]:
-        templates = {
-            "definition": [f"What is {concept}?", f"Which of the following best describes {concept}?", f"In {category}, what does {concept} refer to?"],
-            "purpose": [f"What is the primary purpose of {concept}?", f"Why would you use {concept} in {subcategory}?", f"What problem does {concept} solve?"],
-            "comparison": [f"How does {concept} differ from alternatives?", f"What is the main advantage of {concept}?", f"When should you use {concept}?"],
-            "implementation": [f"How is {concept} typically implemented?", f"What is required to use {concept}?", f"Which approach is best for {concept}?"],
-        }
-        q_type = random.choice(list(templates.keys()))
-        question_text = random.choice(templates[q_type])
-        correct_answer = self.extract_answer_from_context(concept, context, q_type)
-        if not correct_answer:
-            return None
-        distractors = self.generate_smart_distractors(concept, correct_answer, category, q_type)
-        if len(distractors) < 3:
-            return None
-        options = [correct_answer] + distractors[:3]
-        random.shuffle(options)
-        correct_index = options.index(correct_answer)
-        explanation = self.generate_explanation(concept, correct_answer, context)
-        fingerprint = hashlib.md5(f"{question_text}{sorted(options)}".encode()).hexdigest()
-        return QuestionCandidate(
-            question=question_text,
-            options=options,
-            correct_answer=correct_index,
-            explanation=explanation,
-            source=subcategory,
-            category=category,
-            subcategory=subcategory,
-            difficulty=self.assess_difficulty(question_text, options),
-            confidence=0.8,
-            fingerprint=fingerprint,
-        )
+        return extract_key_concepts(text, max_concepts)
+
+    # Generation helpers (delegate to the QuestionGenerator shared with the worker processes)
+    def generate_question_for_concept(self, concept: str, context: str, category: str, subcategory: str, rng: Optional[random.Random] = None) -> Optional[QuestionCandidate]:
+        return self.generator.generate_question_for_concept(concept, context, category, subcategory, rng)
 
     def extract_answer_from_context(self, concept: str, context: str, q_type: str) -> Optional[str]:
-        sentences = context.split(".")
-        relevant = [s for s in sentences if concept in s]
-        if not relevant:
-            return None
-        best = max(relevant, key=lambda s: len(s.split()))[:150]
-        if q_type == "definition":
-            if not best.startswith(("A ", "An ", "The ")):
-                best = f"A {best.lower()}"
-        return best.strip()
+        return self.generator.extract_answer_from_context(concept, context, q_type)
 
-    def generate_smart_distractors(self, concept: str, correct: str, category: str, q_type: str) -> List[str]:
-        category_distractors = {
-            "aws": ["An EC2 instance type", "A Lambda function trigger", "An S3 storage class", "A VPC component"],
-            "kubernetes": ["A Pod controller", "A Service type", "A Volume plugin", "A Network policy"],
-            "docker": ["A container runtime", "An image layer", "A compose directive", "A registry feature"],
-            "python": ["A built-in function", "A standard library module", "A data structure", "A decorator pattern"],
-            "database": ["A query optimization", "An index type", "A transaction level", "A replication method"],
-        }
-        base_distractors = category_distractors.get(category, [
-            f"A different approach to {concept}", f"An alternative to {concept}", f"A component of {concept}", f"A prerequisite for {concept}",
-        ])
-        distractors: List[str] = []
-        target_len = len(correct)
-        for d in base_distractors:
-            if len(d) < target_len * 0.5:
-                d += " with additional configuration"
-            elif len(d) > target_len * 1.5:
-                d = d[: int(target_len * 1.2)] + "..."
-            distractors.append(d)
-        return distractors[:4]
+    def generate_smart_distractors(
+        self,
+        concept: str,
+        correct: str,
+        category: str,
+        q_type: str,
+        subcategory: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+    ) -> List[str]:
+        return self.generator.generate_smart_distractors(concept, correct, category, q_type, subcategory, rng)
 
     def generate_explanation(self, concept: str, answer: str, context: str) -> str:
-        explanation = f"{concept} is correctly described as: {answer[:100]}"
-        sentences = context.split(".")
-        relevant = [s for s in sentences if concept in s and answer[:20] in s]
-        if relevant:
-            explanation = relevant[0].strip()[:200]
-        return explanation
+        return self.generator.generate_explanation(concept, answer, context)
 
     def assess_difficulty(self, question: str, options: List[str]) -> int:
-        complexity_score = 0
-        if len(question.split()) > 15:
-            complexity_score += 1
-        if any(word in question.lower() for word in ["explain", "compare", "analyze", "evaluate"]):
-            complexity_score += 1
-        avg_option_length = sum(len(opt) for opt in options) / len(options)
-        if avg_option_length > 50:
-            complexity_score += 1
-        if self.calculate_option_similarity(options) > 0.6:
-            complexity_score += 1
-        return min(complexity_score + 1, 5)
+        return self.generator.assess_difficulty(question, options)
 
     def calculate_option_similarity(self, options: List[str]) -> float:
-        if len(options) < 2:
-            return 0.0
-        similarities: List[float] = []
-        for i in range(len(options)):
-            for j in range(i + 1, len(options)):
-                sim = fuzz.ratio(options[i], options[j]) / 100
-                similarities.append(sim)
-        return sum(similarities) / len(similarities) if similarities else 0.0
+        return self.generator.calculate_option_similarity(options)
 
     def is_unique_question(self, question: QuestionCandidate, threshold: float = 0.85) -> bool:
-        if question.fingerprint in self.question_fingerprints:
+        if question.fingerprint in self.dedupe.fingerprints:
             if self.teach:
                 console.print("[red][teach §E. Validate][/red] Duplicate fingerprint found → skip")
             return False
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        match = self._fuzzy_index.first_match(question.category, question.subcategory, question.question, threshold)
+        if match:
+            if self.teach:
+                console.print(f"[red]Levenshtein ratio {match[1]:.2f} > {threshold:.2f} (not unique)[/red]")
+            return False
+        self.dedupe.fingerprints.add(question.fingerprint)
+        return True
+
+    def _load_category_questions(self, category: str, subcategory: str) -> List[str]:
+        rows = self.store.query(
             """
-            SELECT question, options FROM generated_questions
+            SELECT question FROM generated_questions
             WHERE category = ? AND subcategory = ?
             """,
-            (question.category, question.subcategory),
+            (category, subcategory),
         )
-        existing = cursor.fetchall()
-        conn.close()
-        for existing_q, _ in existing:
-            similarity = fuzz.ratio(question.question, existing_q) / 100
-            if similarity > threshold:
-                if self.teach:
-                    console.print(f"[red]Levenshtein ratio {similarity:.2f} > {threshold:.2f} (not unique)[/red]")
-                return False
-        self.question_fingerprints.add(question.fingerprint)
-        return True
+        return [r[0] for r in rows]
 
     # -----------------
     # SimHash helpers
@@ -565,19 +1248,7 @@ class MassiveHarvester:
         return [s[i:i+3] for i in range(max(0, len(s)-2))]
 
     def _simhash64(self, text: str) -> int:
-        vec = [0] * 64
-        for tg in self._trigrams(text):
-            h = int.from_bytes(hashlib.md5(tg.encode()).digest()[:8], 'big')
-            for b in range(64):
-                if (h >> b) & 1:
-                    vec[b] += 1
-                else:
-                    vec[b] -= 1
-        out = 0
-        for b in range(64):
-            if vec[b] > 0:
-                out |= (1 << b)
-        return out
+        return simhash64(text)
 
     def _hamming(self, a: int, b: int) -> int:
         return (a ^ b).bit_count()
@@ -586,76 +1257,76 @@ class MassiveHarvester:
     # Persistence & reports
     # -----------------
     def save_harvested_content(self, content_list: List[HarvestedContent]) -> None:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        for content in content_list:
-            try:
-                cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO harvested_content
-                    (source_url, source_type, title, content, category, subcategory, tags, scraped_at, quality_score)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        content.source_url,
-                        content.source_type,
-                        content.title,
-                        content.content,
-                        content.category,
-                        content.subcategory,
-                        json.dumps(content.tags),
-                        content.scraped_at,
-                        content.quality_score,
-                    ),
-                )
-            except Exception as e:  # pragma: no cover
-                console.print(f"[red]Error saving content: {e}[/red]")
-        conn.commit()
-        conn.close()
+        rows = (
+            (
+                content.source_url,
+                content.source_type,
+                content.title,
+                content.content,
+                content.category,
+                content.subcategory,
+                json.dumps(content.tags),
+                content.scraped_at,
+                content.quality_score,
+            )
+            for content in content_list
+        )
+        try:
+            self.store.executemany(
+                """
+                INSERT OR IGNORE INTO harvested_content
+                (source_url, source_type, title, content, category, subcategory, tags, scraped_at, quality_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        except sqlite3.Error as e:  # pragma: no cover
+            console.print(f"[red]Error saving content: {e}[/red]")
 
     def save_questions(self, questions: List[QuestionCandidate]) -> None:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        for q in questions:
-            try:
-                cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO generated_questions
-                    (fingerprint, question, options, correct_answer, explanation,
-                     category, subcategory, difficulty, confidence, source, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        q.fingerprint,
-                        q.question,
-                        json.dumps(q.options),
-                        q.correct_answer,
-                        q.explanation,
-                        q.category,
-                        q.subcategory,
-                        q.difficulty,
-                        q.confidence,
-                        q.source,
-                        datetime.now().isoformat(),
-                    ),
-                )
-            except Exception as e:  # pragma: no cover
-                console.print(f"[red]Error saving question: {e}[/red]")
-        conn.commit()
-        conn.close()
+        created_at = timestamp(self.seed)
+        simhashes = simhash64_batch([q.question for q in questions]).tolist()
+        rows = (
+            (
+                q.fingerprint,
+                q.question,
+                json.dumps(q.options),
+                q.correct_answer,
+                q.explanation,
+                q.category,
+                q.subcategory,
+                q.difficulty,
+                q.confidence,
+                q.source,
+                created_at,
+                to_signed64(simh),
+            )
+            for q, simh in zip(questions, simhashes)
+        )
+        try:
+            self.store.executemany(
+                """
+                INSERT OR IGNORE INTO generated_questions
+                (fingerprint, question, options, correct_answer, explanation,
+                 category, subcategory, difficulty, confidence, source, created_at, simhash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        except sqlite3.Error as e:  # pragma: no cover
+            console.print(f"[red]Error saving questions: {e}[/red]")
 
     def generate_csv_report(self, output_file: Optional[str] = None) -> Path:
         if not output_file:
             output_file = self.output_dir / f"quiz_harvest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query(
-            """
-            SELECT * FROM generated_questions
-            ORDER BY category, subcategory, difficulty
-            """,
-            conn,
-        )
-        conn.close()
+        with self.store.transaction() as conn:
+            df = pd.read_sql_query(
+                """
+                SELECT * FROM generated_questions
+                ORDER BY category, subcategory, difficulty
+                """,
+                conn,
+            )
         df["options"] = df["options"].apply(json.loads)
         df["option_1"], df["option_2"], df["option_3"], df["option_4"] = (
             df["options"].apply(lambda x: x[0] if len(x) > 0 else ""),
@@ -685,24 +1356,15 @@ class MassiveHarvester:
         return Path(output_file)
 
     def generate_statistics_report(self) -> Dict:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        store = self.store
         stats: Dict[str, object] = {}
-        cursor.execute("SELECT COUNT(*) FROM harvested_content")
-        stats["total_content"] = cursor.fetchone()[0]
-        cursor.execute("SELECT source_type, COUNT(*) FROM harvested_content GROUP BY source_type")
-        stats["content_by_type"] = dict(cursor.fetchall())
-        cursor.execute("SELECT category, COUNT(*) FROM harvested_content GROUP BY category")
-        stats["content_by_category"] = dict(cursor.fetchall())
-        cursor.execute("SELECT COUNT(*) FROM generated_questions")
-        stats["total_questions"] = cursor.fetchone()[0]
-        cursor.execute("SELECT category, COUNT(*) FROM generated_questions GROUP BY category")
-        stats["questions_by_category"] = dict(cursor.fetchall())
-        cursor.execute("SELECT difficulty, COUNT(*) FROM generated_questions GROUP BY difficulty")
-        stats["questions_by_difficulty"] = dict(cursor.fetchall())
-        cursor.execute("SELECT AVG(confidence) FROM generated_questions")
-        stats["average_confidence"] = cursor.fetchone()[0]
-        conn.close()
+        stats["total_content"] = store.query_one("SELECT COUNT(*) FROM harvested_content")[0]
+        stats["content_by_type"] = dict(store.query("SELECT source_type, COUNT(*) FROM harvested_content GROUP BY source_type"))
+        stats["content_by_category"] = dict(store.query("SELECT category, COUNT(*) FROM harvested_content GROUP BY category"))
+        stats["total_questions"] = store.query_one("SELECT COUNT(*) FROM generated_questions")[0]
+        stats["questions_by_category"] = dict(store.query("SELECT category, COUNT(*) FROM generated_questions GROUP BY category"))
+        stats["questions_by_difficulty"] = dict(store.query("SELECT difficulty, COUNT(*) FROM generated_questions GROUP BY difficulty"))
+        stats["average_confidence"] = store.query_one("SELECT AVG(confidence) FROM generated_questions")[0]
 
         table = Table(title="Harvest Statistics Report")
         table.add_column("Metric", style="cyan")
@@ -730,7 +1392,17 @@ class MassiveHarvester:
     # -----------------
     # Orchestration
     # -----------------
-    def run_complete_harvest(self, max_content: int = 1000, questions_per_content: int = 5, parallel_workers: int = 10) -> Dict:
+    def run_complete_harvest(
+        self,
+        max_content: int = 1000,
+        questions_per_content: int = 5,
+        parallel_workers: int = 10,
+        per_host: int = 1,
+        engine: str = "threads",
+        max_in_flight: int = 1000,
+        processes: int = 1,
+        seed: Optional[int] = None,
+    ) -> Dict:
         console.print("""
 [bold cyan]╔══════════════════════════════════════════════════════════╗
 ║           MASSIVE QUIZ CONTENT HARVESTER                  ║
@@ -738,9 +1410,11 @@ class MassiveHarvester:
 ╚══════════════════════════════════════════════════════════╝[/bold cyan]
 """)
         start_time = time.time()
-        content = self.harvest_all_sources(max_workers=parallel_workers, limit_per_source=max_content // 20)
-        questions = self.generate_questions_from_content(content, questions_per_content)
-        self.save_questions(questions)
+        if engine == "async":
+            content = self.harvest_all_sources_async(max_in_flight=max_in_flight, limit_per_source=max_content // 20, per_host=per_host)
+        else:
+            content = self.harvest_all_sources(max_workers=parallel_workers, limit_per_source=max_content // 20, per_host=per_host)
+        self.generate_and_save(content, questions_per_content, processes=processes, seed=seed)
         csv_file = self.generate_csv_report()
         stats = self.generate_statistics_report()
         elapsed = time.time() - start_time
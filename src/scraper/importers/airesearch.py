@@ -6,6 +6,8 @@ AI-Research importer
 - Reads harvested_content from SQLite (harvest.db)
 - Generates markdown summaries from template and updates index.md
 - Places entries under the best-matched category (fallback: Drafts)
+- index.md is parsed once per run (ResearchIndex), new rows are applied in one
+  pass and the file is written back once, atomically
 - Works without any local LLM; heuristics-only, with optional mapping file
 """
 
@@ -18,6 +20,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from ..concepts import extract_concepts
 from .base import BaseImporter
 
 
@@ -35,6 +38,83 @@ def _domain_from_url(url: str) -> str:
         return ""
 
 
+class ResearchIndex:
+    """In-memory model of docs/research/index.md: lines, category headers and known slugs."""
+
+    DRAFTS = "Drafts"
+
+    def __init__(self, lines: List[str]) -> None:
+        self.lines = lines
+        self.slugs = {slug for slug in (self._row_slug(line) for line in lines) if slug}
+        self._headers: Dict[str, int] = {}
+        # Rows to insert after line i (in insertion order); -1 is a new Drafts section at the end
+        self._pending: Dict[int, List[str]] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "ResearchIndex":
+        with open(path, "r") as f:
+            return cls(f.readlines())
+
+    @staticmethod
+    def _row_slug(line: str) -> Optional[str]:
+        # Rows look like "- title | url | [tags] | edition | status | slug | date"
+        if not line.startswith("- "):
+            return None
+        parts = line.rstrip("\n").rsplit(" | ", 2)
+        return parts[1].strip() if len(parts) == 3 else None
+
+    def _header_index(self, category: str) -> int:
+        if category in self._headers:
+            return self._headers[category]
+        idx = -1
+        for i, line in enumerate(self.lines):
+            txt = line.strip()
+            if txt == category or txt.endswith(category) or (txt and category in txt and txt[0].isdigit() and ")" in txt):
+                idx = i
+                break
+        if idx == -1:
+            for i, line in enumerate(self.lines):
+                if line.strip().lower().startswith("drafts"):
+                    idx = i
+                    break
+        self._headers[category] = idx
+        return idx
+
+    def add(self, row: str, slug: str, category: str) -> bool:
+        """Queue a row under its category header (else Drafts); False if the slug is already listed."""
+        if slug in self.slugs:
+            return False
+        self.slugs.add(slug)
+        self._pending.setdefault(self._header_index(category), []).append(row)
+        return True
+
+    @property
+    def changed(self) -> bool:
+        return bool(self._pending)
+
+    def render(self) -> str:
+        out: List[str] = []
+        for i, line in enumerate(self.lines):
+            rows = self._pending.get(i)
+            if rows and not line.endswith("\n"):
+                line += "\n"
+            out.append(line)
+            if rows:
+                # Each new row goes directly under the header, so the newest ends up first
+                out.extend(reversed(rows))
+        drafts = self._pending.get(-1)
+        if drafts:
+            out.append(f"\n{self.DRAFTS}\n")
+            out.extend(reversed(drafts))
+        return "".join(out)
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
 class AIResearchImporter(BaseImporter):
     DEFAULT_CATEGORY = "Drafts"
 
@@ -158,18 +238,7 @@ class AIResearchImporter(BaseImporter):
         return chosen[:n]
 
     def _extract_concepts(self, text: str, max_concepts: int = 10) -> List[str]:
-        patterns = [r"\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b", r"\b[A-Z]{2,}\b", r"`([^`]+)`", r"\*\*([^*]+)\*\*", r"##+ (.+)"]
-        concepts: List[str] = []
-        for p in patterns:
-            concepts.extend(re.findall(p, text))
-        seen, out = set(), []
-        stop = {"the", "and", "or", "but", "for", "with", "this", "that", "from"}
-        for c in concepts:
-            c = c.strip()
-            if len(c) > 2 and c.lower() not in stop and c not in seen and not c.isdigit():
-                out.append(c)
-                seen.add(c)
-        return out[:max_concepts]
+        return extract_concepts(text, max_concepts)
 
     def _decide_category(self, tags: List[str]) -> str:
         # Merge built-in and user mapping (user overrides)
@@ -238,51 +307,23 @@ class AIResearchImporter(BaseImporter):
             f.write(content)
         return md_path
 
-    def _update_index(self, title: str, url: str, slug: str, tags: List[str], category: str) -> bool:
-        if self.dry_run:
-            return False
-        if not self.index_md.exists():
-            return False
+    def _index_row(self, title: str, url: str, slug: str, tags: List[str]) -> str:
+        return f"- {title} | {url} | [{', '.join(tags)}] | {self.edition} | todo | {slug} | {datetime.now().strftime('%Y-%m-%d')}\n"
+
+    def _load_index(self) -> Optional[ResearchIndex]:
+        if self.dry_run or not self.index_md.exists():
+            return None
         try:
-            with open(self.index_md, "r") as f:
-                lines = f.readlines()
-            # Avoid duplicate slug
-            joined = "".join(lines)
-            if slug in joined:
-                return False
-            row = f"- {title} | {url} | [{', '.join(tags)}] | {self.edition} | todo | {slug} | {datetime.now().strftime('%Y-%m-%d')}\n"
-            # Find category header line index
-            cat_idx = -1
-            for i, line in enumerate(lines):
-                txt = line.strip()
-                if txt == category or txt.endswith(category) or txt == f"{category}" or (txt and category in txt and txt[0].isdigit() and ")" in txt):
-                    cat_idx = i
-                    break
-            if cat_idx == -1:
-                # try Drafts
-                for i, line in enumerate(lines):
-                    if line.strip().lower().startswith("drafts"):
-                        cat_idx = i
-                        break
-            if cat_idx == -1:
-                # append at end
-                lines.append("\nDrafts\n")
-                lines.append(row)
-            else:
-                # insert after the header line
-                insert_at = cat_idx + 1
-                lines.insert(insert_at, row)
-            with open(self.index_md, "w") as f:
-                f.writelines(lines)
-            return True
-        except Exception:
-            return False
+            return ResearchIndex.load(self.index_md)
+        except OSError:
+            return None
 
     # --------------------
     # Runner
     # --------------------
     def run(self, **kwargs) -> Dict[str, Any]:
         items = self._load_content()
+        index = self._load_index()
         created, skipped = 0, 0
         results: List[Dict[str, Any]] = []
         for it in items:
@@ -315,10 +356,13 @@ class AIResearchImporter(BaseImporter):
             }
             # write summary
             out_md = self._write_summary(slug, payload)
-            # update index
-            self._update_index(title, it["source_url"], slug, tags_final, category)
+            # queue the index row; index.md is written once after the loop
+            if index is not None:
+                index.add(self._index_row(title, it["source_url"], slug, tags_final), slug, category)
             created += 1
             results.append({"slug": slug, "file": str(out_md), "category": category})
+        if index is not None and index.changed:
+            index.save(self.index_md)
         return {
             "db": str(self.db_path),
             "repo": str(self.repo_path),
@@ -6,28 +6,37 @@ QuizMentor importer
 - Copies or links quiz JSON artifacts (produced by the exporter) into a target
   quizzes directory (e.g., QuizMentor.ai/quizzes)
 - Optionally verifies a minimal schema for quiz files
+- changed_only=True transfers just the files listed in the exporter's
+  export_changeset.json (and removes the ones it dropped)
 """
 
 import json
 import shutil
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .base import BaseImporter
 
 
 class QuizMentorImporter(BaseImporter):
-    def __init__(self, source_dir: str, target_dir: str, mode: str = "copy", verify: bool = True) -> None:
+    def __init__(self, source_dir: str, target_dir: str, mode: str = "copy", verify: bool = True, changed_only: bool = False) -> None:
         self.source_dir = Path(source_dir)
         self.target_dir = Path(target_dir)
         self.mode = mode  # copy | link
         self.verify = verify
+        self.changed_only = changed_only
         self.target_dir.mkdir(parents=True, exist_ok=True)
 
     def _iter_quiz_files(self) -> List[Path]:
         quiz_files = sorted(self.source_dir.glob("quiz_*.json"))
         return quiz_files
 
+    def _load_changeset(self) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads((self.source_dir / "export_changeset.json").read_text())
+        except (OSError, ValueError):
+            return None
+
     def _verify_quiz_file(self, path: Path) -> List[str]:
         problems: List[str] = []
         try:
@@ -67,6 +76,15 @@ class QuizMentorImporter(BaseImporter):
     def run(self, **kwargs) -> Dict[str, Any]:
         quiz_files = self._iter_quiz_files()
         copied, skipped, issues = 0, 0, []
+        changeset = self._load_changeset() if self.changed_only else None
+        if changeset is not None:
+            changed = {Path(p).name for p in changeset.get("added", []) + changeset.get("updated", [])}
+            # Files missing from the target are copied too, so a fresh target still fills up
+            pending = [qf for qf in quiz_files if qf.name in changed or not (self.target_dir / qf.name).exists()]
+            skipped = len(quiz_files) - len(pending)
+            quiz_files = pending
+            for removed in changeset.get("removed", []):
+                (self.target_dir / Path(removed).name).unlink(missing_ok=True)
         for qf in quiz_files:
             if self.verify:
                 problems = self._verify_quiz_file(qf)
@@ -77,12 +95,13 @@ class QuizMentorImporter(BaseImporter):
             self._transfer(qf, target)
             copied += 1
         index_src = self.source_dir / "harvest_index.json"
-        if index_src.exists():
+        index_changed = changeset is None or changeset.get("index") or not (self.target_dir / index_src.name).exists()
+        if index_src.exists() and index_changed:
             self._transfer(index_src, self.target_dir / index_src.name)
         summary = {
             "source_dir": str(self.source_dir),
             "target_dir": str(self.target_dir),
-            "files": len(quiz_files),
+            "files": len(quiz_files) + skipped,
             "copied": copied,
             "skipped": skipped,
             "issues": issues,
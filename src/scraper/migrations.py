@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the harvest databases
+- The applied version lives in a one-row schema_version table
+- Migrations are (version, description, step) in ascending order; a step is a
+  list of SQL statements or a callable taking the connection
+- Each pending migration runs in its own transaction together with the version
+  bump, so an interrupted upgrade leaves the database at the last good version
+- v1 is the original schema (CREATE ... IF NOT EXISTS), so databases created
+  before migrations existed are adopted in place rather than rebuilt
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Callable, List, Sequence, Tuple, Union
+
+Step = Union[Sequence[str], Callable[[sqlite3.Connection], None]]
+Migration = Tuple[int, str, Step]
+
+
+def _add_question_simhash(conn: sqlite3.Connection) -> None:
+    """generated_questions.simhash (signed 64-bit), backfilled for existing rows."""
+    from .dedupe.simhash import simhash64_batch, to_signed64
+
+    if "simhash" not in column_names(conn, "generated_questions"):
+        conn.execute("ALTER TABLE generated_questions ADD COLUMN simhash INTEGER")
+    rows = conn.execute("SELECT id, question FROM generated_questions WHERE simhash IS NULL").fetchall()
+    for start in range(0, len(rows), 4096):
+        chunk = rows[start:start + 4096]
+        hashes = simhash64_batch([question or "" for _, question in chunk])
+        conn.executemany(
+            "UPDATE generated_questions SET simhash = ? WHERE id = ?",
+            [(to_signed64(int(h)), qid) for (qid, _), h in zip(chunk, hashes)],
+        )
+
+
+HARVEST_MIGRATIONS: List[Migration] = [
+    (
+        1,
+        "baseline schema",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS harvested_content (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_url TEXT UNIQUE,
+                source_type TEXT,
+                title TEXT,
+                content TEXT,
+                category TEXT,
+                subcategory TEXT,
+                tags TEXT,
+                scraped_at TIMESTAMP,
+                quality_score REAL,
+                processed BOOLEAN DEFAULT FALSE
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS generated_questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fingerprint TEXT UNIQUE,
+                question TEXT,
+                options TEXT,
+                correct_answer INTEGER,
+                explanation TEXT,
+                category TEXT,
+                subcategory TEXT,
+                difficulty INTEGER,
+                confidence REAL,
+                source TEXT,
+                created_at TIMESTAMP,
+                validated BOOLEAN DEFAULT FALSE,
+                deployed BOOLEAN DEFAULT FALSE
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS harvest_stats (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TIMESTAMP,
+                urls_scraped INTEGER,
+                content_harvested INTEGER,
+                questions_generated INTEGER,
+                unique_questions INTEGER,
+                categories_covered INTEGER,
+                quality_avg REAL
+            )
+            """,
+        ],
+    ),
+    (
+        2,
+        "indexes for uniqueness checks, export and research import",
+        [
+            # is_unique_question loads questions per (category, subcategory)
+            "CREATE INDEX IF NOT EXISTS idx_questions_category ON generated_questions(category, subcategory)",
+            # QuizMentorExporter.iter_questions filters on confidence
+            "CREATE INDEX IF NOT EXISTS idx_questions_confidence ON generated_questions(confidence)",
+            # AIResearchImporter._load_content filters and orders by quality_score
+            "CREATE INDEX IF NOT EXISTS idx_content_quality ON harvested_content(quality_score)",
+        ],
+    ),
+    (
+        3,
+        "index unprocessed content for offline generation",
+        [
+            # `scraper generate` pages through processed = 0 rows by id (rowid rides along in the index)
+            "CREATE INDEX IF NOT EXISTS idx_content_processed ON harvested_content(processed)",
+        ],
+    ),
+    (
+        4,
+        "corpus-mined distractor pool",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS distractor_pool (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT NOT NULL,
+                subcategory TEXT NOT NULL,
+                phrase TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                term TEXT,
+                simhash INTEGER,
+                content_id INTEGER,
+                UNIQUE(category, subcategory, phrase)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_distractor_pool_group ON distractor_pool(category, subcategory, length)",
+            # Highest harvested_content id already mined (see DistractorPool.refresh)
+            "CREATE TABLE IF NOT EXISTS distractor_pool_state (last_content_id INTEGER NOT NULL)",
+        ],
+    ),
+    (5, "persist question SimHashes for cross-run dedupe", _add_question_simhash),
+    (
+        6,
+        "page-level MinHash signatures and near-duplicate decisions",
+        [
+            # 128 uint64 minimums per page (see dedupe/minhash.py)
+            "CREATE TABLE IF NOT EXISTS content_minhash (content_id INTEGER PRIMARY KEY, signature BLOB NOT NULL)",
+            """
+            CREATE TABLE IF NOT EXISTS content_duplicates (
+                content_id INTEGER PRIMARY KEY,
+                canonical_id INTEGER NOT NULL,
+                similarity REAL NOT NULL,
+                detected_at TIMESTAMP
+            )
+            """,
+        ],
+    ),
+    (
+        7,
+        "crawl frontier and seen-URL Bloom filter",
+        [
+            # Layers of the scalable Bloom filter of fetched canonical URLs (see fetch/frontier.py)
+            """
+            CREATE TABLE IF NOT EXISTS crawl_seen (
+                layer INTEGER PRIMARY KEY,
+                capacity INTEGER NOT NULL,
+                error_rate REAL NOT NULL,
+                item_count INTEGER NOT NULL,
+                bits BLOB NOT NULL
+            )
+            """,
+            # Links queued but not fetched when a site's page budget ran out
+            """
+            CREATE TABLE IF NOT EXISTS crawl_frontier (
+                site TEXT NOT NULL,
+                url TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (site, url)
+            )
+            """,
+        ],
+    ),
+    (
+        8,
+        "sitemap lastmod per site; refetch flag on queued links",
+        [
+            # Last <lastmod> read per page and per child sitemap (see fetch/sitemap.py)
+            """
+            CREATE TABLE IF NOT EXISTS sitemap_lastmod (
+                site TEXT NOT NULL,
+                url TEXT NOT NULL,
+                lastmod TEXT,
+                PRIMARY KEY (site, url)
+            )
+            """,
+            # Pages whose sitemap lastmod moved are fetched again even though they were seen
+            "ALTER TABLE crawl_frontier ADD COLUMN refetch INTEGER NOT NULL DEFAULT 0",
+        ],
+    ),
+    (
+        9,
+        "retry count on queued links",
+        [
+            # Failed fetches (5xx, 429, network errors) so far; the link is dropped after MAX_ATTEMPTS
+            "ALTER TABLE crawl_frontier ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+        ],
+    ),
+]
+
+
+ENHANCED_MIGRATIONS: List[Migration] = [
+    (
+        1,
+        "baseline schema",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS enhanced_questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                question TEXT NOT NULL,
+                options TEXT NOT NULL,
+                correct_answer INTEGER NOT NULL,
+                explanation TEXT,
+                category TEXT,
+                subcategory TEXT,
+                difficulty INTEGER,
+                confidence REAL,
+                source_url TEXT,
+                source_type TEXT,
+                distractor_quality REAL,
+                answer_distribution TEXT,
+                semantic_fingerprint TEXT UNIQUE,
+                concepts TEXT,
+                created_at TIMESTAMP,
+                UNIQUE(semantic_fingerprint)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS source_usage (
+                source_url TEXT PRIMARY KEY,
+                last_used TIMESTAMP,
+                times_used INTEGER DEFAULT 0,
+                questions_generated INTEGER DEFAULT 0
+            )
+            """,
+        ],
+    ),
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Applied schema version (0 for a database that has never been migrated)."""
+    conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return int(row[0] or 0)
+
+
+def migrate(conn: sqlite3.Connection, migrations: Sequence[Migration]) -> List[int]:
+    """Apply pending migrations in order; returns the versions applied."""
+    if conn.in_transaction:
+        conn.commit()
+    current = schema_version(conn)
+    conn.commit()
+    applied: List[int] = []
+    last = 0
+    for version, _description, step in migrations:
+        if version <= last:
+            raise ValueError(f"migrations out of order at version {version}")
+        last = version
+        if version <= current:
+            continue
+        conn.execute("BEGIN")
+        try:
+            if callable(step):
+                step(conn)
+            else:
+                for statement in step:
+                    conn.execute(statement)
+            conn.execute("DELETE FROM schema_version")
+            conn.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+
+def column_names(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Columns of a table; handy for callable migrations that add columns."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
@@ -40,6 +40,9 @@ class ShipLocalOrchestrator:
             limit: int | None = None,
             teach: bool = False,
             preview: bool = False,
+            cache_dir: str | None = None,
+            policy_path: str | None = None,
+            seed: int | None = None,
             ) -> Dict[str, Any]:
         ctx: Dict[str, Any] = {"steps": [], "warnings": []}
 
@@ -52,12 +55,12 @@ class ShipLocalOrchestrator:
             self.console.print(f"[green]DB:[/green] {db_path}")
         else:
             self._log_step("Harvest (massive)")
-            harvester = MassiveHarvester(output_dir=output_dir, teach=teach)
-            summary = harvester.run_complete_harvest(
-                max_content=max_content,
-                questions_per_content=questions_per_content,
-                parallel_workers=workers,
-            )
+            with MassiveHarvester(output_dir=output_dir, teach=teach, cache_dir=cache_dir, policy_path=policy_path, seed=seed) as harvester:
+                summary = harvester.run_complete_harvest(
+                    max_content=max_content,
+                    questions_per_content=questions_per_content,
+                    parallel_workers=workers,
+                )
             db_path = Path(summary.get("database", harvester.db_path))
             self.console.print(f"[green]DB:[/green] {db_path}")
             ctx["steps"].append({"harvest": summary})
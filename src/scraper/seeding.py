@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Reproducible (seeded) runs
+- Harvesters take a seed and draw every random choice from their own random.Random
+- Seeded runs also freeze the timestamps written with generated questions:
+  SOURCE_DATE_EPOCH (the reproducible-builds convention) when set, else the Unix
+  epoch, so identical input produces identical rows
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def make_rng(seed: Optional[int]) -> random.Random:
+    return random.Random(seed)
+
+
+def fixed_timestamp() -> str:
+    epoch = int(os.environ.get("SOURCE_DATE_EPOCH", "0") or 0)
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def timestamp(seed: Optional[int]) -> str:
+    """ISO timestamp for generated rows: wall clock, or the fixed clock when seeded."""
+    return fixed_timestamp() if seed is not None else datetime.now().isoformat()
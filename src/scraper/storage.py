@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+SQLite storage layer shared by the harvesters
+- One long-lived connection per store (opened once, guarded by a lock so fetch
+  worker threads can read through it)
+- WAL journal with synchronous=NORMAL, a larger page cache, mmap reads and
+  in-memory temp tables
+- Writes go through transaction() / executemany() which batch rows into
+  chunked executemany calls, one commit per chunk
+- Pending schema migrations (see migrations.py) are applied when the store opens
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .migrations import Migration, migrate
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_CACHE_KB = 64 * 1024
+DEFAULT_MMAP_BYTES = 256 * 1024 * 1024
+
+
+class HarvestStore:
+    """Owns the SQLite connection of one harvest database."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        cache_kb: int = DEFAULT_CACHE_KB,
+        mmap_bytes: int = DEFAULT_MMAP_BYTES,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        migrations: Optional[Sequence[Migration]] = None,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.chunk_size = max(1, int(chunk_size))
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Negative cache_size is in KiB rather than pages
+        self._conn.execute(f"PRAGMA cache_size=-{int(cache_kb)}")
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self.applied_migrations: List[int] = migrate(self._conn, migrations) if migrations else []
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError(f"HarvestStore for {self.db_path} is closed")
+        return self._conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold the store lock; commit on success, roll back on error."""
+        with self._lock:
+            conn = self.conn
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[tuple]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    def executemany(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """Insert rows in chunk_size batches, one transaction per batch; returns rows changed."""
+        changed = 0
+        chunk: List[Sequence[Any]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                changed += self._write_chunk(sql, chunk)
+                chunk = []
+        if chunk:
+            changed += self._write_chunk(sql, chunk)
+        return changed
+
+    def _write_chunk(self, sql: str, chunk: List[Sequence[Any]]) -> int:
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(sql, chunk)
+            return conn.total_changes - before
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "HarvestStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Per-document sentence index for answer/explanation lookup
+- A document is split into sentences once (on ".", as the generators always did),
+  with their start offsets and a lowercased copy of the text
+- term -> sentence ids is answered by str.find over the whole text plus a bisect
+  on the offsets, jumping to the next sentence after each hit, and memoized; so a
+  page with many concepts is scanned once per concept in C instead of once per
+  concept and sentence in Python
+- Matching keeps plain substring semantics ("Pod" finds "Pods"), optionally
+  case-insensitive
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+def _starts(sentences: List[str]) -> List[int]:
+    starts, pos = [], 0
+    for s in sentences:
+        starts.append(pos)
+        pos += len(s) + 1
+    return starts
+
+
+class DocumentIndex:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.sentences = text.split(".")
+        self._starts = _starts(self.sentences)
+        self._lower_text: Optional[str] = None
+        self._lower_starts: List[int] = []
+        self._word_counts: Dict[int, int] = {}
+        self._hits: Dict[Tuple[str, bool], List[int]] = {}
+
+    def _haystack(self, ignore_case: bool) -> Tuple[str, List[int]]:
+        if not ignore_case:
+            return self.text, self._starts
+        if self._lower_text is None:
+            # Offsets are computed on the lowered text itself: lower() may change lengths
+            self._lower_text = self.text.lower()
+            self._lower_starts = _starts(self._lower_text.split("."))
+        return self._lower_text, self._lower_starts
+
+    def sentence_ids(self, term: str, ignore_case: bool = False) -> List[int]:
+        """Ids (in document order) of the sentences containing term."""
+        key = (term, ignore_case)
+        hits = self._hits.get(key)
+        if hits is not None:
+            return hits
+        if ignore_case:
+            term = term.lower()
+        if not term:
+            hits = list(range(len(self.sentences)))
+        elif "." in term:
+            hits = []  # sentences never contain the separator
+        else:
+            hay, starts = self._haystack(ignore_case)
+            hits = []
+            pos = hay.find(term)
+            while pos != -1:
+                i = bisect_right(starts, pos) - 1
+                hits.append(i)
+                pos = hay.find(term, starts[i + 1]) if i + 1 < len(starts) else -1
+        self._hits[key] = hits
+        return hits
+
+    def sentences_with(self, term: str, ignore_case: bool = False) -> List[str]:
+        return [self.sentences[i] for i in self.sentence_ids(term, ignore_case)]
+
+    def word_count(self, i: int) -> int:
+        count = self._word_counts.get(i)
+        if count is None:
+            count = self._word_counts[i] = len(self.sentences[i].split())
+        return count
+
+
+@lru_cache(maxsize=32)
+def document_index(text: str) -> DocumentIndex:
+    """Shared index for a document; repeated lookups on the same text reuse it."""
+    return DocumentIndex(text)
@@ -0,0 +1,47 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scraper.fetch.aio import AsyncFetchEngine
+
+pytest.importorskip("aiohttp")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = f"<html><title>{self.path}</title></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _title(html: bytes) -> str:
+    return html.decode().split("<title>")[1].split("</title>")[0]
+
+
+def test_async_engine_fetches_and_offloads_in_order():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        async def main(engine):
+            import asyncio
+
+            async def one(i):
+                resp = await engine.get(f"{base}/page{i}", params={"n": i})
+                return await engine.offload(_title, resp.content)
+
+            return await asyncio.gather(*(one(i) for i in range(20)))
+
+        with ThreadPoolExecutor(2) as pool:
+            titles = AsyncFetchEngine(max_in_flight=8, per_host=4, executor=pool).run(main)
+        assert titles == [f"/page{i}?n={i}" for i in range(20)]
+    finally:
+        server.shutdown()
@@ -0,0 +1,21 @@
+import json
+import subprocess
+import sys
+
+HEAVY = ["pandas", "sklearn", "bs4", "rich", "fuzzywuzzy", "feedparser", "requests", "numpy"]
+
+SCRIPT = """
+import json, sys
+import scraper.cli
+parser = scraper.cli.build_parser()
+parser.format_help()
+args = parser.parse_args(["validate", "quiz", "--from", sys.argv[1]])
+args.func(args)
+print(json.dumps([m for m in %r if m in sys.modules]))
+""" % (HEAVY,)
+
+
+def test_cli_startup_skips_heavy_imports(tmp_path):
+    proc = subprocess.run([sys.executable, "-c", SCRIPT, str(tmp_path)], capture_output=True, text=True, check=True)
+    # Parser + a validate command must not pay for the harvesters' imports
+    assert json.loads(proc.stdout.strip().splitlines()[-1]) == []
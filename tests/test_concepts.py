@@ -0,0 +1,35 @@
+import re
+
+from scraper.concepts import CONCEPT_PATTERNS, STOPWORDS, ConceptExtractor, extract_concepts, extract_concepts_batch
+
+
+def _per_pattern(text, max_concepts=20):
+    found = []
+    for pattern in CONCEPT_PATTERNS:
+        found.extend(re.findall(pattern, text))
+    out = []
+    for c in (c.strip() for c in found):
+        if len(c) > 2 and c.lower() not in STOPWORDS and not c.isdigit() and c not in out:
+            out.append(c)
+    return out[:max_concepts]
+
+
+def test_single_pass_matches_findall_per_pattern():
+    texts = [
+        "Use **Rolling Update** with `kubectl rollout` in K8S. The API and HTTP layer.",
+        "## Pod Lifecycle\n### Init Containers\n`a` b `ccc` `ddd`\n**x** and **StatefulSet**",
+        "class ReplicaSet: def reconcile(self): function watchLoop() 1234 `5678` This With",
+        "subclass Foo ###  ## bar *** ** **",
+        "",
+    ]
+    for text in texts:
+        assert extract_concepts(text) == _per_pattern(text)
+        assert extract_concepts(text, 3) == _per_pattern(text, 3)
+    assert extract_concepts_batch(texts, 5) == [_per_pattern(t, 5) for t in texts]
+    # Overlapping matches of different patterns are all kept
+    assert extract_concepts("**Rolling Update**") == ["Rolling", "Update", "Rolling Update"]
+
+
+def test_lead_class_is_an_optimization_only():
+    text = "## Services\nA `Service` exposes **ClusterIP** or NodePort; class Endpoints; def probe"
+    assert ConceptExtractor().extract(text) == ConceptExtractor(lead=None).extract(text)
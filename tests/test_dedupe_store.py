@@ -0,0 +1,42 @@
+from scraper.dedupe.simhash import simhash64, to_signed64
+from scraper.harvesters.enhanced import EnhancedHarvester
+from scraper.harvesters.massive import HarvestedContent, MassiveHarvester
+
+TEXT = (
+    "Kubernetes schedules Pods onto Nodes. A Deployment manages ReplicaSets and rolling updates. "
+    "A Service exposes Pods through a stable ClusterIP. ConfigMap objects hold configuration. "
+) * 5
+
+
+def test_massive_dedupes_against_earlier_runs(tmp_path):
+    content = HarvestedContent(
+        source_url="https://docs.example/k8s",
+        source_type="documentation",
+        title="k8s",
+        content=TEXT,
+        category="kubernetes",
+        subcategory="core",
+        tags=[],
+        scraped_at="2024-01-01T00:00:00",
+        quality_score=0.9,
+    )
+    with MassiveHarvester(output_dir=str(tmp_path), seed=7) as h:
+        first = h.generate_and_save([content], 5)
+        stored = h.store.query("SELECT question, simhash FROM generated_questions ORDER BY id")
+    assert first and all(simhash == to_signed64(simhash64(q)) for q, simhash in stored)
+
+    with MassiveHarvester(output_dir=str(tmp_path), seed=7) as h:
+        assert len(h.dedupe.fingerprints) == len(h.dedupe.simhash_index) == len(first)
+        assert h.generate_questions_from_content([content], 5) == []
+
+
+def test_enhanced_semantic_index_covers_stored_questions(tmp_path):
+    with EnhancedHarvester(output_dir=str(tmp_path)) as h:
+        h.store.executemany(
+            "INSERT INTO enhanced_questions (question, options, correct_answer, semantic_fingerprint) VALUES (?, ?, ?, ?)",
+            [("What problem does Ingress solve?", "[]", 0, "fp-1")],
+        )
+    with EnhancedHarvester(output_dir=str(tmp_path)) as h:
+        assert "fp-1" in h.dedupe.fingerprints
+        assert not h.check_semantic_uniqueness("What problem does Ingress solve?")
+        assert h.check_semantic_uniqueness("How is a CronJob scheduled?")
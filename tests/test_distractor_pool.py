@@ -0,0 +1,55 @@
+import random
+
+from scraper.distractors import DistractorPool, mine_phrases
+from scraper.harvesters.massive import HarvestedContent, MassiveHarvester
+
+DOCS = {
+    "pods": "A Pod is the smallest deployable unit in Kubernetes. Pods share a network namespace and storage volumes.",
+    "services": "A Service exposes an application running on a set of Pods. Ingress routes external HTTP traffic to Services.",
+    "volumes": "A PersistentVolume is storage provisioned by an administrator. StorageClass objects describe classes of storage.",
+    "jobs": "A Job creates Pods that run until successful completion. CronJob objects run Jobs on a repeating schedule.",
+}
+
+
+def _content(name):
+    return HarvestedContent(
+        source_url=f"https://docs.example/{name}",
+        source_type="documentation",
+        title=name,
+        content=DOCS[name],
+        category="kubernetes",
+        subcategory="core",
+        tags=[],
+        scraped_at="2024-01-01T00:00:00",
+        quality_score=0.9,
+    )
+
+
+def test_mine_phrases_keeps_answer_like_sentences():
+    text = (
+        "Is a Pod the same thing as a Docker container? "
+        "no. A Pod groups containers that share storage. run kubectl on each Pod now. Call Start() with {Pod: x} config."
+    )
+    assert mine_phrases(text) == [("A Pod groups containers that share storage", "Pod")]
+
+
+def test_pool_refreshes_incrementally_and_picks_by_length(tmp_path):
+    with MassiveHarvester(output_dir=str(tmp_path)) as h:
+        h.save_harvested_content([_content("pods"), _content("services")])
+        assert h.refresh_distractor_pool() == 4
+        assert h.refresh_distractor_pool() == 0
+        h.save_harvested_content([_content("volumes"), _content("jobs")])
+        assert h.refresh_distractor_pool() == 4
+        assert h.store.query_one("SELECT COUNT(*) FROM distractor_pool")[0] == len(h.distractor_pool) == 8
+
+        correct = "A Deployment manages a replicated set of Pods"
+        picked = h.distractor_pool.pick("kubernetes", "core", "Deployment", correct, 3, random.Random(0))
+        assert len(picked) == 3 and correct not in picked
+        assert all(len(correct) / 2 <= len(p) <= len(correct) * 1.5 for p in picked)
+        # Phrases that mention the concept itself are never offered
+        assert not any("Service" in p for p in h.distractor_pool.pick("kubernetes", None, "Service", correct, 3, random.Random(0)))
+        assert h.distractor_pool.pick("docker", None, "Deployment", correct, 3, random.Random(0)) == []
+
+    # Other harvesters read the same pool from the database
+    assert len(DistractorPool.from_db(tmp_path / "harvest.db")) == 8
+    assert len(DistractorPool.from_db(tmp_path / "missing.db")) == 0
@@ -0,0 +1,25 @@
+from scraper.dedupe.fuzzy import ratio
+from scraper.distractors import distinct_from, distractor_quality, mean_pairwise_similarity, term_candidates
+
+
+def test_term_candidates_are_distinct_and_capped():
+    context = " ".join(f"Term{chr(97 + i % 26)}x Pod" for i in range(1000))
+    candidates = term_candidates(context, exclude="A pod runs containers", limit=5)
+    assert len(candidates) == 5 == len(set(candidates))
+    assert "A Pod-based solution" not in candidates
+
+
+def test_distinct_from_dedupes_before_scoring():
+    correct = "A Service exposes a set of Pods"
+    candidates = ["A Service exposes a set of Pods", "A Volume plugin", "A Volume plugin", "A Service exposes a set of Nodes"]
+    assert distinct_from(correct, candidates) == ["A Volume plugin"]
+
+
+def test_scores_match_pairwise_ratio():
+    options = ["A Pod controller", "A Service type", "A Volume plugin", "A Pod controllers"]
+    pairs = [ratio(a, b) / 100 for i, a in enumerate(options) for b in options[i + 1 :]]
+    assert mean_pairwise_similarity(options) == sum(pairs) / len(pairs)
+    # a distractor very close to the answer costs 0.3, a near-duplicate distractor pair 0.2
+    assert distractor_quality("A Pod controller", options[1:]) == 1.0 - 0.3
+    assert distractor_quality("A Pod controller", ["A Service type", "A Service types"]) == 1.0 - 0.2
+    assert distractor_quality("x", ["something odd"]) == max(0.0, 1.0 - 0.1 - 0.2)
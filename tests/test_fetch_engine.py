@@ -0,0 +1,58 @@
+import threading
+import time
+
+from scraper.fetch.engine import FetchEngine
+
+
+def test_fetch_engine_orders_results_and_caps_per_host():
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+
+    def job(host, value, delay):
+        def _run():
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(delay)
+            with lock:
+                active[host] -= 1
+            return value
+        return _run
+
+    jobs = [("a.example", job("a.example", i, 0.02)) for i in range(4)]
+    jobs += [("b.example", job("b.example", 10 + i, 0.005)) for i in range(4)]
+    done = []
+    results = FetchEngine(max_workers=8, per_host=1).run(jobs, on_done=lambda idx, _: done.append(idx))
+
+    assert results == [0, 1, 2, 3, 10, 11, 12, 13]
+    assert sorted(done) == list(range(8))
+    assert peak == {"a.example": 1, "b.example": 1}
+
+
+def test_fetch_engine_runs_hosts_concurrently():
+    lock = threading.Lock()
+    active = {}
+    peak = {"total": 0}
+    overlap = threading.Event()
+
+    def job(host):
+        def _run():
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                total = sum(active.values())
+                peak[host] = max(peak.get(host, 0), active[host])
+                peak["total"] = max(peak["total"], total)
+                if total > 1:
+                    overlap.set()
+            # Hold the slot until another job runs alongside (a serial engine never gets there)
+            overlap.wait(timeout=2)
+            time.sleep(0.005)
+            with lock:
+                active[host] -= 1
+        return _run
+
+    hosts = [f"h{i}.example" for i in range(4)]
+    FetchEngine(max_workers=8, per_host=2).run([(host, job(host)) for host in hosts for _ in range(3)])
+    assert peak.pop("total") > 1
+    assert max(peak.values()) <= 2
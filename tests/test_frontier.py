@@ -0,0 +1,129 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scraper.fetch.frontier import CrawlFrontier, SeenUrls
+from scraper.fetch.urls import canonicalize_url
+from scraper.harvesters.massive import MassiveHarvester
+
+# path -> links on that page
+SITE = {
+    "/docs/": ["intro/", "intro/index.html#top", "/docs/intro?utm_source=nav", "guide/a", "logo.png", "/blog/post", "mailto:x@y"],
+    "/docs/intro/": ["../guide/a", "deep/one"],
+    "/docs/guide/a": ["b"],
+    "/docs/guide/b": ["c"],
+    "/docs/intro/deep/one": [],
+}
+BODY = "Kubernetes schedules Pods onto Nodes and a Deployment manages ReplicaSets. " * 10
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fetched = []
+    failing = {}
+
+    def do_GET(self):
+        if self.path not in SITE:
+            # No robots.txt or sitemap: the crawl falls back to links alone
+            self.send_response(404)
+            self.end_headers()
+            return
+        type(self).fetched.append(self.path)
+        if self.path in self.failing:
+            self.send_response(self.failing[self.path])
+            self.end_headers()
+            return
+        links = "".join(f'<a href="{href}">x</a>' for href in SITE.get(self.path, []))
+        body = f"<html><title>{self.path}</title><nav>{links}</nav><main>{BODY}</main></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_canonicalize_url_merges_variants_of_one_page():
+    variants = [
+        "HTTPS://Docs.Example.com:443/ec2/?utm_source=x&b=2&a=1#top",
+        "https://docs.example.com/ec2/index.html?a=1&b=2&gclid=1",
+        "https://docs.example.com/ec2/./guide/..//?b=2&a=1",
+    ]
+    assert {canonicalize_url(u) for u in variants} == {"https://docs.example.com/ec2?a=1&b=2"}
+    assert canonicalize_url("../s3/", "https://docs.example.com/ec2/guide/") == "https://docs.example.com/ec2/s3"
+
+
+def test_seen_urls_grow_and_round_trip(tmp_path):
+    seen = SeenUrls(capacity=100)
+    assert all(seen.add(f"https://x/{i}") for i in range(1000))
+    assert not seen.add("https://x/7") and len(seen.layers) > 1
+    with MassiveHarvester(output_dir=str(tmp_path)) as h:
+        seen.save(h.store)
+        loaded = SeenUrls.from_store(h.store)
+    assert len(loaded) == 1000 and all(f"https://x/{i}" in loaded for i in range(1000))
+
+
+def test_frontier_orders_by_depth_and_stays_in_scope():
+    frontier = CrawlFrontier(["https://d.io/docs/"], max_depth=1)
+    frontier.push("https://d.io/docs/")
+    frontier.extend(["a/b/c", "a", "/other", "https://e.io/docs/x"], 1, "https://d.io/docs/")
+    assert not frontier.push("https://d.io/docs/z", 2)
+    assert [frontier.pop() for _ in range(4)] == [
+        ("https://d.io/docs/", 0), ("https://d.io/docs/a", 1), ("https://d.io/docs/a/b/c", 1), None,
+    ]
+    # Only pages reported done count as fetched; the rest stay pending
+    frontier.done("https://d.io/docs/a")
+    assert "https://d.io/docs/a" in frontier.seen and "https://d.io/docs" not in frontier.seen
+    assert frontier.pending() == [("https://d.io/docs/", 0, False, 0), ("https://d.io/docs/a/b/c", 1, False, 0)]
+
+
+def test_frontier_gives_up_after_max_attempts():
+    frontier = CrawlFrontier(["https://d.io/docs/"], max_attempts=2)
+    frontier.push("https://d.io/docs/x", 1, attempts=1)
+    assert frontier.pop() == ("https://d.io/docs/x", 1)
+    assert not frontier.failed("https://d.io/docs/x")
+    assert frontier.pending() == [] and "https://d.io/docs/x" not in frontier.seen
+
+
+def test_documentation_crawl_follows_links_and_resumes(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    source = {"name": "Docs", "urls": [f"http://127.0.0.1:{server.server_address[1]}/docs/"], "max_depth": 2}
+    try:
+        with MassiveHarvester(output_dir=str(tmp_path)) as h:
+            first = h.harvest_documentation_site(source, limit=3)
+        # Shallow paths first: intro/ and its variants are one page, /blog and logo.png are out of scope
+        assert _Handler.fetched == ["/docs/", "/docs/intro/", "/docs/guide/a"]
+        assert len(first) == 3
+
+        # The next run revalidates the landing page, skips fetched pages and continues with
+        # the queued links (depth 2 ends at guide/b)
+        with MassiveHarvester(output_dir=str(tmp_path)) as h:
+            second = h.harvest_documentation_site(source)
+            assert h.store.query("SELECT COUNT(*) FROM crawl_frontier")[0][0] == 0
+        assert _Handler.fetched[3:] == ["/docs/", "/docs/guide/b", "/docs/intro/deep/one"]
+        assert [c.source_url.rsplit("/docs/", 1)[1] for c in second] == ["", "guide/b", "intro/deep/one"]
+    finally:
+        server.shutdown()
+
+
+def test_transient_failures_are_retried_and_404s_dropped(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    source = {"name": "Docs", "urls": [f"http://127.0.0.1:{server.server_address[1]}/docs/"], "max_depth": 1}
+    try:
+        _Handler.fetched, _Handler.failing = [], {"/docs/intro/": 503, "/docs/guide/a": 404}
+        with MassiveHarvester(output_dir=str(tmp_path)) as h:
+            first = h.harvest_documentation_site(source)
+            ((url, attempts),) = h.store.query("SELECT url, attempts FROM crawl_frontier")
+        # Only the 503 is kept for the next run; the 404 is not requeued
+        assert url.endswith("/docs/intro/") and attempts == 1
+        assert _Handler.fetched == ["/docs/", "/docs/intro/", "/docs/guide/a"] and len(first) == 1
+
+        _Handler.fetched, _Handler.failing = [], {}
+        with MassiveHarvester(output_dir=str(tmp_path)) as h:
+            second = h.harvest_documentation_site(source)
+            assert h.store.query("SELECT COUNT(*) FROM crawl_frontier")[0][0] == 0
+        assert _Handler.fetched == ["/docs/", "/docs/intro/"] and len(second) == 2
+    finally:
+        _Handler.failing = {}
+        server.shutdown()
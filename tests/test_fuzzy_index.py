@@ -0,0 +1,40 @@
+import random
+
+from fuzzywuzzy import fuzz
+
+from scraper.dedupe.fuzzy import FuzzyIndex, ratio, ratio_matrix
+
+
+def _questions(n, seed=0):
+    rng = random.Random(seed)
+    words = ["pod", "service", "deployment", "cache", "index", "query", "replica", "volume", "node", "cluster"]
+    return [f"What does {' '.join(rng.choice(words) for _ in range(rng.randint(2, 6)))} do in Kubernetes?" for _ in range(n)]
+
+
+def test_ratio_matrix_matches_fuzzywuzzy():
+    rows, cols = _questions(20, seed=1), _questions(30, seed=2)
+    matrix = ratio_matrix(rows, cols)
+    for i, a in enumerate(rows):
+        for j, b in enumerate(cols):
+            assert matrix[i, j] == fuzz.ratio(a, b)
+    assert ratio("", "") == fuzz.ratio("", "")
+    assert ratio("abc", "") == fuzz.ratio("abc", "")
+
+
+def test_fuzzy_index_decisions_match_linear_scan():
+    stored = _questions(300, seed=3)
+    loads = []
+
+    def loader(cat, sub):
+        loads.append((cat, sub))
+        return list(stored)
+
+    index = FuzzyIndex(loader, chunk_size=64)
+    for q in _questions(100, seed=4):
+        expected = next((s for s in stored if fuzz.ratio(q, s) / 100 > 0.85), None)
+        match = index.first_match("k8s", "pods", q, 0.85)
+        assert (match[0] if match else None) == expected
+    # The category is read from storage once, then served from memory
+    assert loads == [("k8s", "pods")]
+    index.add("k8s", "pods", "brand new question")
+    assert index.first_match("k8s", "pods", "brand new question") == ("brand new question", 1.0)
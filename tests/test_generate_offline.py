@@ -0,0 +1,44 @@
+from scraper.harvesters.massive import HarvestedContent, MassiveHarvester
+
+TEXT = (
+    "Kubernetes schedules Pods onto Nodes. A Deployment manages ReplicaSets and rolling updates. "
+    "A Service exposes Pods through a stable ClusterIP. ConfigMap objects hold configuration. "
+) * 5
+
+
+def _content(i, category, quality):
+    return HarvestedContent(
+        source_url=f"https://docs.example/{category}/{i}",
+        source_type="documentation",
+        title=f"Page {i}",
+        # Distinct pages: identical text under several URLs would be dropped as near-duplicates
+        content=TEXT.replace(". ", f" (see section {i}). "),
+        category=category,
+        subcategory="core",
+        tags=[category],
+        scraped_at="2024-01-01T00:00:00",
+        quality_score=quality,
+    )
+
+
+def test_generate_streams_stored_content_and_marks_processed(tmp_path):
+    with MassiveHarvester(output_dir=str(tmp_path)) as h:
+        h.save_harvested_content([_content(i, cat, q) for i, (cat, q) in enumerate([("kubernetes", 0.9), ("kubernetes", 0.2), ("docker", 0.8)] * 3)])
+        summary = h.regenerate_from_store(questions_per_content=3, category="kubernetes", min_quality=0.5, batch_size=2)
+        assert summary["content_processed"] == 3
+        assert summary["questions_generated"] == h.store.query_one("SELECT COUNT(*) FROM generated_questions")[0]
+        assert dict(h.store.query("SELECT category, SUM(processed) FROM harvested_content GROUP BY category")) == {"docker": 0, "kubernetes": 3}
+        # Processed rows are skipped on the next run unless reprocess is asked for
+        assert h.regenerate_from_store(category="kubernetes", min_quality=0.5)["content_processed"] == 0
+        assert h.regenerate_from_store(category="kubernetes", min_quality=0.5, reprocess=True)["content_processed"] == 3
+        assert h.regenerate_from_store()["content_processed"] == 6
+
+
+def test_parallel_generation_matches_serial_for_same_seed(tmp_path):
+    contents = [_content(i, cat, 0.9) for i, cat in enumerate(["kubernetes", "docker", "kubernetes", "python"] * 3)]
+    runs = []
+    for processes in (1, 2):
+        with MassiveHarvester(output_dir=str(tmp_path / f"p{processes}")) as h:
+            questions = h.generate_questions_from_content(contents, 4, processes=processes, seed=123)
+            runs.append([(q.question, q.options, q.correct_answer, q.fingerprint) for q in questions])
+    assert runs[0] and runs[0] == runs[1]
@@ -0,0 +1,54 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from scraper.fetch.cache import ResponseCache, install_cache
+
+
+class _ETagHandler(BaseHTTPRequestHandler):
+    full_responses = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        type(self).full_responses += 1
+        body = b"<html>hello</html>"
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_cache_revalidates_with_etag(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/docs/?b=2&a=1"
+    try:
+        session = requests.Session()
+        install_cache(session, str(tmp_path / "cache"))
+        first = session.get(url)
+        # Same URL with reordered query params and a fragment hits the same entry
+        second = session.get(url.replace("?b=2&a=1", "?a=1&b=2") + "#intro")
+        assert first.from_cache is False
+        assert second.from_cache is True
+        assert second.status_code == 200
+        assert second.content == b"<html>hello</html>"
+        assert _ETagHandler.full_responses == 1
+    finally:
+        server.shutdown()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=250)
+    for i in range(3):
+        cache.put(f"https://example.com/{i}", 200, {"ETag": str(i)}, b"x" * 100)
+    assert cache.get("https://example.com/0") is None
+    assert cache.get("https://example.com/2").body == b"x" * 100
+    assert cache.total_bytes <= 250
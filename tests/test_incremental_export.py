@@ -0,0 +1,78 @@
+import json
+
+from scraper.exporters.quizmentor import QuizMentorExporter
+from scraper.importers.quizmentor import QuizMentorImporter
+from scraper.migrations import HARVEST_MIGRATIONS
+from scraper.storage import HarvestStore
+
+INSERT = (
+    "INSERT INTO generated_questions (fingerprint, question, options, correct_answer, explanation, category, subcategory, difficulty, confidence)"
+    " VALUES (?, ?, ?, 0, 'e', ?, 'sub', 2, 0.9)"
+)
+
+
+def _add(store, fingerprint, category):
+    store.executemany(INSERT, [(fingerprint, f"{fingerprint}?", json.dumps(["a", "b", "c", "d"]), category)])
+
+
+def test_incremental_export_rewrites_only_changed_categories(tmp_path):
+    db, out, dst = tmp_path / "harvest.db", tmp_path / "out", tmp_path / "quizzes"
+    with HarvestStore(db, migrations=HARVEST_MIGRATIONS) as store:
+        for i, cat in enumerate(["docker", "docker", "kubernetes", "redis"]):
+            _add(store, f"q{i}", cat)
+    exporter = QuizMentorExporter(str(db))
+    full = exporter.export(str(out))
+    full_index = (out / "harvest_index.json").read_text()
+    QuizMentorImporter(str(out), str(dst)).run()
+
+    # Nothing changed: no files touched, index left alone
+    exporter.export(str(out), incremental=True)
+    changeset = json.loads((out / "export_changeset.json").read_text())
+    assert changeset["added"] == changeset["updated"] == changeset["removed"] == []
+    assert changeset["unchanged"] == 3 and changeset["index"] is None
+
+    with HarvestStore(db, migrations=HARVEST_MIGRATIONS) as store:
+        _add(store, "q4", "docker")
+        _add(store, "q5", "go")
+        store.executemany("DELETE FROM generated_questions WHERE category = ?", [("redis",)])
+    summary = exporter.export(str(out), incremental=True)
+    changeset = json.loads((out / "export_changeset.json").read_text())
+    assert [p.rsplit("/", 1)[1] for p in changeset["updated"]] == ["quiz_docker_harvested.json"]
+    assert [p.rsplit("/", 1)[1] for p in changeset["added"]] == ["quiz_go_harvested.json"]
+    assert [p.rsplit("/", 1)[1] for p in changeset["removed"]] == ["quiz_redis_harvested.json"]
+    assert changeset["unchanged"] == 1
+    assert not (out / "quiz_redis_harvested.json").exists()
+    assert [s["category"] for s in summary] == ["docker", "go", "kubernetes"]
+
+    # Incremental output matches a from-scratch export
+    fresh = tmp_path / "fresh"
+    exporter.export(str(fresh))
+    for name in ["quiz_docker_harvested.json", "quiz_go_harvested.json", "quiz_kubernetes_harvested.json"]:
+        assert (out / name).read_text() == (fresh / name).read_text()
+    assert (out / "harvest_index.json").read_text() == (fresh / "harvest_index.json").read_text().replace(str(fresh), str(out))
+    assert full_index != (out / "harvest_index.json").read_text()
+    assert len(full) == 3
+
+    result = QuizMentorImporter(str(out), str(dst), changed_only=True).run()
+    assert result["copied"] == 2 and result["skipped"] == 1
+    assert sorted(p.name for p in dst.glob("quiz_*.json")) == ["quiz_docker_harvested.json", "quiz_go_harvested.json", "quiz_kubernetes_harvested.json"]
+
+
+def test_incremental_export_sees_edited_questions(tmp_path):
+    db, out = tmp_path / "harvest.db", tmp_path / "out"
+    with HarvestStore(db, migrations=HARVEST_MIGRATIONS) as store:
+        _add(store, "q0", "docker")
+        _add(store, "q1", "kubernetes")
+        _add(store, "q2", None)
+    exporter = QuizMentorExporter(str(db))
+    exporter.export(str(out))
+    # Uncategorized questions are left out of both modes, so the incremental run removes nothing
+    assert sorted(p.name for p in out.glob("quiz_*.json")) == ["quiz_docker_harvested.json", "quiz_kubernetes_harvested.json"]
+
+    with HarvestStore(db, migrations=HARVEST_MIGRATIONS) as store:
+        store.executemany("UPDATE generated_questions SET explanation = ? WHERE fingerprint = ?", [("rewritten", "q0")])
+    exporter.export(str(out), incremental=True)
+    changeset = json.loads((out / "export_changeset.json").read_text())
+    assert [p.rsplit("/", 1)[1] for p in changeset["updated"]] == ["quiz_docker_harvested.json"]
+    assert changeset["added"] == changeset["removed"] == [] and changeset["unchanged"] == 1
+    assert "rewritten" in (out / "quiz_docker_harvested.json").read_text()
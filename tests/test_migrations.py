@@ -0,0 +1,43 @@
+import sqlite3
+
+import pytest
+
+from scraper.migrations import HARVEST_MIGRATIONS, migrate, schema_version
+from scraper.storage import HarvestStore
+
+
+def _indexes(conn):
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+
+
+def test_existing_database_is_upgraded_in_place(tmp_path):
+    db = tmp_path / "harvest.db"
+    # A database created before migrations existed: tables and rows, no schema_version
+    conn = sqlite3.connect(db)
+    for statement in HARVEST_MIGRATIONS[0][2]:
+        conn.execute(statement)
+    conn.execute("INSERT INTO generated_questions (fingerprint, question, category) VALUES ('f', 'q?', 'k8s')")
+    conn.commit()
+    conn.close()
+
+    with HarvestStore(db, migrations=HARVEST_MIGRATIONS) as store:
+        assert store.applied_migrations == [m[0] for m in HARVEST_MIGRATIONS]
+        assert {"idx_questions_category", "idx_questions_confidence", "idx_content_quality"} <= _indexes(store.conn)
+        assert store.query_one("SELECT question FROM generated_questions")[0] == "q?"
+    with HarvestStore(db, migrations=HARVEST_MIGRATIONS) as store:
+        assert store.applied_migrations == []
+        assert schema_version(store.conn) == HARVEST_MIGRATIONS[-1][0]
+
+
+def test_failed_migration_rolls_back(tmp_path):
+    conn = sqlite3.connect(tmp_path / "h.db")
+
+    def broken(c):
+        c.execute("CREATE TABLE extra (x INTEGER)")
+        raise RuntimeError("boom")
+
+    latest = HARVEST_MIGRATIONS[-1][0]
+    with pytest.raises(RuntimeError, match="boom"):
+        migrate(conn, HARVEST_MIGRATIONS + [(latest + 1, "broken", broken)])
+    assert schema_version(conn) == latest
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'extra'").fetchone() is None
@@ -0,0 +1,50 @@
+import random
+
+from scraper.harvesters.massive import HarvestedContent, MassiveHarvester
+
+WORDS = "pod node service cluster deployment volume secret ingress replica scheduler kubelet container image".split()
+
+
+def _page(url, text, quality):
+    return HarvestedContent(
+        source_url=url,
+        source_type="documentation",
+        title=url,
+        content=text,
+        category="azure",
+        subcategory="aks",
+        tags=[],
+        scraped_at="2024-01-01T00:00:00",
+        quality_score=quality,
+    )
+
+
+def _text(seed, n=600):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def test_mirrors_are_recorded_and_skipped(tmp_path):
+    doc = _text(1)
+    mirror = doc.replace("kubelet", "Kubelet", 3) + " Last updated today."
+    with MassiveHarvester(output_dir=str(tmp_path)) as h:
+        h.save_harvested_content([
+            _page("https://docs.microsoft.com/aks", mirror, 0.6),
+            _page("https://learn.microsoft.com/aks", doc, 0.9),
+            _page("https://learn.microsoft.com/other", _text(2), 0.7),
+        ])
+        kept = h.drop_duplicate_pages(next(h.iter_stored_content()))
+        assert [c.source_url for c in kept] == ["https://learn.microsoft.com/aks", "https://learn.microsoft.com/other"]
+        # The higher-quality copy is canonical
+        ((dup, canonical, similarity),) = h.store.query(
+            "SELECT a.source_url, b.source_url, d.similarity FROM content_duplicates d "
+            "JOIN harvested_content a ON a.id = d.content_id JOIN harvested_content b ON b.id = d.canonical_id"
+        )
+        assert (dup, canonical) == ("https://docs.microsoft.com/aks", "https://learn.microsoft.com/aks") and similarity >= 0.8
+        assert [c.source_url for batch in h.iter_stored_content(include_processed=True) for c in batch] == [c.source_url for c in kept]
+
+    # A later copy is the duplicate even with a higher quality score: the earlier one was already used
+    with MassiveHarvester(output_dir=str(tmp_path)) as h:
+        h.save_harvested_content([_page("https://github.com/x/aks/blob/main/README.md", doc, 1.0)])
+        assert h.dedupe_stored_pages() == 1
+        assert h.store.query_one("SELECT COUNT(*) FROM content_minhash")[0] == 2
@@ -0,0 +1,35 @@
+import json
+
+from scraper.exporters.quizmentor import QuizMentorExporter
+from scraper.migrations import HARVEST_MIGRATIONS
+from scraper.storage import HarvestStore
+
+
+def test_streaming_export_matches_json_dump_layout(tmp_path):
+    db = tmp_path / "harvest.db"
+    rows = [
+        (f"f{i}", f"Question {i} “quoted”?", json.dumps([f"a{i}", "b", "c", "d"]), i % 4, "why\nbecause", cat, sub, 1 + i % 3, conf)
+        for i, (cat, sub, conf) in enumerate(
+            [("docker", "images", 0.9), ("kubernetes", "", 0.8), ("docker", None, 0.95), ("docker", "images", 0.5), ("kubernetes", "pods", 0.99)]
+        )
+    ]
+    with HarvestStore(db, migrations=HARVEST_MIGRATIONS) as store:
+        store.executemany(
+            "INSERT INTO generated_questions (fingerprint, question, options, correct_answer, explanation, category, subcategory, difficulty, confidence) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    summary = QuizMentorExporter(str(db)).export(str(tmp_path / "out"))
+
+    assert [s["category"] for s in summary] == ["docker", "kubernetes"]
+    for info in summary:
+        text = open(info["file"]).read()
+        quiz = json.loads(text)
+        # Streamed output is byte-identical to dumping the whole document at once
+        assert text == json.dumps(quiz, indent=2)
+        assert quiz["metadata"]["question_count"] == len(quiz["questions"]) == info["questions"]
+    docker = json.loads(open(summary[0]["file"]).read())
+    assert [q["id"] for q in docker["questions"]] == ["harvest_1", "harvest_3"]  # confidence 0.5 filtered out
+    assert docker["questions"][1]["tags"] == ["docker"]
+    assert docker["metadata"]["difficulty_distribution"] == {"1": 1, "3": 1}
+    assert not list((tmp_path / "out").glob("*.tmp"))
@@ -0,0 +1,16 @@
+from scraper.fetch.ratelimit import HostRateLimiter
+
+
+def test_rate_limiter_allows_burst_then_paces_per_host(tmp_path):
+    policy = tmp_path / "policy.yaml"
+    policy.write_text("robots_tos:\n  rate_limit:\n    requests_per_minute: 60\n    burst: 3\n")
+    limiter = HostRateLimiter.from_policy(str(policy))
+    assert (limiter.requests_per_minute, limiter.burst) == (60, 3)
+
+    delays = [limiter.reserve("docs.example.com") for _ in range(5)]
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    # 1 request/second after the burst: the 4th waits ~1s, the 5th ~2s
+    assert 0.9 < delays[3] <= 1.0
+    assert 1.9 < delays[4] <= 2.0
+    # Other hosts have their own bucket
+    assert limiter.reserve("api.stackexchange.com") == 0.0
@@ -0,0 +1,32 @@
+from scraper.importers.airesearch import ResearchIndex
+
+INDEX = """# Research index
+
+1) Context Engineering
+- Old | https://a | [rag] | PRO | todo | a-old | 2024-01-01
+
+Other
+"""
+
+
+def test_research_index_batches_rows_in_one_write(tmp_path):
+    path = tmp_path / "index.md"
+    path.write_text(INDEX)
+    index = ResearchIndex.load(path)
+    assert index.slugs == {"a-old"}
+    assert index.add("- One | u1 | [] | PRO | todo | one | d\n", "one", "Context Engineering")
+    assert index.add("- Two | u2 | [] | PRO | todo | two | d\n", "two", "Context Engineering")
+    assert index.add("- Three | u3 | [] | PRO | todo | three | d\n", "three", "Unmapped")
+    assert not index.add("- Old again | u | [] | PRO | todo | a-old | d\n", "a-old", "Context Engineering")
+    assert not index.add("- One again | u | [] | PRO | todo | one | d\n", "one", "Other")
+    index.save(path)
+    assert path.read_text() == (
+        "# Research index\n\n1) Context Engineering\n"
+        "- Two | u2 | [] | PRO | todo | two | d\n"
+        "- One | u1 | [] | PRO | todo | one | d\n"
+        "- Old | https://a | [rag] | PRO | todo | a-old | 2024-01-01\n"
+        "\nOther\n"
+        "\nDrafts\n"
+        "- Three | u3 | [] | PRO | todo | three | d\n"
+    )
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,28 @@
+from scraper.dedupe.semantic import SemanticIndex
+from scraper.harvesters.enhanced import EnhancedHarvester
+
+
+def test_semantic_index_sees_every_added_question():
+    index = SemanticIndex()
+    assert list(index.max_similarity(["What is a Pod?"])) == [0.0]
+    index.extend(["What is the primary purpose of ConfigMap?", "How does a Service route traffic to Pods?"])
+    for i in range(200):
+        index.add(f"Which statement best describes Feature{i}?")
+    # Rows added after many others (and after reweighting) are still found
+    index.add("When should you use a StatefulSet instead of a Deployment?")
+    scores = index.max_similarity([
+        "When should you use a StatefulSet instead of a Deployment?",
+        "what is the PRIMARY purpose of configmap",
+        "Which container runtime does containerd implement?",
+    ])
+    assert scores[0] > 0.99 and scores[1] > 0.99
+    assert scores[2] < 0.5
+    # Unseen words count towards the query norm instead of being ignored
+    assert index.max_similarity(["What is Velocity?"])[0] < 0.85
+
+
+def test_enhanced_uniqueness_updates_as_questions_are_accepted(tmp_path):
+    with EnhancedHarvester(output_dir=str(tmp_path)) as h:
+        assert h.check_semantic_uniqueness("What problem does Ingress solve?")
+        h.semantic_index.add("What problem does Ingress solve?")
+        assert not h.check_semantic_uniqueness("What problem does Ingress solve?")
@@ -15,6 +15,60 @@ def test_simhash_hamming_distance_behaves():
         ac = h._hamming(ha, hc)
         # Similar phrases should be closer than dissimilar ones
         assert ab < ac
-        # And generally below the default threshold for near-duplicates (8)
-        assert ab < 16
+        # Near-duplicates (a spelling variant) fall below the default threshold (8)
+        near = h._hamming(ha, h._simhash64("Kubernetes manages containerised workloads and services"))
+        assert near < h._simhash_threshold
 
+
+def test_simhash_batch_matches_single():
+    from scraper.dedupe.simhash import simhash64, simhash64_batch
+
+    texts = ["What is Kubernetes?", "", "ab", "Redis is an in-memory data structure store", "Ünïcode façade café"]
+    batch = simhash64_batch(texts)
+    assert [int(x) for x in batch] == [simhash64(t) for t in texts]
+    assert int(batch[1]) == 0 and int(batch[2]) == 0
+    # Stable across calls
+    assert simhash64("What is Kubernetes?") == int(simhash64_batch(["What is Kubernetes?"])[0])
+
+
+
+def test_simhash_index_matches_linear_scan():
+    import random
+    from scraper.dedupe.simhash import SimHashIndex
+
+    rng = random.Random(7)
+    index = SimHashIndex(threshold=8)
+    accepted = []
+    for _ in range(2000):
+        if accepted and rng.random() < 0.5:
+            # perturb an accepted hash by a few bits
+            h = rng.choice(accepted)
+            for bit in rng.sample(range(64), rng.randint(0, 12)):
+                h ^= 1 << bit
+        else:
+            h = rng.getrandbits(64)
+        linear = min(((h ^ a).bit_count() for a in accepted), default=64)
+        nearest = index.nearest(h)
+        assert (nearest < 8) == (linear < 8)
+        if linear < 8:
+            assert nearest == linear
+        else:
+            accepted.append(h)
+            index.add(h)
+    assert len(index) == len(accepted)
+
+
+def test_simhash_index_keeps_candidate_lists_small():
+    import random
+    from scraper.dedupe.simhash import SimHashIndex
+
+    rng = random.Random(11)
+    index = SimHashIndex(threshold=8)
+    index.extend(rng.getrandbits(64) for _ in range(50_000))
+    sizes = []
+    for _ in range(200):
+        ids = index.candidates(rng.getrandbits(64))
+        assert len(set(ids.tolist())) == len(ids)
+        sizes.append(len(ids))
+    # ~68 probes into 16-bit buckets: ~52 expected, where 8-bit bands scanned ~1560
+    assert sum(sizes) / len(sizes) < 100
@@ -0,0 +1,132 @@
+import gzip
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scraper.fetch.sitemap import iter_sitemap
+from scraper.fetch.urls import canonicalize_url
+from scraper.harvesters.massive import MassiveHarvester
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+BODY = "Kubernetes schedules Pods onto Nodes and a Deployment manages ReplicaSets. " * 10
+
+
+def _urlset(lastmods):
+    entries = "".join(f"<url><loc>{{base}}{path}</loc><lastmod>{mod}</lastmod></url>" for path, mod in lastmods.items())
+    return f'<?xml version="1.0"?><urlset {NS}>{entries}</urlset>'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    pages = {"/docs/a": "2024-01-01", "/docs/b": "2024-01-01", "/blog/c": "2024-01-01"}
+    index_lastmod = "2024-01-01"
+    fetched = []
+
+    def do_GET(self):
+        type(self).fetched.append(self.path)
+        base = f"http://{self.headers['Host']}"
+        if self.path == "/robots.txt":
+            body = b"User-agent: *\nSitemap: /sitemap_index.xml\n"
+        elif self.path == "/sitemap_index.xml":
+            body = (
+                f'<sitemapindex {NS}><sitemap><loc>{base}/pages.xml.gz</loc>'
+                f"<lastmod>{self.index_lastmod}T00:00:00Z</lastmod></sitemap></sitemapindex>"
+            ).encode()
+        elif self.path == "/pages.xml.gz":
+            body = gzip.compress(_urlset(self.pages).replace("{base}", base).encode())
+        elif self.path in self.pages or self.path == "/docs/":
+            body = f"<html><title>{self.path}</title><main>{BODY}</main></html>".encode()
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_iter_sitemap_streams_gzip_and_indexes():
+    xml = _urlset({"/x": "2024-03-01T12:00:00+02:00", "/y": "2024-03-02"}).replace("{base}", "https://d.io")
+    assert list(iter_sitemap(io.BytesIO(gzip.compress(xml.encode())))) == [
+        ("url", "https://d.io/x", "2024-03-01T10:00:00+00:00"),
+        ("url", "https://d.io/y", "2024-03-02T00:00:00+00:00"),
+    ]
+    index = f"<sitemapindex {NS}><sitemap><loc>https://d.io/s1.xml</loc></sitemap></sitemapindex>"
+    assert list(iter_sitemap(io.BytesIO(index.encode()))) == [("sitemap", "https://d.io/s1.xml", None)]
+
+
+def test_sitemaps_seed_only_changed_pages(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    source = {"name": "Docs", "urls": [f"http://127.0.0.1:{server.server_address[1]}/docs/"]}
+
+    def harvest():
+        _Handler.fetched = []
+        with MassiveHarvester(output_dir=str(tmp_path)) as h:
+            pages = [c.source_url.split("/", 3)[3] for c in h.harvest_documentation_site(source)]
+        return pages, _Handler.fetched
+
+    try:
+        pages, fetched = harvest()
+        assert pages == ["docs/", "docs/a", "docs/b"]  # /blog/c is outside the crawl scope
+        assert fetched[:3] == ["/robots.txt", "/sitemap_index.xml", "/pages.xml.gz"]
+
+        # Nothing moved: the child sitemap is not even downloaded and only the landing page is revalidated
+        pages, fetched = harvest()
+        assert pages == ["docs/"] and fetched == ["/robots.txt", "/sitemap_index.xml", "/docs/"]
+
+        # One page changed: only it is fetched again
+        _Handler.index_lastmod = "2024-02-01"
+        _Handler.pages = {**_Handler.pages, "/docs/b": "2024-02-01"}
+        pages, fetched = harvest()
+        assert pages == ["docs/", "docs/b"] and fetched[-1] == "/docs/b"
+    finally:
+        server.shutdown()
+
+
+def test_page_lastmod_recorded_only_once_fetched(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    source = {"name": "Docs", "urls": [f"http://127.0.0.1:{server.server_address[1]}/docs/"]}
+    try:
+        with MassiveHarvester(output_dir=str(tmp_path)) as h:
+            pages = [c.source_url.split("/", 3)[3] for c in h.harvest_documentation_site(source, limit=2)]
+            recorded = {url.split("/", 3)[3] for (url,) in h.store.query("SELECT url FROM sitemap_lastmod")}
+        # docs/b was queued but not fetched: the next walk still reports it
+        assert pages == ["docs/", "docs/a"] and recorded == {"pages.xml.gz", "docs/a"}
+    finally:
+        server.shutdown()
+
+
+def test_seen_page_without_lastmod_gets_a_baseline(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    source = {"name": "Docs", "urls": [f"{base}/docs/"]}
+    saved = _Handler.pages, _Handler.index_lastmod
+    _Handler.pages, _Handler.index_lastmod = {"/docs/b": "2024-01-01"}, "2024-01-01"
+
+    def harvest():
+        _Handler.fetched = []
+        with MassiveHarvester(output_dir=str(tmp_path)) as h:
+            h.harvest_documentation_site(source)
+            recorded = dict(h.store.query("SELECT url, lastmod FROM sitemap_lastmod"))
+        return _Handler.fetched, recorded
+
+    try:
+        # docs/b was fetched by an earlier link crawl, before sitemaps were tracked
+        with MassiveHarvester(output_dir=str(tmp_path)) as h:
+            h.seen_urls.add(canonicalize_url(f"{base}/docs/b"))
+        fetched, recorded = harvest()
+        assert "/docs/b" not in fetched and recorded[f"{base}/docs/b"].startswith("2024-01-01")
+
+        # Its lastmod moves: now it is refetched
+        _Handler.pages, _Handler.index_lastmod = {"/docs/b": "2024-02-01"}, "2024-02-01"
+        fetched, recorded = harvest()
+        assert fetched[-1] == "/docs/b" and recorded[f"{base}/docs/b"].startswith("2024-02-01")
+    finally:
+        _Handler.pages, _Handler.index_lastmod = saved
+        server.shutdown()
@@ -0,0 +1,20 @@
+import pytest
+
+from scraper.storage import HarvestStore
+
+
+def test_store_batches_writes_and_uses_wal(tmp_path):
+    with HarvestStore(tmp_path / "h.db", chunk_size=3) as store:
+        assert store.query_one("PRAGMA journal_mode")[0] == "wal"
+        with store.transaction() as conn:
+            conn.execute("CREATE TABLE t (k TEXT UNIQUE, v INTEGER)")
+        changed = store.executemany("INSERT OR IGNORE INTO t VALUES (?, ?)", ((f"k{i % 7}", i) for i in range(10)))
+        assert changed == 7
+        assert store.query_one("SELECT COUNT(*) FROM t")[0] == 7
+        with pytest.raises(ValueError):
+            with store.transaction() as conn:
+                conn.execute("INSERT INTO t VALUES ('new', 1)")
+                raise ValueError
+        assert store.query_one("SELECT COUNT(*) FROM t WHERE k = 'new'")[0] == 0
+    with pytest.raises(RuntimeError):
+        store.query("SELECT 1")
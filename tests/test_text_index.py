@@ -0,0 +1,17 @@
+from scraper.text_index import DocumentIndex, document_index
+
+
+def test_sentence_lookup_matches_split_and_substring():
+    text = "A Pod runs containers. Pods are scheduled. The pod spec. Node.js apps. İstanbul pods"
+    doc = DocumentIndex(text)
+    sentences = text.split(".")
+    for term in ["Pod", "pod", "Node", "Node.js", "", "missing", "İ", "i"]:
+        assert doc.sentences_with(term) == [s for s in sentences if term in s]
+        assert doc.sentences_with(term, ignore_case=True) == [s for s in sentences if term.lower() in s.lower()]
+    assert doc.sentence_ids("Pod") == [0, 1]
+    assert doc.word_count(0) == 4
+
+
+def test_document_index_is_shared_per_text():
+    text = "Services expose Pods. Ingress routes traffic."
+    assert document_index(text) is document_index(text)